@@ -5,7 +5,7 @@ from sqlalchemy import engine_from_config, pool
 from alembic import context
 from src.config import settings
 from src.db.database import Base
-from src.db.models import RefreshTokenModel, UserModel  # noqa: F401
+from src.db.models import RateLimitBucketModel, RefreshTokenModel, UserModel  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
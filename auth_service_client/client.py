@@ -0,0 +1,153 @@
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import quote
+
+import httpx
+
+from auth_service_client.codecs import MSGPACK_MEDIA_TYPE, unpackb
+
+# Ограничение POST /internal/users/batch (UserBatchRequestSchema)
+BATCH_MAX_IDS = 500
+
+
+@dataclass(frozen=True, slots=True)
+class InternalUser:
+    """Профиль пользователя из Internal API auth-service."""
+
+    id: uuid.UUID
+    email: str
+    name: str
+    picture_url: str | None
+    role: str
+    is_active: bool
+    created_at: datetime
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "InternalUser":
+        # Новые поля ответа не ломают старых клиентов
+        return cls(
+            id=data["id"],
+            email=data["email"],
+            name=data["name"],
+            picture_url=data["picture_url"],
+            role=data["role"],
+            is_active=data["is_active"],
+            created_at=data["created_at"],
+        )
+
+
+class AuthServiceClient:
+    """
+    Клиент Internal API auth-service для других сервисов.
+
+    Пакет auth_service_client не зависит от src (нужны только httpx и
+    msgpack): сервисы копируют каталог к себе или ставят его из репозитория.
+
+    Запрашивает ответы в MessagePack (UUID и даты приходят готовыми
+    объектами) и запоминает ETag профилей: повторный get_user отправляет
+    If-None-Match и при 304 возвращает профиль из памяти.
+
+    Пример:
+        async with AuthServiceClient("http://auth-service:8001") as auth:
+            user = await auth.get_user(user_id)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        client: httpx.AsyncClient | None = None,
+        timeout: float = 2.0,
+        etag_cache_size: int = 1024,
+    ):
+        self._base_url = base_url.rstrip("/")
+        self._client = client or httpx.AsyncClient(timeout=timeout)
+        self._owns_client = client is None
+        self._etag_cache_size = etag_cache_size
+        self._etags: dict[uuid.UUID, tuple[str, InternalUser]] = {}
+
+    async def __aenter__(self) -> "AuthServiceClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def _get(self, path: str, headers: dict | None = None) -> httpx.Response:
+        return await self._client.get(
+            f"{self._base_url}{path}",
+            headers={"Accept": MSGPACK_MEDIA_TYPE, **(headers or {})},
+        )
+
+    async def get_user(self, user_id: uuid.UUID) -> InternalUser | None:
+        """
+        Профиль пользователя по ID.
+
+        Returns:
+            InternalUser или None, если пользователь не найден
+
+        Raises:
+            httpx.HTTPStatusError: При ответе 4xx/5xx, кроме 404
+        """
+        cached = self._etags.get(user_id)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = await self._get(f"/internal/users/{user_id}", headers)
+
+        if response.status_code == httpx.codes.NOT_MODIFIED and cached:
+            return cached[1]
+        if response.status_code == httpx.codes.NOT_FOUND:
+            self._etags.pop(user_id, None)
+            return None
+        response.raise_for_status()
+
+        user = InternalUser.from_dict(unpackb(response.content))
+        etag = response.headers.get("etag")
+        if etag and self._etag_cache_size > 0:
+            self._etags.pop(user_id, None)
+            if len(self._etags) >= self._etag_cache_size:
+                # Вытесняется самая давняя запись
+                del self._etags[next(iter(self._etags))]
+            self._etags[user_id] = (etag, user)
+        return user
+
+    async def get_user_by_email(self, email: str) -> InternalUser | None:
+        # "/", "?" и "#" в email иначе изменили бы путь запроса
+        response = await self._get(f"/internal/users/by-email/{quote(email, safe='')}")
+        if response.status_code == httpx.codes.NOT_FOUND:
+            return None
+        response.raise_for_status()
+        return InternalUser.from_dict(unpackb(response.content))
+
+    async def user_exists(self, user_id: uuid.UUID) -> bool:
+        response = await self._get(f"/internal/users/{user_id}/exists")
+        response.raise_for_status()
+        return unpackb(response.content)["exists"]
+
+    async def get_users(
+        self, user_ids: Iterable[uuid.UUID]
+    ) -> dict[uuid.UUID, InternalUser]:
+        """
+        Профили нескольких пользователей (пачками по BATCH_MAX_IDS).
+
+        Returns:
+            Найденные пользователи по ID; ненайденных ID в словаре нет
+        """
+        ids = list(dict.fromkeys(user_ids))
+        users: dict[uuid.UUID, InternalUser] = {}
+        for start in range(0, len(ids), BATCH_MAX_IDS):
+            chunk = ids[start : start + BATCH_MAX_IDS]
+            response = await self._client.post(
+                f"{self._base_url}/internal/users/batch",
+                json={"ids": [str(user_id) for user_id in chunk]},
+                headers={"Accept": MSGPACK_MEDIA_TYPE},
+            )
+            response.raise_for_status()
+            for data in unpackb(response.content)["users"]:
+                user = InternalUser.from_dict(data)
+                users[user.id] = user
+        return users
@@ -0,0 +1,62 @@
+import uuid
+from typing import Any
+
+import msgpack
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_MEDIA_TYPES = frozenset((MSGPACK_MEDIA_TYPE, "application/x-msgpack"))
+
+# Код расширения MessagePack для UUID (16 байт вместо 36 символов);
+# даты передаются встроенным расширением Timestamp (-1)
+UUID_EXT_CODE = 1
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(UUID_EXT_CODE, obj.bytes)
+    raise TypeError(f"Cannot serialize {type(obj).__name__} to MessagePack")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == UUID_EXT_CODE:
+        return uuid.UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+def packb(obj: Any) -> bytes:
+    """
+    Кодирует объект в MessagePack.
+
+    UUID кодируются расширением UUID_EXT_CODE, datetime с часовым поясом —
+    расширением Timestamp.
+    """
+    return msgpack.packb(obj, default=_default, datetime=True)
+
+
+def unpackb(data: bytes) -> Any:
+    """Декодирует MessagePack: UUID и datetime (UTC) восстанавливаются."""
+    return msgpack.unpackb(data, ext_hook=_ext_hook, timestamp=3)
+
+
+def accepts_msgpack(accept: str | None) -> bool:
+    """
+    Запрошен ли MessagePack в заголовке Accept.
+
+    JSON остается форматом по умолчанию: MessagePack выбирается, только если
+    клиент явно перечислил его (с q > 0).
+    """
+    if not accept or "msgpack" not in accept:
+        return False
+    for item in accept.split(","):
+        media_type, _, params = item.partition(";")
+        if media_type.strip().lower() not in _MSGPACK_MEDIA_TYPES:
+            continue
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
@@ -0,0 +1,72 @@
+"""Вспомогательные функции для микробенчмарков ASGI-приложений без сети и HTTP-клиента."""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+
+def make_scope(
+    path: str,
+    method: str = "GET",
+    headers: list[tuple[bytes, bytes]] | None = None,
+) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers or [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+async def call_app(app, scope: dict, body: bytes = b"") -> list[dict]:
+    """Выполняет один запрос к ASGI-приложению и возвращает отправленные сообщения."""
+    messages: list[dict] = []
+    sent = False
+
+    async def receive() -> dict:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    await app(dict(scope), receive, send)
+    return messages
+
+
+async def measure_rps(
+    app,
+    scope_factory: Callable[[], dict],
+    requests: int,
+    warmup: int = 200,
+) -> float:
+    """Запросов в секунду при последовательных вызовах приложения."""
+    for _ in range(warmup):
+        await call_app(app, scope_factory())
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call_app(app, scope_factory())
+    return requests / (time.perf_counter() - start)
+
+
+def report(name: str, baseline_rps: float, candidate_rps: float) -> None:
+    per_request_saved_us = (1 / baseline_rps - 1 / candidate_rps) * 1_000_000
+    print(f"{name}")
+    print(f"  before: {baseline_rps:10.0f} req/s")
+    print(f"  after:  {candidate_rps:10.0f} req/s")
+    print(
+        f"  speedup x{candidate_rps / baseline_rps:.2f}, "
+        f"saved {per_request_saved_us:.1f} us/request"
+    )
@@ -0,0 +1,115 @@
+"""
+Контроль допуска при перегрузке: модель воркера с пулом соединений БД.
+
+Запросы приходят с постоянной частотой выше пропускной способности пула
+(--overload раз). Без контроля допуска каждый запрос ждет соединение до
+таймаута пула; с ним лишние запросы получают 503 сразу, а high обслуживаются
+раньше low. Печатает для каждого приоритета число обслуженных и отклоненных
+запросов и задержки обслуженных.
+
+Запуск:
+    python -m benchmarks.admission
+    python -m benchmarks.admission --overload 2 --duration 10
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from src.exceptions import ServerOverloadedException
+from src.security.admission import AdmissionController, Priority
+
+
+class Pool:
+    """Пул соединений: ожидание свободного соединения не дольше timeout."""
+
+    def __init__(self, size: int, timeout: float):
+        self._semaphore = asyncio.Semaphore(size)
+        self._timeout = timeout
+
+    async def query(self, service_time: float) -> None:
+        await asyncio.wait_for(self._semaphore.acquire(), self._timeout)
+        try:
+            await asyncio.sleep(service_time)
+        finally:
+            self._semaphore.release()
+
+
+async def request(pool, controller, priority, service_time, results) -> None:
+    start = time.perf_counter()
+    try:
+        if controller is None:
+            await pool.query(service_time)
+        else:
+            async with controller.slot(priority):
+                await pool.query(service_time)
+    except (ServerOverloadedException, TimeoutError):
+        results[priority]["rejected"].append(time.perf_counter() - start)
+        return
+    results[priority]["served"].append(time.perf_counter() - start)
+
+
+async def run(args, admission: bool) -> dict:
+    pool = Pool(args.pool_size, args.pool_timeout)
+    controller = (
+        AdmissionController(
+            capacity=args.pool_size,
+            max_queue=args.max_queue,
+            max_wait={"high": 500.0, "normal": 250.0, "low": 100.0},
+        )
+        if admission
+        else None
+    )
+    results = {p: {"served": [], "rejected": []} for p in (Priority.HIGH, Priority.LOW)}
+    rate = args.pool_size / args.service_time * args.overload
+    tasks = []
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < args.duration:
+        # Сколько запросов должно было прийти к этому моменту
+        for _ in range(int(elapsed * rate) - len(tasks)):
+            priority = Priority.HIGH if random.random() < 0.5 else Priority.LOW
+            tasks.append(
+                asyncio.create_task(
+                    request(pool, controller, priority, args.service_time, results)
+                )
+            )
+        await asyncio.sleep(0.001)
+    await asyncio.gather(*tasks)
+    return results
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1] * 1000
+
+
+def print_results(name: str, results: dict) -> None:
+    print(name)
+    for priority, outcome in results.items():
+        served, rejected = outcome["served"], outcome["rejected"]
+        print(
+            f"  {priority.value:5s} served {len(served):5d}  rejected {len(rejected):5d}"
+            f"  p50 {percentile(served, 50):7.1f} ms  p99 {percentile(served, 99):7.1f} ms"
+            f"  reject p99 {percentile(rejected, 99):7.1f} ms"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pool-size", type=int, default=15)
+    parser.add_argument("--pool-timeout", type=float, default=30.0)
+    parser.add_argument("--service-time", type=float, default=0.02)
+    parser.add_argument("--overload", type=float, default=1.5)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--max-queue", type=int, default=100)
+    args = parser.parse_args()
+
+    print_results("pool timeout only", await run(args, admission=False))
+    print_results("admission control", await run(args, admission=True))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+Цепочка зависимостей аутентификации: прежняя реализация (синхронные
+зависимости в пуле потоков, новые JWTService на запрос, pydantic-схема
+с EmailStr) против async-зависимостей с общими сервисами и Principal.
+
+Запуск:
+    python -m benchmarks.auth_dependencies --requests 20000
+"""
+
+import argparse
+import asyncio
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from pydantic import BaseModel, EmailStr
+
+from benchmarks._asgi import make_scope, measure_rps, report
+from src.api.dependencies import CurrentUserDep
+from src.config import settings
+from src.logger import setup_logging
+from src.security.jwt_service import JWTService
+from src.security.principal import Principal
+
+USER_ID = uuid.uuid4()
+
+
+class LegacyCurrentUserSchema(BaseModel):
+    id: uuid.UUID
+    email: EmailStr
+    role: str
+
+
+def legacy_get_jwt_service() -> JWTService:
+    return JWTService()
+
+
+def legacy_get_current_user(
+    request: Request,
+    jwt_service: Annotated[JWTService, Depends(legacy_get_jwt_service)],
+    authorization: str | None = Header(None),
+) -> LegacyCurrentUserSchema:
+    """Реализация до перехода на Principal (для сравнения)."""
+    user_id = request.headers.get("X-User-ID")
+    user_email = request.headers.get("X-User-Email")
+    user_role = request.headers.get("X-User-Role")
+    if user_id and user_email and user_role:
+        return LegacyCurrentUserSchema(
+            id=uuid.UUID(user_id), email=user_email, role=user_role
+        )
+    if authorization:
+        payload = jwt_service.verify_access_token(authorization.split()[1])
+        return LegacyCurrentUserSchema(
+            id=payload["sub"], email=payload["email"], role=payload["role"]
+        )
+    raise HTTPException(status_code=401)
+
+
+def build_app(dependency) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(user: dependency) -> dict:
+        return {"id": str(user.id)}
+
+    return app
+
+
+def access_token() -> str:
+    now = datetime.now(timezone.utc)
+    return JWTService().create_access_token(
+        USER_ID, "user@example.com", "user", now, now + timedelta(hours=1)
+    )
+
+
+async def run(requests: int) -> None:
+    legacy_app = build_app(
+        Annotated[LegacyCurrentUserSchema, Depends(legacy_get_current_user)]
+    )
+    app = build_app(CurrentUserDep)
+
+    headers = {
+        "bearer token": [(b"authorization", f"Bearer {access_token()}".encode())],
+        "gateway headers": [
+            (b"x-user-id", str(USER_ID).encode()),
+            (b"x-user-email", b"user@example.com"),
+            (b"x-user-role", b"user"),
+        ],
+    }
+    for name, request_headers in headers.items():
+        baseline = await measure_rps(
+            legacy_app, lambda: make_scope("/me", headers=request_headers), requests
+        )
+        candidate = await measure_rps(
+            app, lambda: make_scope("/me", headers=request_headers), requests
+        )
+        report(f"GET /me, {name}", baseline, candidate)
+
+    number = 100_000
+    schema_us = (
+        timeit.timeit(
+            lambda: LegacyCurrentUserSchema(
+                id=USER_ID, email="user@example.com", role="user"
+            ),
+            number=number,
+        )
+        / number
+        * 1_000_000
+    )
+    principal_us = (
+        timeit.timeit(
+            lambda: Principal(id=USER_ID, email="user@example.com", role="user"),
+            number=number,
+        )
+        / number
+        * 1_000_000
+    )
+    print("Principal construction")
+    print(f"  CurrentUserSchema (EmailStr): {schema_us:6.2f} us")
+    print(f"  Principal:                    {principal_us:6.2f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Без .env: токены подписываются временным ключом
+    if not settings.JWT_SECRET_KEY:
+        settings.JWT_SECRET_KEY = "benchmark-only-secret-key-32-bytes"
+    # Записи debug-уровня из зависимостей отбрасываются, как в сервисе
+    setup_logging()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
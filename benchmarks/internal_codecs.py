@@ -0,0 +1,115 @@
+"""
+Кодирование ответов Internal API: JSON (как отдает FastAPI) против MessagePack.
+
+Кодирование — на стороне auth-service (модель ответа -> байты), декодирование —
+на стороне клиента до типизированных объектов (UUID и datetime, а не строки),
+как это делает auth_service_client.client.
+
+Запуск:
+    python -m benchmarks.internal_codecs
+"""
+
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+from pydantic import TypeAdapter
+
+from src.api.responses import MsgPackResponse
+from auth_service_client.client import InternalUser
+from auth_service_client.codecs import unpackb
+from src.schemas.user import UserBatchResponseSchema, UserResponseSchema
+
+
+def make_user(i: int) -> UserResponseSchema:
+    return UserResponseSchema(
+        id=uuid.uuid4(),
+        email=f"user{i}@example.com",
+        name="Иван Петров",
+        picture_url="https://lh3.googleusercontent.com/a/ACg8ocJ",
+        role="user",
+        is_active=True,
+        created_at=datetime(2025, 3, 14, 9, 26, 53, 589793, tzinfo=timezone.utc),
+    )
+
+
+def user_from_json(data: dict) -> InternalUser:
+    return InternalUser(
+        id=uuid.UUID(data["id"]),
+        email=data["email"],
+        name=data["name"],
+        picture_url=data["picture_url"],
+        role=data["role"],
+        is_active=data["is_active"],
+        created_at=datetime.fromisoformat(data["created_at"]),
+    )
+
+
+def bench(fn, number: int) -> float:
+    """Микросекунд на вызов."""
+    return timeit.timeit(fn, number=number) / number * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    user = make_user(0)
+    batch = UserBatchResponseSchema(
+        users=[make_user(i) for i in range(args.batch)], missing=[uuid.uuid4()]
+    )
+    cases = [
+        ("GET /internal/users/{id}", user, TypeAdapter(UserResponseSchema), 1),
+        (
+            f"POST /internal/users/batch ({args.batch} users)",
+            batch,
+            TypeAdapter(UserBatchResponseSchema),
+            args.batch,
+        ),
+    ]
+
+    for name, payload, adapter, size in cases:
+        number = max(args.number // size, 100)
+        json_body = adapter.dump_json(payload)
+        msgpack_body = MsgPackResponse(payload).body
+
+        def decode_json(body=json_body, single=size == 1):
+            data = json.loads(body)
+            if single:
+                return user_from_json(data)
+            return [user_from_json(item) for item in data["users"]]
+
+        def decode_msgpack(body=msgpack_body, single=size == 1):
+            data = unpackb(body)
+            if single:
+                return InternalUser.from_dict(data)
+            return [InternalUser.from_dict(item) for item in data["users"]]
+
+        assert decode_json() == decode_msgpack()
+
+        json_encode = bench(lambda: adapter.dump_json(payload), number)
+        msgpack_encode = bench(lambda: MsgPackResponse(payload).body, number)
+        json_decode = bench(decode_json, number)
+        msgpack_decode = bench(decode_msgpack, number)
+
+        print(name)
+        print(
+            f"  size:    json {len(json_body):7d} B   msgpack {len(msgpack_body):7d} B"
+            f"   (x{len(json_body) / len(msgpack_body):.2f})"
+        )
+        print(
+            f"  encode:  json {json_encode:7.1f} us  msgpack {msgpack_encode:7.1f} us"
+            f"  (x{json_encode / msgpack_encode:.2f})"
+        )
+        print(
+            f"  decode:  json {json_decode:7.1f} us  msgpack {msgpack_decode:7.1f} us"
+            f"  (x{json_decode / msgpack_decode:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Сериализация JSON-ответов на реальных роутерах: jsonable_encoder + json.dumps
+(default_response_class=JSONResponse), ORJSONResponse и путь FastAPI по
+умолчанию — сериализация модели ответа сразу в байты через pydantic-core.
+
+Проверяет, что тела ответов побайтно совпадают, и что ни один маршрут
+приложения с моделью ответа не выведен с быстрого пути собственным
+response_class. Завершается с кодом 1 при расхождении.
+
+Зависимости с БД подменяются заглушками, чтобы измерялась только
+обработка запроса и сериализация.
+
+Запуск:
+    python -m benchmarks.json_responses --requests 20000
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+import warnings
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute
+
+from benchmarks._asgi import call_app, make_scope, measure_rps, report
+from src.api.dependencies import (
+    get_auth_service,
+    get_current_user,
+    get_user_service,
+    limit_token_refresh,
+)
+from src.api.internal.router import router as internal_router
+from src.api.v1.router import router as v1_router
+from src.schemas.oauth import TokenResponseSchema
+from src.schemas.user import UserResponseSchema
+from src.security.principal import Principal
+
+USER = UserResponseSchema(
+    id=uuid.uuid4(),
+    email="user@example.com",
+    name="Иван Петров",
+    picture_url="https://lh3.googleusercontent.com/a/ACg8ocJ",
+    role="user",
+    is_active=True,
+    created_at=datetime(2025, 3, 14, 9, 26, 53, 589793, tzinfo=timezone.utc),
+)
+TOKENS = TokenResponseSchema(access_token="eyJhbGciOiJIUzI1NiJ9." * 8, expires_in=900)
+
+
+class StubUserService:
+    async def get_by_id(self, user_id: uuid.UUID) -> UserResponseSchema:
+        return USER
+
+    async def get_profile(
+        self, user_id: uuid.UUID, if_none_match: str | None = None, variant: str = ""
+    ) -> tuple[UserResponseSchema, str]:
+        return USER, '"benchmark"'
+
+    async def get_by_email(self, email: str) -> UserResponseSchema:
+        return USER
+
+    async def exists(self, user_id: uuid.UUID) -> bool:
+        return True
+
+
+class StubAuthService:
+    async def refresh_tokens(self, **kwargs) -> tuple[TokenResponseSchema, str]:
+        return TOKENS, "new-refresh-token"
+
+
+async def stub_user_service() -> StubUserService:
+    return StubUserService()
+
+
+async def stub_auth_service() -> StubAuthService:
+    return StubAuthService()
+
+
+async def stub_current_user() -> Principal:
+    return Principal(id=USER.id, email=USER.email, role=USER.role)
+
+
+async def no_rate_limit() -> None:
+    return None
+
+
+def build_app(**kwargs) -> FastAPI:
+    app = FastAPI(**kwargs)
+    app.include_router(v1_router)
+    app.include_router(internal_router)
+    app.dependency_overrides[get_user_service] = stub_user_service
+    app.dependency_overrides[get_auth_service] = stub_auth_service
+    app.dependency_overrides[get_current_user] = stub_current_user
+    # Измеряется сериализация, а не лимит частоты обновления токенов
+    app.dependency_overrides[limit_token_refresh] = no_rate_limit
+    return app
+
+
+REQUESTS = {
+    "GET /api/v1/users/me": ("GET", "/api/v1/users/me", []),
+    "GET /internal/users/{user_id}": ("GET", f"/internal/users/{USER.id}", []),
+    "GET /internal/users/{user_id}/exists": (
+        "GET",
+        f"/internal/users/{USER.id}/exists",
+        [],
+    ),
+    "POST /api/v1/auth/refresh": (
+        "POST",
+        "/api/v1/auth/refresh",
+        [(b"cookie", b"refresh_token=old-refresh-token")],
+    ),
+}
+
+
+def slow_path_routes() -> list[str]:
+    """Маршруты приложения с моделью ответа, но не на пути pydantic-core."""
+    from src.main import app
+
+    return [
+        f"{sorted(route.methods)} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and route.response_field is not None
+        and not isinstance(route.response_class, DefaultPlaceholder)
+    ]
+
+
+async def run(requests: int) -> int:
+    with warnings.catch_warnings():
+        # ORJSONResponse объявлен устаревшим в FastAPI; нужен только для сравнения
+        warnings.simplefilter("ignore")
+        apps = {
+            "json.dumps": build_app(default_response_class=JSONResponse),
+            "orjson": build_app(default_response_class=ORJSONResponse),
+            "pydantic-core": build_app(),
+        }
+
+        failed = False
+        for name, (method, path, headers) in REQUESTS.items():
+            bodies = {}
+            for label, app in apps.items():
+                messages = await call_app(app, make_scope(path, method, headers))
+                bodies[label] = b"".join(
+                    m.get("body", b"")
+                    for m in messages
+                    if m["type"] == "http.response.body"
+                )
+            if len(set(bodies.values())) != 1:
+                failed = True
+                print(f"{name}: response bodies differ")
+                for label, body in bodies.items():
+                    print(f"  {label}: {body!r}")
+                continue
+
+            def scope_factory():
+                return make_scope(path, method, headers)
+
+            baseline = await measure_rps(apps["json.dumps"], scope_factory, requests)
+            orjson_rps = await measure_rps(apps["orjson"], scope_factory, requests)
+            candidate = await measure_rps(
+                apps["pydantic-core"], scope_factory, requests
+            )
+            report(name, baseline, candidate)
+            print(f"  orjson:  {orjson_rps:10.0f} req/s")
+
+    slow_routes = slow_path_routes()
+    if slow_routes:
+        failed = True
+        print("Routes with a custom response_class (jsonable_encoder path):")
+        for route in slow_routes:
+            print(f"  {route}")
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    return asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Нагрузочный тест полного входа через OAuth против локального fake OIDC провайдера.
+
+Каждый виртуальный пользователь проходит
+/auth/google -> authorize провайдера -> /auth/google/callback
+и считается успешным, если получил refresh-токен в cookie.
+
+Подготовка:
+    uvicorn tools.fake_oidc:app --port 9000 --no-access-log
+    # в .env auth-service:
+    #   GOOGLE_DISCOVERY_URL=http://127.0.0.1:9000/.well-known/openid-configuration
+    #   GOOGLE_REDIRECT_URI=http://127.0.0.1:8001/api/v1/auth/google/callback
+    uvicorn src.main:app --port 8001 --no-access-log
+
+Запуск:
+    python -m benchmarks.login_flow --concurrency 50 --duration 30
+
+Проверка hedged-обмена code (OAUTH_HEDGE_ENABLED) без БД и запущенных сервисов:
+fake OIDC поднимается в этом же процессе с задержкой token endpoint больше
+OAUTH_HEDGE_DELAY_SECONDS, а callback вызывает только GoogleOAuthClient.
+Код 1, если вход не прошел или hedge не запускался:
+    python -m benchmarks.login_flow --check-hedge
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+from src.constants import REFRESH_TOKEN_COOKIE_NAME
+
+
+async def login_once(client: httpx.AsyncClient, base_url: str) -> str:
+    """Один вход. Возвращает "ok" или описание ошибки."""
+    client.cookies.clear()
+
+    response = await client.get(f"{base_url}/api/v1/auth/google")
+    if response.status_code != 302:
+        return f"login_{response.status_code}"
+
+    # Провайдер сразу редиректит обратно с code
+    response = await client.get(response.headers["location"])
+    if response.status_code != 302:
+        return f"authorize_{response.status_code}"
+
+    response = await client.get(response.headers["location"])
+    if response.status_code != 302:
+        return f"callback_{response.status_code}"
+    if REFRESH_TOKEN_COOKIE_NAME not in response.headers.get("set-cookie", ""):
+        return "callback_no_cookie"
+    return "ok"
+
+
+async def worker(
+    base_url: str,
+    deadline: float,
+    latencies: list[float],
+    outcomes: Counter,
+) -> None:
+    async with httpx.AsyncClient(follow_redirects=False, timeout=30.0) as client:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                outcome = await login_once(client, base_url)
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            outcomes[outcome] += 1
+            if outcome == "ok":
+                latencies.append(time.perf_counter() - start)
+
+
+def percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else 0.0
+
+
+async def main(base_url: str, concurrency: int, duration: float) -> None:
+    latencies: list[float] = []
+    outcomes: Counter = Counter()
+    started = time.perf_counter()
+    deadline = started + duration
+
+    await asyncio.gather(
+        *(worker(base_url, deadline, latencies, outcomes) for _ in range(concurrency))
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"concurrency={concurrency} duration={elapsed:.1f}s")
+    print(f"logins/sec: {outcomes['ok'] / elapsed:.1f}")
+    if latencies:
+        print(
+            "latency ms: "
+            f"p50={percentile(latencies, 50) * 1000:.1f} "
+            f"p95={percentile(latencies, 95) * 1000:.1f} "
+            f"p99={percentile(latencies, 99) * 1000:.1f}"
+        )
+    print(f"outcomes: {dict(outcomes)}")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def check_hedge(logins: int) -> int:
+    """Входы через hedged-обмен code против fake OIDC. Возвращает код выхода."""
+    port = free_port()
+    issuer = f"http://127.0.0.1:{port}"
+    # Настройки читаются при импорте src.config и tools.fake_oidc
+    os.environ.update(
+        FAKE_OIDC_ISSUER=issuer,
+        GOOGLE_DISCOVERY_URL=f"{issuer}/.well-known/openid-configuration",
+        GOOGLE_CLIENT_ID="hedge-check",
+        GOOGLE_CLIENT_SECRET="hedge-check",
+        GOOGLE_REDIRECT_URI="http://testserver/callback",
+        OAUTH_HEDGE_ENABLED="true",
+        OAUTH_HEDGE_DELAY_SECONDS="0.02",
+        OAUTH_TOKEN_ATTEMPT_TIMEOUT_SECONDS="5",
+        OIDC_CACHE_PATH="",
+    )
+
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.middleware.sessions import SessionMiddleware
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    from src.security.http_client import close_http_client
+    from src.security.oauth import GoogleOAuthClient
+    from tools import fake_oidc
+
+    token_requests = 0
+
+    async def provider(scope, receive, send):
+        nonlocal token_requests
+        if scope["type"] == "http" and scope["path"] == "/token":
+            token_requests += 1
+        await fake_oidc.app(scope, receive, send)
+
+    async def login(request):
+        return await GoogleOAuthClient().get_authorization_url(request)
+
+    async def callback(request):
+        oauth_client = GoogleOAuthClient()
+        token = await oauth_client.authorize_access_token(request)
+        return JSONResponse({"email": oauth_client.get_user_info(token).email})
+
+    app = Starlette(
+        routes=[Route("/login", login), Route("/callback", callback)],
+        middleware=[Middleware(SessionMiddleware, secret_key="hedge-check")],
+    )
+
+    # Отмененная hedge-попытка обрывает запрос к провайдеру (ClientDisconnect)
+    server = uvicorn.Server(
+        uvicorn.Config(provider, port=port, log_level="critical", lifespan="off")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    # Каждая попытка обмена дольше hedge_delay: запускается вторая
+    fake_oidc.Faults.latency = (0.1, 0.1)
+
+    failures: Counter = Counter()
+    try:
+        async with (
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+            ) as service,
+            httpx.AsyncClient() as browser,
+        ):
+            for _ in range(logins):
+                service.cookies.clear()
+                response = await service.get("/login")
+                if response.status_code != 302:
+                    failures[f"login_{response.status_code}"] += 1
+                    continue
+                response = await browser.get(response.headers["location"])
+                if response.status_code != 302:
+                    failures[f"authorize_{response.status_code}"] += 1
+                    continue
+                response = await service.get(response.headers["location"])
+                if response.status_code != 200 or "email" not in response.json():
+                    failures[f"callback_{response.status_code}"] += 1
+    finally:
+        await close_http_client()
+        server.should_exit = True
+        await serving
+
+    ok = logins - sum(failures.values())
+    print(f"hedged logins: {ok}/{logins} ok, token requests: {token_requests}")
+    if failures:
+        print(f"FAIL: {dict(failures)}")
+        return 1
+    if token_requests < 2 * logins:
+        print("FAIL: hedged attempts were not launched")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--check-hedge", action="store_true")
+    parser.add_argument("--logins", type=int, default=5)
+    args = parser.parse_args()
+    if args.check_hedge:
+        sys.exit(asyncio.run(check_hedge(args.logins)))
+    asyncio.run(main(args.base_url.rstrip("/"), args.concurrency, args.duration))
@@ -0,0 +1,83 @@
+"""
+Ограничитель частоты запросов: время одного решения и память под бакеты.
+
+- hot key: один клиент в цикле (большая часть запросов отклоняется);
+- unique ips: поток уникальных IP, как при распределенном переборе, — число
+  бакетов не должно превышать RATE_LIMIT_MEMORY_MAX_KEYS.
+
+Завершается с кодом 1, если лимит пропустил больше burst запросов подряд.
+
+Запуск:
+    python -m benchmarks.rate_limiter
+    python -m benchmarks.rate_limiter --backend postgres --checks 2000  # нужна БД
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from src.config import settings
+from src.security.rate_limit import (
+    IP_LIMIT,
+    InMemoryRateLimiter,
+    PostgresRateLimiter,
+)
+
+
+async def measure(limiter, keys, limit) -> tuple[float, int]:
+    """Микросекунд на решение и число отклоненных."""
+    rejected = 0
+    start = time.perf_counter()
+    for key in keys:
+        if await limiter.hit(key, limit) is not None:
+            rejected += 1
+    return (time.perf_counter() - start) / len(keys) * 1_000_000, rejected
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", choices=["memory", "postgres"], default="memory")
+    parser.add_argument("--checks", type=int, default=500_000)
+    args = parser.parse_args()
+
+    if args.backend == "postgres":
+        limiter = PostgresRateLimiter()
+    else:
+        limiter = InMemoryRateLimiter()
+    run = time.time_ns()
+
+    hot_us, hot_rejected = await measure(
+        limiter, [f"bench:{run}:ip:10.0.0.1"] * args.checks, IP_LIMIT
+    )
+    allowed = args.checks - hot_rejected
+    print("hot key")
+    print(f"  {hot_us:7.2f} us/check, allowed {allowed} of {args.checks}")
+
+    unique_us, _ = await measure(
+        limiter,
+        [
+            f"bench:{run}:ip:{i >> 16}.{(i >> 8) & 255}.{i & 255}"
+            for i in range(args.checks)
+        ],
+        IP_LIMIT,
+    )
+    print("unique ips")
+    print(f"  {unique_us:7.2f} us/check")
+    if isinstance(limiter, InMemoryRateLimiter):
+        print(
+            f"  buckets: {len(limiter)} (RATE_LIMIT_MEMORY_MAX_KEYS="
+            f"{settings.RATE_LIMIT_MEMORY_MAX_KEYS})"
+        )
+
+    # За время прогона бакет мог пополниться на несколько токенов
+    elapsed = hot_us * args.checks / 1_000_000
+    budget = IP_LIMIT.burst + int(elapsed * IP_LIMIT.rate) + 1
+    if allowed > budget:
+        print(f"FAIL: allowed {allowed} > {budget}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,93 @@
+"""
+Накладные расходы middleware логирования запросов:
+прежняя реализация на BaseHTTPMiddleware против чистого ASGI.
+
+Логи пишутся в /dev/null, чтобы измерялась только работа middleware.
+
+Запуск:
+    python -m benchmarks.request_logging --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import structlog
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from benchmarks._asgi import make_scope, measure_rps, report
+from src.middleware.request_logger import RequestLoggingMiddleware
+
+logger = structlog.get_logger()
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """Реализация до перехода на чистый ASGI (для сравнения)."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        client_ip = request.client.host if request.client else "unknown"
+
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(
+            request_id=request_id,
+            client_ip=client_ip,
+        )
+
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+
+        if hasattr(request.state, "user_id"):
+            structlog.contextvars.bind_contextvars(user_id=request.state.user_id)
+
+        logger.info(
+            "request_finished",
+            method=request.method,
+            status_code=response.status_code,
+            path=request.url.path,
+            duration_ms=round(duration_ms, 2),
+        )
+
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+async def endpoint(request):
+    return JSONResponse({"exists": True})
+
+
+def build_app(middleware_cls):
+    app = Starlette(routes=[Route("/internal/users/{user_id}/exists", endpoint)])
+    return middleware_cls(app)
+
+
+async def main(requests: int) -> None:
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.JSONRenderer(),
+        ],
+        logger_factory=structlog.WriteLoggerFactory(file=open("/dev/null", "w")),
+        cache_logger_on_first_use=True,
+    )
+
+    def scope():
+        return make_scope("/internal/users/00000000-0000-0000-0000-000000000001/exists")
+
+    baseline = await measure_rps(
+        build_app(LegacyRequestLoggingMiddleware), scope, requests
+    )
+    candidate = await measure_rps(build_app(RequestLoggingMiddleware), scope, requests)
+    report("RequestLoggingMiddleware", baseline, candidate)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,74 @@
+"""
+Накладные расходы сессии на запросы вне OAuth: SessionMiddleware на всем
+приложении против ScopedSessionMiddleware только на путях OAuth.
+
+Запрос несет подписанную cookie сессии, как браузер после входа через Google.
+
+Запуск:
+    python -m benchmarks.session_middleware --requests 20000
+"""
+
+import argparse
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from benchmarks._asgi import call_app, make_scope, measure_rps, report
+from src.constants import OAUTH_SESSION_PATHS
+from src.middleware.scoped_session import ScopedSessionMiddleware
+
+SECRET = "benchmark-secret"
+
+
+async def endpoint(request):
+    return JSONResponse({"exists": True})
+
+
+async def login(request):
+    # Как authlib: кладет state в сессию
+    request.session["_state_google_abc"] = {"data": {"nonce": "n"}, "exp": 0}
+    return JSONResponse({})
+
+
+def build_app(middleware_cls, **kwargs):
+    app = Starlette(
+        routes=[
+            Route("/internal/users/{user_id}/exists", endpoint),
+            Route(OAUTH_SESSION_PATHS[0], login),
+        ]
+    )
+    return middleware_cls(app, secret_key=SECRET, **kwargs)
+
+
+async def session_cookie() -> bytes:
+    """Получает настоящую подписанную cookie сессии."""
+    app = build_app(SessionMiddleware)
+    messages = await call_app(app, make_scope(OAUTH_SESSION_PATHS[0]))
+    headers = dict(messages[0]["headers"])
+    return headers[b"set-cookie"].split(b";")[0]
+
+
+async def main(requests: int) -> None:
+    cookie = await session_cookie()
+
+    def scope():
+        return make_scope(
+            "/internal/users/00000000-0000-0000-0000-000000000001/exists",
+            headers=[(b"cookie", cookie)],
+        )
+
+    app_wide = build_app(SessionMiddleware)
+    scoped = build_app(ScopedSessionMiddleware, paths=OAUTH_SESSION_PATHS)
+
+    baseline = await measure_rps(app_wide, scope, requests)
+    candidate = await measure_rps(scoped, scope, requests)
+    report("Non-OAuth request with session cookie", baseline, candidate)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args().requests))
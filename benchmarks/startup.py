@@ -0,0 +1,108 @@
+"""
+Бенчмарк холодного старта: время импорта `src.main` и RSS процесса после импорта.
+
+Каждый замер выполняется в отдельном интерпретаторе, чтобы не влиял кеш sys.modules.
+Скрипт завершается с кодом 1, если лучший из прогонов превышает бюджет, поэтому его
+можно запускать в CI как регрессионную проверку: шум (соседние процессы, холодный
+диск) только увеличивает время, и минимум выходит за бюджет лишь при реальной
+регрессии. Медиана печатается для сравнения.
+
+Запуск:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --max-import-ms 900 --max-rss-mb 100
+    python -m benchmarks.startup --forbid authlib --forbid asyncpg
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Модули, которые не должны загружаться при импорте приложения
+DEFAULT_FORBIDDEN = ["authlib", "httpx", "asyncpg"]
+
+_CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+import src.main  # noqa: F401
+elapsed_ms = (time.perf_counter() - start) * 1000
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+forbidden = [m for m in sys.argv[1:] if m in sys.modules]
+print(json.dumps({"import_ms": elapsed_ms, "rss_kb": rss_kb, "loaded": forbidden}))
+"""
+
+
+def measure_once(forbidden: list[str]) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD, *forbidden],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument(
+        "--max-import-ms",
+        type=float,
+        default=float(os.getenv("STARTUP_BUDGET_IMPORT_MS", 1000)),
+    )
+    parser.add_argument(
+        "--max-rss-mb",
+        type=float,
+        default=float(os.getenv("STARTUP_BUDGET_RSS_MB", 100)),
+    )
+    parser.add_argument(
+        "--forbid",
+        action="append",
+        default=None,
+        help="Модуль, который не должен импортироваться (можно несколько раз)",
+    )
+    args = parser.parse_args()
+    forbidden = args.forbid if args.forbid is not None else DEFAULT_FORBIDDEN
+
+    # Первый прогон прогревает .pyc и не учитывается
+    measure_once(forbidden)
+    samples = [measure_once(forbidden) for _ in range(args.runs)]
+
+    import_ms = min(s["import_ms"] for s in samples)
+    median_import_ms = statistics.median(s["import_ms"] for s in samples)
+    # ru_maxrss в Linux возвращается в килобайтах
+    rss_mb = min(s["rss_kb"] for s in samples) / 1024
+    median_rss_mb = statistics.median(s["rss_kb"] for s in samples) / 1024
+    loaded = sorted({m for s in samples for m in s["loaded"]})
+
+    print(
+        f"import src.main: best {import_ms:.1f} ms, median {median_import_ms:.1f} ms"
+        f" (budget {args.max_import_ms})"
+    )
+    print(
+        f"RSS after import: best {rss_mb:.1f} MB, median {median_rss_mb:.1f} MB"
+        f" (budget {args.max_rss_mb})"
+    )
+
+    failed = False
+    if import_ms > args.max_import_ms:
+        print("FAIL: import time budget exceeded")
+        failed = True
+    if rss_mb > args.max_rss_mb:
+        print("FAIL: RSS budget exceeded")
+        failed = True
+    if loaded:
+        print(f"FAIL: eagerly imported modules: {', '.join(loaded)}")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Чтение профиля пользователя: загрузка ORM-объекта UserModel
+и UserResponseSchema.model_validate (from_attributes) против выборки колонок
+профиля через Core и сборки схемы без валидации (UserService).
+
+Каждый поиск выполняется в отдельной сессии, как в запросе. Создает
+пользователей bench-*@example.com и удаляет их по завершении. Завершается
+с кодом 1, если ответы путей различаются.
+
+Запуск (нужна БД с примененными миграциями, по умолчанию DATABASE_URL):
+    python -m benchmarks.user_lookup --lookups 5000
+    python -m benchmarks.user_lookup --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks._asgi import report
+from src.config import settings
+from src.db.database import Base
+from src.db.models import UserModel
+from src.schemas.user import UserResponseSchema
+from src.services.user import UserService
+
+
+async def legacy_get_by_id(session: AsyncSession, user_id: uuid.UUID):
+    """Реализация до перехода на Core (для сравнения)."""
+    result = await session.execute(select(UserModel).where(UserModel.id == user_id))
+    return UserResponseSchema.model_validate(result.scalar_one_or_none())
+
+
+async def legacy_get_by_email(session: AsyncSession, email: str):
+    result = await session.execute(select(UserModel).where(UserModel.email == email))
+    return UserResponseSchema.model_validate(result.scalar_one_or_none())
+
+
+async def core_get_by_id(session: AsyncSession, user_id: uuid.UUID):
+    return await UserService(session).get_by_id(user_id)
+
+
+async def core_get_by_email(session: AsyncSession, email: str):
+    return await UserService(session).get_by_email(email)
+
+
+async def measure(session_maker, lookup, keys: list) -> float:
+    """Поисков в секунду при последовательных вызовах."""
+    start = time.perf_counter()
+    for key in keys:
+        async with session_maker() as session:
+            await lookup(session, key)
+    return len(keys) / (time.perf_counter() - start)
+
+
+async def run(database_url: str, users: int, lookups: int) -> int:
+    engine = create_async_engine(database_url)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "email": f"bench-{uuid.uuid4().hex}@example.com",
+            "name": "Иван Петров",
+            "picture_url": "https://lh3.googleusercontent.com/a/ACg8ocJ",
+            "role": "user",
+            "google_id": f"bench-{uuid.uuid4().hex}",
+            "is_active": True,
+        }
+        for _ in range(users)
+    ]
+    async with engine.begin() as conn:
+        # Для SQLite; в PostgreSQL таблицы уже созданы миграциями
+        await conn.run_sync(Base.metadata.create_all, tables=[UserModel.__table__])
+        await conn.execute(insert(UserModel), rows)
+
+    try:
+        ids = [random.choice(rows)["id"] for _ in range(lookups)]
+        emails = [random.choice(rows)["email"] for _ in range(lookups)]
+
+        async with session_maker() as session:
+            for row in rows[:50]:
+                legacy = await legacy_get_by_id(session, row["id"])
+                core = await core_get_by_id(session, row["id"])
+                if legacy.model_dump_json() != core.model_dump_json():
+                    print(f"responses differ:\n  {legacy!r}\n  {core!r}")
+                    return 1
+
+        cases = [
+            ("get_by_id", legacy_get_by_id, core_get_by_id, ids),
+            ("get_by_email", legacy_get_by_email, core_get_by_email, emails),
+        ]
+        for name, legacy, core, keys in cases:
+            # Прогрев пула соединений и кеша скомпилированных запросов
+            await measure(session_maker, legacy, keys[:200])
+            await measure(session_maker, core, keys[:200])
+            baseline = await measure(session_maker, legacy, keys)
+            candidate = await measure(session_maker, core, keys)
+            report(f"UserService.{name} (lookups/s)", baseline, candidate)
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(
+                delete(UserModel).where(UserModel.id.in_([row["id"] for row in rows]))
+            )
+        await engine.dispose()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    args = parser.parse_args()
+    return asyncio.run(run(args.database_url, args.users, args.lookups))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,9 @@
+import hmac
 import uuid
+from collections.abc import AsyncIterator, Callable
+from functools import cache
+from ipaddress import ip_address
+
 import structlog
 
 from src.logger import get_logger
@@ -8,17 +13,23 @@ from fastapi import Depends, Header, HTTPException, status
 from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.db.database import async_session_maker
+from auth_service_client.codecs import accepts_msgpack
+from src.config import settings
+from src.db.database import get_session_maker
 from src.exceptions import (
     InvalidTokenException,
     ExpiredTokenException,
 )
 from src.schemas.client import ClientInfo
-from src.schemas.user import CurrentUserSchema
+from src.security.admission import Priority, admitted
 from src.security.jwt_service import JWTService
 from src.security.oauth import GoogleOAuthClient
+from src.security.principal import Principal
+from src.security.rate_limit import enforce_rate_limit
+from src.security.trusted_proxy import is_trusted_proxy
 from src.services.auth import AuthService
 from src.services.user import UserService
+from src.services.user_loader import user_loader
 
 from src.constants import REFRESH_TOKEN_COOKIE_NAME
 
@@ -27,19 +38,31 @@ logger = get_logger(__name__)
 
 
 async def get_db() -> AsyncSession:
-    async with async_session_maker() as session:
+    async with get_session_maker()() as session:
         yield session
 
 
-def get_oauth_client() -> GoogleOAuthClient:
+# Зависимости без ввода-вывода объявлены async: синхронные FastAPI
+# выполняет в пуле потоков, что дороже самой работы
+
+_jwt_service = JWTService()
+
+
+@cache
+def _oauth_client() -> GoogleOAuthClient:
+    # Создается при первом OAuth-запросе: authlib импортируется лениво
     return GoogleOAuthClient()
 
 
-def get_jwt_service() -> JWTService:
-    return JWTService()
+async def get_oauth_client() -> GoogleOAuthClient:
+    return _oauth_client()
 
 
-def get_auth_service(
+async def get_jwt_service() -> JWTService:
+    return _jwt_service
+
+
+async def get_auth_service(
     session: Annotated[AsyncSession, Depends(get_db)],
     jwt_service: Annotated[JWTService, Depends(get_jwt_service)],
     oauth_client: Annotated[GoogleOAuthClient, Depends(get_oauth_client)],
@@ -51,7 +74,7 @@ def get_auth_service(
     )
 
 
-def get_refresh_token_from_cookie(request: Request) -> str:
+async def get_refresh_token_from_cookie(request: Request) -> str:
     token = request.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
     if not token:
         raise HTTPException(
@@ -61,7 +84,7 @@ def get_refresh_token_from_cookie(request: Request) -> str:
     return token
 
 
-def get_client_info(request: Request) -> ClientInfo:
+async def get_client_info(request: Request) -> ClientInfo:
     """Извлекает информацию о клиенте (User-Agent, IP).
 
     Args:
@@ -71,25 +94,91 @@ def get_client_info(request: Request) -> ClientInfo:
         ClientInfo: Объект с user-agent и ip-адресом
     """
     user_agent = request.headers.get("user-agent")
+    return ClientInfo(user_agent=user_agent, ip_address=get_client_ip(request))
 
-    x_forwarded_for = request.headers.get("x-forwarded-for")
-    if x_forwarded_for:
-        ip_address = x_forwarded_for.split(",")[0].strip()
-    else:
-        ip_address = request.headers.get("x-real-ip") or (
-            request.client.host if request.client else None
-        )
 
-    return ClientInfo(user_agent=user_agent, ip_address=ip_address)
+def get_client_ip(request: Request) -> str | None:
+    """IP клиента с учетом доверенных прокси.
+
+    Заголовки прокси учитываются, только если соединение пришло с адреса из
+    TRUSTED_PROXY_NETWORKS. Из X-Forwarded-For берется адрес на позиции
+    TRUSTED_PROXY_HOPS справа: его дописал наш внешний прокси, а все, что
+    левее, клиент может подставить сам (и получать новый лимит на каждый
+    запрос).
+
+    Args:
+        request: Объект запроса FastAPI
+
+    Returns:
+        IP-адрес клиента или None, если адрес соединения неизвестен
+    """
+    peer = request.client.host if request.client else None
+    if peer is None or settings.TRUSTED_PROXY_HOPS <= 0:
+        return peer
+    if not is_trusted_proxy(peer):
+        return peer
+
+    forwarded = [
+        item.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for item in header.split(",")
+        if item.strip()
+    ]
+    if forwarded:
+        candidate = forwarded[-min(settings.TRUSTED_PROXY_HOPS, len(forwarded))]
+    else:
+        candidate = request.headers.get("x-real-ip", "").strip()
+    try:
+        return str(ip_address(candidate))
+    except ValueError:
+        return peer
 
 
 JWTServiceDep = Annotated[JWTService, Depends(get_jwt_service)]
 
 
-def get_current_user_from_token(
+async def limit_google_callback(
+    client_info: Annotated[ClientInfo, Depends(get_client_info)],
+) -> None:
+    """Лимит частоты callback OAuth по IP (пользователь еще неизвестен).
+
+    Raises:
+        RateLimitExceededException: 429 Too Many Requests
+    """
+    if settings.RATE_LIMIT_ENABLED:
+        await enforce_rate_limit("google_callback", client_info.ip_address)
+
+
+async def limit_token_refresh(
+    request: Request,
+    client_info: Annotated[ClientInfo, Depends(get_client_info)],
+    jwt_service: JWTServiceDep,
+) -> None:
+    """Лимит частоты обновления токенов по IP и по пользователю.
+
+    Пользователь берется из refresh токена только после проверки подписи:
+    иначе поддельным токеном можно исчерпать чужой лимит. Невалидный токен
+    учитывается только в лимите по IP и отклоняется дальше без записи в БД.
+
+    Raises:
+        RateLimitExceededException: 429 Too Many Requests
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    user_id = None
+    token = request.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
+    if token:
+        try:
+            user_id = jwt_service.verify_refresh_token(token).get("sub")
+        except (InvalidTokenException, ExpiredTokenException):
+            pass
+    await enforce_rate_limit("token_refresh", client_info.ip_address, user_id)
+
+
+async def get_current_user_from_token(
     jwt_service: JWTServiceDep,
     authorization: str | None = Header(None),
-) -> CurrentUserSchema:
+) -> Principal:
     """Извлекает текущего пользователя из Bearer токена.
 
     Args:
@@ -97,7 +186,7 @@ def get_current_user_from_token(
         jwt_service: Зависимость сервиса JWT
 
     Returns:
-        Словарь пользователя с id, email, role
+        Principal с id, email, role
 
     Raises:
         HTTPException: 401 Unauthorized, если токен невалиден, просрочен или отсутствует
@@ -135,18 +224,14 @@ def get_current_user_from_token(
             detail=e.detail,
         )
 
-    return CurrentUserSchema(
-        id=payload["sub"],
-        email=payload["email"],
-        role=payload["role"],
-    )
+    return Principal.from_token_payload(payload)
 
 
-def get_current_user(
+async def get_current_user(
     request: Request,
     jwt_service: JWTServiceDep,
     authorization: str | None = Header(None),
-) -> CurrentUserSchema:
+) -> Principal:
     """Получает текущего пользователя из заголовков Gateway или Bearer токена.
 
     Поддерживает два метода аутентификации:
@@ -159,7 +244,7 @@ def get_current_user(
         jwt_service: Зависимость сервиса JWT
 
     Returns:
-        Словарь пользователя с id, email, role
+        Principal с id, email, role
 
     Raises:
         HTTPException: 401, если аутентификация не удалась
@@ -173,14 +258,14 @@ def get_current_user(
         structlog.contextvars.bind_contextvars(user_id=user_id)
         request.state.user_id = user_id
         logger.debug("user_context_bound", source="gateway_headers", user_id=user_id)
-        return CurrentUserSchema(
+        return Principal(
             id=uuid.UUID(user_id),
             email=user_email,
             role=user_role,
         )
 
     if authorization:
-        user = get_current_user_from_token(
+        user = await get_current_user_from_token(
             authorization=authorization, jwt_service=jwt_service
         )
         structlog.contextvars.bind_contextvars(user_id=str(user.id))
@@ -194,10 +279,61 @@ def get_current_user(
     )
 
 
-def get_user_service(
+async def get_user_service(
     session: Annotated[AsyncSession, Depends(get_db)],
 ) -> UserService:
-    return UserService(session=session)
+    return UserService(
+        session=session,
+        loader=user_loader if settings.USER_LOADER_ENABLED else None,
+    )
+
+
+def admission(priority: Priority) -> Callable[[], AsyncIterator[None]]:
+    """Зависимость маршрута: слот контроля допуска с приоритетом `priority`.
+
+    Указывается в dependencies маршрута, поэтому слот берется до открытия
+    сессии БД и освобождается после ответа.
+
+    Raises:
+        ServerOverloadedException: 503 Service Unavailable с Retry-After
+    """
+
+    async def admit() -> AsyncIterator[None]:
+        async with admitted(priority):
+            yield
+
+    return admit
+
+
+admit_high = admission(Priority.HIGH)
+admit_normal = admission(Priority.NORMAL)
+admit_low = admission(Priority.LOW)
+
+
+async def get_accepts_msgpack(
+    accept: Annotated[str | None, Header()] = None,
+) -> bool:
+    """Запрошен ли ответ в MessagePack (межсервисные вызовы)."""
+    return accepts_msgpack(accept)
+
+
+async def verify_debug_token(
+    x_debug_token: Annotated[str | None, Header()] = None,
+) -> None:
+    """Доступ к отладочным эндпоинтам по заголовку X-Debug-Token.
+
+    Raises:
+        HTTPException: 404, если INTERNAL_DEBUG_TOKEN не задан (эндпоинты
+            выключены); 403, если токен не передан или неверен
+    """
+    if not settings.INTERNAL_DEBUG_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if x_debug_token is None or not hmac.compare_digest(
+        x_debug_token.encode(), settings.INTERNAL_DEBUG_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid debug token"
+        )
 
 
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
@@ -205,5 +341,6 @@ OAuthClientDep = Annotated[GoogleOAuthClient, Depends(get_oauth_client)]
 AuthServiceDep = Annotated[AuthService, Depends(get_auth_service)]
 RefreshTokenDep = Annotated[str, Depends(get_refresh_token_from_cookie)]
 ClientInfoDep = Annotated[ClientInfo, Depends(get_client_info)]
-CurrentUserDep = Annotated[CurrentUserSchema, Depends(get_current_user)]
+CurrentUserDep = Annotated[Principal, Depends(get_current_user)]
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
+AcceptsMsgPackDep = Annotated[bool, Depends(get_accepts_msgpack)]
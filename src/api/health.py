@@ -0,0 +1,44 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Request, Response, status
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/health")
+async def health_check() -> dict[str, str]:
+    return {"status": "healthy", "service": "auth-service"}
+
+
+@router.get("/livez", status_code=status.HTTP_200_OK)
+async def liveness() -> dict[str, str]:
+    """Liveness probe: процесс жив и обслуживает event loop.
+
+    Не обращается к зависимостям, чтобы недоступность БД не приводила
+    к перезапуску подов.
+    """
+    return {"status": "alive"}
+
+
+@router.get(
+    "/readyz",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "БД недоступна, пул насыщен или инстанс еще прогревается"
+        },
+    },
+)
+async def readiness(request: Request, response: Response) -> dict:
+    """Readiness probe: может ли инстанс принимать трафик.
+
+    Отдает закешированный результат фоновой проверки БД и текущую
+    насыщенность пула соединений, не выполняя запросов к БД.
+    """
+    snapshot = request.app.state.db_prober.snapshot()
+    if not snapshot.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if snapshot.ready else "not_ready",
+        **asdict(snapshot),
+    }
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from src.api.dependencies import verify_debug_token
+from src.logger import get_logger
+from src.observability.profiling import (
+    ProfilerBusyError,
+    cpu_profiler,
+    format_collapsed,
+    memory_profiler,
+)
+
+logger = get_logger(__name__)
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["Internal Debug API"],
+    dependencies=[Depends(verify_debug_token)],
+)
+
+
+@router.get(
+    "/profile/cpu",
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
+)
+async def profile_cpu(
+    seconds: float = Query(10.0, ge=1, le=60, description="Длительность профиля"),
+    interval_ms: float = Query(5.0, ge=1, le=100, description="Период семплирования"),
+    all_threads: bool = Query(
+        False, description="Профилировать все потоки, а не только event loop"
+    ),
+) -> PlainTextResponse:
+    """Семплирующий CPU-профиль воркера, обработавшего запрос.
+
+    Семплер работает в отдельном потоке, event loop продолжает обслуживать
+    запросы; в профиль попадает именно их обработка. Результат — collapsed
+    stacks для flamegraph.pl или speedscope.
+
+    Args:
+        seconds: Длительность профиля, секунды (1..60)
+        interval_ms: Период семплирования, мс (1..100)
+        all_threads: Включить в профиль потоки пула и фоновые потоки
+
+    Returns:
+        Строки "frame;frame;frame <count>", по убыванию числа семплов
+
+    Raises:
+        HTTPException: 409, если профиль в этом воркере уже снимается
+    """
+    loop_thread_id = None if all_threads else threading.get_ident()
+    logger.warning("cpu_profile_started", seconds=seconds, interval_ms=interval_ms)
+    try:
+        stacks, samples = await asyncio.to_thread(
+            cpu_profiler.profile, seconds, interval_ms / 1000, loop_thread_id
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    logger.warning("cpu_profile_finished", samples=samples, stacks=len(stacks))
+    return PlainTextResponse(
+        format_collapsed(stacks), headers={"X-Profile-Samples": str(samples)}
+    )
+
+
+@router.post("/memory/start", status_code=status.HTTP_204_NO_CONTENT)
+async def start_memory_tracing(
+    frames: int = Query(10, ge=1, le=50, description="Глубина стека аллокаций"),
+) -> None:
+    """Включает tracemalloc и снимает базовый снимок памяти.
+
+    Пока tracemalloc включен, каждая аллокация дороже; после диагностики
+    вызовите /memory/stop.
+
+    Args:
+        frames: Число кадров стека, сохраняемых для каждой аллокации
+    """
+    await asyncio.to_thread(memory_profiler.start, frames)
+    logger.warning("memory_tracing_started", frames=frames)
+
+
+@router.get("/memory/diff", status_code=status.HTTP_200_OK)
+async def get_memory_diff(
+    limit: int = Query(25, ge=1, le=200, description="Число строк топа"),
+    group_by: Literal["lineno", "filename", "traceback"] = Query(
+        "lineno", description="Группировка аллокаций"
+    ),
+) -> dict:
+    """Прирост памяти с предыдущего снимка (или с /memory/start).
+
+    Каждый вызов делает текущий снимок новой базой, поэтому серия вызовов
+    показывает, где память растет между ними.
+
+    Returns:
+        Текущий и пиковый объем отслеживаемой памяти и топ мест аллокаций
+        по приросту
+
+    Raises:
+        HTTPException: 409, если tracemalloc не включен
+    """
+    if not memory_profiler.active:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Memory tracing is not started",
+        )
+    return await asyncio.to_thread(memory_profiler.diff, limit, group_by)
+
+
+@router.post("/memory/stop", status_code=status.HTTP_204_NO_CONTENT)
+async def stop_memory_tracing() -> None:
+    """Выключает tracemalloc и освобождает собранные трассы."""
+    memory_profiler.stop()
+    logger.warning("memory_tracing_stopped")
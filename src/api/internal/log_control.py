@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, status
+
+from src.api.dependencies import verify_debug_token
+from src.logger import get_logger
+from src.observability.log_sampling import log_control
+from src.schemas.log_control import LogControlSchema, LogControlUpdateSchema
+
+logger = get_logger(__name__)
+
+# Уровень DEBUG или доля семплирования 1 увеличивают объем логов и нагрузку,
+# доля 0 скрывает трафик: доступ только с X-Debug-Token
+router = APIRouter(
+    prefix="/logging",
+    tags=["Internal Logging API"],
+    dependencies=[Depends(verify_debug_token)],
+)
+
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def get_log_control() -> LogControlSchema:
+    """Текущие уровень логирования и параметры семплирования воркера.
+
+    Returns:
+        LogControlSchema с уровнем, долями семплирования и порогом
+        медленного запроса
+    """
+    return LogControlSchema(**log_control.snapshot())
+
+
+@router.put("", status_code=status.HTTP_200_OK)
+async def update_log_control(data: LogControlUpdateSchema) -> LogControlSchema:
+    """Изменение уровня логирования и семплирования без перезапуска.
+
+    Действует только на воркер, обработавший запрос, и до его перезапуска;
+    значения по умолчанию задаются LOG_LEVEL и LOG_SAMPLE_RATE*.
+
+    Args:
+        data: Изменяемые параметры (не переданные остаются прежними)
+
+    Returns:
+        LogControlSchema с примененными параметрами
+    """
+    if data.level is not None:
+        log_control.set_level(data.level)
+    if data.sample_rate is not None:
+        log_control.default_rate = data.sample_rate
+    if data.route_sample_rates is not None:
+        log_control.route_rates = {
+            route: min(max(rate, 0.0), 1.0)
+            for route, rate in data.route_sample_rates.items()
+        }
+    if data.slow_request_ms is not None:
+        log_control.slow_request_ms = data.slow_request_ms
+
+    snapshot = log_control.snapshot()
+    logger.warning(
+        "log_control_updated",
+        log_level=snapshot["level"],
+        sample_rate=snapshot["sample_rate"],
+        route_sample_rates=snapshot["route_sample_rates"],
+        slow_request_ms=snapshot["slow_request_ms"],
+    )
+    return LogControlSchema(**snapshot)
@@ -1,6 +1,12 @@
 from fastapi import APIRouter
 
+from src.api.internal.debug import router as debug_router
+from src.api.internal.log_control import router as log_control_router
+from src.api.internal.stats import router as stats_router
 from src.api.internal.users import router as users_router
 
 router = APIRouter(prefix="/internal")
 router.include_router(users_router)
+router.include_router(stats_router)
+router.include_router(log_control_router)
+router.include_router(debug_router)
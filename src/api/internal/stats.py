@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, status
+
+from src.api.dependencies import verify_debug_token
+from src.logger import log_sink_stats
+from src.security.admission import admission_controller
+from src.security.http_client import pool_stats
+from src.security.resilience import breakers_stats
+
+# Внутреннее состояние пулов, breaker'ов и очередей: доступ с X-Debug-Token
+router = APIRouter(
+    prefix="/stats",
+    tags=["Internal Stats API"],
+    dependencies=[Depends(verify_debug_token)],
+)
+
+
+@router.get("/http-client", status_code=status.HTTP_200_OK)
+async def get_http_client_stats() -> dict:
+    """Статистика пула исходящих соединений к Google текущего воркера.
+
+    Returns:
+        Количество соединений (всего, HTTP/2, простаивающих, активных)
+        и запросов, ожидающих свободного соединения
+    """
+    return pool_stats()
+
+
+@router.get("/circuit-breakers", status_code=status.HTTP_200_OK)
+async def get_circuit_breakers_stats() -> dict:
+    """Состояние circuit breaker'ов запросов к Google текущего воркера.
+
+    Returns:
+        Для каждого breaker'а: состояние, число сбоев подряд, число
+        отклоненных вызовов и счетчики переходов между состояниями
+    """
+    return breakers_stats()
+
+
+@router.get("/log-sink", status_code=status.HTTP_200_OK)
+async def get_log_sink_stats() -> dict | None:
+    """Состояние асинхронного приемника логов текущего воркера.
+
+    Returns:
+        Размер очереди, число записанных и отброшенных записей
+        и ошибок записи; null, если LOG_ASYNC_SINK выключен
+    """
+    return log_sink_stats()
+
+
+@router.get("/admission", status_code=status.HTTP_200_OK)
+async def get_admission_stats() -> dict:
+    """Состояние контроля допуска текущего воркера.
+
+    Returns:
+        Число слотов и занятых слотов по приоритетам, длины очередей,
+        среднее время удержания слота и счетчики отклоненных запросов
+    """
+    return admission_controller.stats()
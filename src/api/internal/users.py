@@ -1,31 +1,63 @@
-from fastapi import APIRouter, status
 import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Response, status
+
+from src.api.dependencies import AcceptsMsgPackDep, UserServiceDep, admit_high
+from src.api.responses import MsgPackResponse
+from auth_service_client.codecs import MSGPACK_MEDIA_TYPE
+from src.observability.server_timing import ServerTimingRoute
+from src.schemas.user import (
+    UserBatchRequestSchema,
+    UserBatchResponseSchema,
+    UserResponseSchema,
+)
 
-from src.api.dependencies import UserServiceDep
-from src.schemas.user import UserResponseSchema
+# Поиск пользователей другими сервисами идет в первую очередь
+router = APIRouter(
+    prefix="/users",
+    tags=["Internal Users API"],
+    route_class=ServerTimingRoute,
+    dependencies=[Depends(admit_high)],
+)
 
-router = APIRouter(prefix="/users", tags=["Internal Users API"])
+# Ответы доступны и в MessagePack (Accept: application/msgpack)
+MSGPACK_CONTENT = {"content": {MSGPACK_MEDIA_TYPE: {}}}
+# Формат ответа выбирается по Accept: кеши не должны смешивать JSON и MessagePack
+VARY_ACCEPT = {"Vary": "Accept"}
 
 
 @router.get(
     "/{user_id}",
     status_code=status.HTTP_200_OK,
     responses={
+        status.HTTP_200_OK: MSGPACK_CONTENT,
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Профиль не изменился (ETag совпал с If-None-Match)"
+        },
         status.HTTP_404_NOT_FOUND: {"description": "Пользователь не найден"},
     },
 )
 async def get_user_by_id(
     user_id: uuid.UUID,
     user_service: UserServiceDep,
+    response: Response,
+    msgpack: AcceptsMsgPackDep,
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> UserResponseSchema:
     """Получение пользователя по ID для межсервисного взаимодействия.
 
     Internal API эндпоинт для других сервисов (Cart, Order).
     Не требует JWT токена, доступен только внутри Docker-сети.
+    Сервисы, опрашивающие профиль, передают полученный ETag в If-None-Match
+    и получают 304 без тела, пока пользователь не изменился.
 
     Args:
         user_id: UUID пользователя
         user_service: Зависимость сервиса пользователей
+        response: Объект ответа для заголовка ETag
+        msgpack: Ответ в MessagePack вместо JSON
+        if_none_match: ETag профиля, полученный ранее
 
     Returns:
         UserResponseSchema с данными пользователя
@@ -33,13 +65,61 @@ async def get_user_by_id(
     Raises:
         UserNotFoundException: 404 Not Found, если пользователь не найден
     """
-    return await user_service.get_by_id(user_id)
+    user, etag = await user_service.get_profile(
+        user_id, if_none_match, variant="msgpack" if msgpack else ""
+    )
+    headers = {"ETag": etag, **VARY_ACCEPT}
+    if user is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if msgpack:
+        return MsgPackResponse(user, headers=headers)
+    response.headers.update(headers)
+    return user
+
+
+@router.post(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: MSGPACK_CONTENT},
+)
+async def get_users_batch(
+    data: UserBatchRequestSchema,
+    user_service: UserServiceDep,
+    response: Response,
+    msgpack: AcceptsMsgPackDep,
+) -> UserBatchResponseSchema:
+    """Получение нескольких пользователей одним запросом.
+
+    Internal API эндпоинт для сервисов, которым нужны профили списка
+    пользователей (например, страница заказов): один запрос к БД вместо
+    запроса на каждого пользователя.
 
+    Args:
+        data: Идентификаторы пользователей
+        user_service: Зависимость сервиса пользователей
+        response: Объект ответа для заголовка Vary
+        msgpack: Ответ в MessagePack вместо JSON
 
-@router.get("/{user_id}/exists", status_code=status.HTTP_200_OK)
+    Returns:
+        UserBatchResponseSchema с найденными пользователями и ненайденными id
+    """
+    result = await user_service.get_many(data.ids)
+    if msgpack:
+        return MsgPackResponse(result, headers=VARY_ACCEPT)
+    response.headers.update(VARY_ACCEPT)
+    return result
+
+
+@router.get(
+    "/{user_id}/exists",
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: MSGPACK_CONTENT},
+)
 async def check_user_exists(
     user_id: uuid.UUID,
     user_service: UserServiceDep,
+    response: Response,
+    msgpack: AcceptsMsgPackDep,
 ) -> dict[str, bool]:
     """Проверка существования пользователя по ID для межсервисного взаимодействия.
 
@@ -49,24 +129,33 @@ async def check_user_exists(
     Args:
         user_id: UUID пользователя
         user_service: Зависимость сервиса пользователей
+        response: Объект ответа для заголовка Vary
+        msgpack: Ответ в MessagePack вместо JSON
 
     Returns:
         {"exists": true} если пользователь существует, иначе {"exists": false}
     """
     exists = await user_service.exists(user_id)
+    if msgpack:
+        return MsgPackResponse({"exists": exists}, headers=VARY_ACCEPT)
+    response.headers.update(VARY_ACCEPT)
     return {"exists": exists}
 
 
+# path: "/" в email приходит закодированным (%2F), но в пути уже раскодирован
 @router.get(
-    "/by-email/{email}",
+    "/by-email/{email:path}",
     status_code=status.HTTP_200_OK,
     responses={
+        status.HTTP_200_OK: MSGPACK_CONTENT,
         status.HTTP_404_NOT_FOUND: {"description": "Пользователь не найден"},
     },
 )
 async def get_user_by_email(
     email: str,
     user_service: UserServiceDep,
+    response: Response,
+    msgpack: AcceptsMsgPackDep,
 ) -> UserResponseSchema:
     """Получение пользователя по email для межсервисного взаимодействия.
 
@@ -76,6 +165,8 @@ async def get_user_by_email(
     Args:
         email: Email пользователя
         user_service: Зависимость сервиса пользователей
+        response: Объект ответа для заголовка Vary
+        msgpack: Ответ в MessagePack вместо JSON
 
     Returns:
         UserResponseSchema с данными пользователя
@@ -83,4 +174,8 @@ async def get_user_by_email(
     Raises:
         UserNotFoundException: 404 Not Found, если пользователь не найден
     """
-    return await user_service.get_by_email(email)
+    user = await user_service.get_by_email(email)
+    if msgpack:
+        return MsgPackResponse(user, headers=VARY_ACCEPT)
+    response.headers.update(VARY_ACCEPT)
+    return user
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from src.db.database import get_engine
+from src.observability.metrics import render_latest, update_db_pool_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Метрики Prometheus (при PROMETHEUS_MULTIPROC_DIR — по всем воркерам)."""
+    update_db_pool_metrics(get_engine().pool)
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
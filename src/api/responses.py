@@ -0,0 +1,22 @@
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from auth_service_client.codecs import MSGPACK_MEDIA_TYPE, packb
+
+
+class MsgPackResponse(Response):
+    """
+    Ответ в MessagePack для межсервисных вызовов (Accept: application/msgpack).
+
+    Pydantic-модели выгружаются в python-режиме, поэтому UUID и datetime
+    кодируются компактными расширениями MessagePack, а не строками.
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = content.model_dump()
+        return packb(content)
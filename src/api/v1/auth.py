@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status, Response, HTTPException
+from fastapi import APIRouter, Depends, status, Response, HTTPException
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
@@ -8,6 +8,10 @@ from src.api.dependencies import (
     RefreshTokenDep,
     ClientInfoDep,
     CurrentUserDep,
+    admit_high,
+    admit_normal,
+    limit_google_callback,
+    limit_token_refresh,
 )
 from src.config import settings
 from src.constants import (
@@ -16,9 +20,12 @@ from src.constants import (
     REFRESH_TOKEN_COOKIE_PATH,
 )
 from src.exceptions import UserNotFoundException
+from src.observability.server_timing import ServerTimingRoute
 from src.schemas.oauth import TokenResponseSchema
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(
+    prefix="/auth", tags=["Authentication"], route_class=ServerTimingRoute
+)
 
 
 @router.get(
@@ -46,10 +53,19 @@ async def google_login(request: Request, oauth_client: OAuthClientDep):
     "/google/callback",
     name="google_callback",
     status_code=status.HTTP_302_FOUND,
+    # Слот контроля допуска берется в authenticate_google только на работу с
+    # БД: обмен code с Google (секунды при сбоях) не должен занимать слоты
+    dependencies=[Depends(limit_google_callback)],
     responses={
         status.HTTP_400_BAD_REQUEST: {
             "description": "Google вернул ошибку (например, access_denied)"
         },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "description": "Превышен лимит запросов с IP (заголовок Retry-After)"
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Сервис перегружен (заголовок Retry-After)"
+        },
         status.HTTP_502_BAD_GATEWAY: {
             "description": "Сетевая ошибка подключения к Google"
         },
@@ -78,6 +94,7 @@ async def google_callback(
 
     Raises:
         OAuthProviderException: 400 Bad Request, если Google вернул ошибку
+        RateLimitExceededException: 429 Too Many Requests, если превышен лимит
         OAuthAuthenticationException: 502 Bad Gateway, если сетевая ошибка
         AuthServiceException: 500 Internal Server Error, если внутренняя ошибка
     """
@@ -109,10 +126,17 @@ async def google_callback(
 @router.post(
     "/refresh",
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(limit_token_refresh), Depends(admit_high)],
     responses={
         status.HTTP_401_UNAUTHORIZED: {
             "description": "Токен невалиден, просрочен или отозван, или пользователь не найден"
         },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "description": "Превышен лимит запросов с IP или пользователя (заголовок Retry-After)"
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "description": "Сервис перегружен (заголовок Retry-After)"
+        },
     },
 )
 async def refresh_tokens(
@@ -139,6 +163,7 @@ async def refresh_tokens(
 
     Raises:
         HTTPException: 401 Unauthorized, если токен невалиден, просрочен, отозван или пользователь не найден
+        RateLimitExceededException: 429 Too Many Requests, если превышен лимит
     """
     try:
         # Обновление токенов (с ротацией)
@@ -172,6 +197,7 @@ async def refresh_tokens(
 @router.post(
     "/logout",
     status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admit_normal)],
     responses={
         status.HTTP_401_UNAUTHORIZED: {"description": "Токен не найден или невалиден"},
     },
@@ -205,6 +231,10 @@ async def logout(
     )
 
 
-@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+@router.post(
+    "/logout-all",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admit_normal)],
+)
 async def logout_all(current_user: CurrentUserDep, auth_service: AuthServiceDep):
     await auth_service.logout_all(current_user.id)
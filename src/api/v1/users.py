@@ -1,29 +1,49 @@
-from fastapi import APIRouter, status
+from typing import Annotated
 
-from src.api.dependencies import CurrentUserDep, UserServiceDep
+from fastapi import APIRouter, Depends, Header, Response, status
+
+from src.api.dependencies import (
+    CurrentUserDep,
+    UserServiceDep,
+    admit_low,
+    admit_normal,
+)
+from src.observability.server_timing import ServerTimingRoute
 from src.schemas.user import UserResponseSchema, UserUpdateSchema
 
-router = APIRouter(prefix="/users", tags=["Пользователи"])
+router = APIRouter(
+    prefix="/users", tags=["Пользователи"], route_class=ServerTimingRoute
+)
 
 
 @router.get(
     "/me",
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admit_normal)],
     responses={
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Профиль не изменился (ETag совпал с If-None-Match)"
+        },
         status.HTTP_404_NOT_FOUND: {"description": "Пользователь не найден"},
     },
 )
 async def get_current_user_profile(
     current_user: CurrentUserDep,
     user_service: UserServiceDep,
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> UserResponseSchema:
     """Получение профиля текущего пользователя.
 
     Требует аутентификации через заголовки Gateway или Bearer токен.
+    Ответ содержит ETag; при совпадении с If-None-Match возвращается 304
+    без тела.
 
     Args:
         current_user: Текущий пользователь из аутентификации
         user_service: Зависимость сервиса пользователей
+        response: Объект ответа для заголовка ETag
+        if_none_match: ETag профиля, полученный клиентом ранее
 
     Returns:
         UserResponseSchema с полным профилем
@@ -31,12 +51,19 @@ async def get_current_user_profile(
     Raises:
         UserNotFoundException: 404 Not Found, если пользователь не найден
     """
-    return await user_service.get_by_id(current_user.id)
+    user, etag = await user_service.get_profile(current_user.id, if_none_match)
+    if user is None:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
+    return user
 
 
 @router.patch(
     "/me",
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(admit_low)],
     responses={
         status.HTTP_404_NOT_FOUND: {"description": "Пользователь не найден"},
     },
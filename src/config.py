@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,6 +24,33 @@ class Settings(BaseSettings):
     # Возможные значения: "DEBUG" | "INFO" | "WARNING" | "ERROR" | "CRITICAL"
     LOG_LEVEL: str = "INFO"
 
+    # Асинхронная запись логов: записи копятся в очереди и пишутся в stderr
+    # пачками из фонового потока, не блокируя обработку запросов
+    LOG_ASYNC_SINK: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_BATCH_SIZE: int = 256
+    LOG_FLUSH_INTERVAL_SECONDS: float = 0.5
+    # Поведение при заполненной очереди:
+    # "drop" - запись отбрасывается сразу (учитывается в счетчике dropped)
+    # "block" - ожидание до LOG_QUEUE_BLOCK_TIMEOUT_SECONDS, затем отбрасывается
+    LOG_QUEUE_FULL_POLICY: Literal["drop", "block"] = "drop"
+    LOG_QUEUE_BLOCK_TIMEOUT_SECONDS: float = 1.0
+
+    # Семплирование записей успешных быстрых запросов (доля 0..1).
+    # 5xx, 401/403 и запросы дольше LOG_SLOW_REQUEST_MS сохраняются всегда.
+    # Меняется на лету через PUT /internal/logging
+    LOG_SAMPLE_RATE: float = 1.0
+    # Доли по шаблону маршрута, JSON: {"/internal/users/{user_id}/exists": 0.01}
+    LOG_ROUTE_SAMPLE_RATES: dict[str, float] = {}
+    LOG_SLOW_REQUEST_MS: float = 500.0
+    # События, к которым применяется семплирование
+    LOG_SAMPLED_EVENTS: list[str] = [
+        "request_finished",
+        "user_context_bound",
+        "token_refresh_started",
+        "token_refreshed",
+    ]
+
     # Вывод SQL-запросов SQLAlchemy в консоль (независим от DEBUG)
     # Если True - все SQL-запросы выводятся в консоль
     DB_ECHO: bool = False
@@ -33,6 +61,25 @@ class Settings(BaseSettings):
     DB_PASS: str = ""
     DB_NAME: str = "auth_db"
 
+    # Параметры пула соединений SQLAlchemy
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # Соединений на весь контейнер при запуске через src.server: делится
+    # между воркерами в пропорции DB_POOL_SIZE : DB_MAX_OVERFLOW.
+    # Не задан - DB_POOL_SIZE + DB_MAX_OVERFLOW, как у одного процесса,
+    # поэтому число воркеров не меняет число соединений контейнера.
+    # 0 или меньше - каждый воркер получает DB_POOL_SIZE + DB_MAX_OVERFLOW
+    DB_POOL_BUDGET: int | None = None
+
+    # Профилирование SQL: число запросов и время БД на HTTP-запрос
+    # (в логе request_finished и в метриках)
+    DB_PROFILING_ENABLED: bool = True
+    # Запросы дольше порога логируются как sql_slow_query (с нормализованным SQL)
+    DB_SLOW_QUERY_MS: float = 100.0
+    # Запрос одной формы, выполненный столько раз за HTTP-запрос, — вероятный N+1
+    DB_N_PLUS_ONE_THRESHOLD: int = 5
+
     @property
     def DATABASE_URL(self) -> str:
         return (
@@ -40,16 +87,95 @@ class Settings(BaseSettings):
             f"{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    # Запуск через `python -m src.server` (uvloop, httptools, несколько воркеров)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8001
+    # 0 - по числу доступных ядер с учетом квоты CPU контейнера (cgroup)
+    SERVER_WORKERS: int = 0
+    # Перезапуск воркера после N запросов (0 - не перезапускать) со случайной
+    # добавкой до JITTER, чтобы воркеры не перезапускались одновременно
+    SERVER_MAX_REQUESTS: int = 0
+    SERVER_MAX_REQUESTS_JITTER: int = 0
+    # Ожидание завершения текущих запросов при остановке воркера
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+
     # JWT settings
     JWT_SECRET_KEY: str = ""
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
 
+    # Заголовок Server-Timing (фазы db, jwt, oauth, serialize, total).
+    # Включается для запроса заголовком X-Server-Timing: <SERVER_TIMING_TOKEN>
+    # (пустой токен отключает этот способ) или для доли запросов
+    SERVER_TIMING_TOKEN: str = ""
+    SERVER_TIMING_SAMPLE_RATE: float = 0.0
+
+    # Токен эндпоинтов эксплуатации /internal/debug/*, /internal/logging и
+    # /internal/stats/* (заголовок X-Debug-Token).
+    # Пустое значение отключает эндпоинты (404)
+    INTERNAL_DEBUG_TOKEN: str = ""
+
+    # Трассировка: спаны запроса, SQL, JWT и запросов к Google, контекст
+    # W3C traceparent от gateway. Трассы сохраняются после завершения
+    # (tail sampling): ошибки, медленные и выбранные вызывающей стороной —
+    # всегда, остальные — с вероятностью TRACING_SAMPLE_RATE
+    TRACING_ENABLED: bool = False
+    # "file" - строки OTLP/JSON в TRACING_FILE_PATH (формат file exporter
+    # OpenTelemetry Collector); "otlp" - POST в OTLP/HTTP endpoint коллектора
+    TRACING_EXPORTER: Literal["file", "otlp"] = "file"
+    TRACING_FILE_PATH: str = "/tmp/auth-service/traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_SAMPLE_RATE: float = 0.01
+    TRACING_SLOW_TRACE_MS: float = 500.0
+    TRACING_MAX_SPANS_PER_TRACE: int = 256
+    TRACING_MAX_QUEUE: int = 8192
+    TRACING_BATCH_SIZE: int = 512
+    TRACING_EXPORT_INTERVAL_SECONDS: float = 2.0
+
     # Google OAuth settings
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_CLIENT_SECRET: str = ""
     GOOGLE_REDIRECT_URI: str = ""
+    GOOGLE_DISCOVERY_URL: str = (
+        "https://accounts.google.com/.well-known/openid-configuration"
+    )
+
+    # Общий HTTP-клиент для исходящих запросов к Google (один на воркер)
+    OAUTH_HTTP2: bool = True
+    OAUTH_HTTP_MAX_CONNECTIONS: int = 20
+    OAUTH_HTTP_MAX_KEEPALIVE: int = 10
+    OAUTH_HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    OAUTH_HTTP_CONNECT_TIMEOUT: float = 3.0
+    OAUTH_HTTP_READ_TIMEOUT: float = 5.0
+    # Ожидание свободного соединения в пуле
+    OAUTH_HTTP_POOL_TIMEOUT: float = 2.0
+
+    # Circuit breaker запросов к Google: после N сбоев подряд запросы
+    # отклоняются сразу (503) на время восстановления
+    OAUTH_BREAKER_FAILURE_THRESHOLD: int = 5
+    OAUTH_BREAKER_RECOVERY_SECONDS: float = 30.0
+    # Дедлайн одной попытки обмена code на токены
+    OAUTH_TOKEN_ATTEMPT_TIMEOUT_SECONDS: float = 3.0
+    # Hedged requests: если обмен не завершился за OAUTH_HEDGE_DELAY_SECONDS,
+    # параллельно отправляется повторный запрос с тем же code
+    OAUTH_HEDGE_ENABLED: bool = False
+    OAUTH_HEDGE_DELAY_SECONDS: float = 0.75
+    OAUTH_HEDGE_MAX_ATTEMPTS: int = 2
+
+    # Кеш OpenID discovery и JWKS Google
+    # Файл переживает рестарт, поэтому первые логины не ждут ответа Google
+    # Пустая строка - не сохранять кеш на диск
+    # Каталог не должен быть общим (не /tmp): файл, принадлежащий другому
+    # пользователю или доступный на запись группе/всем, не загружается
+    OIDC_CACHE_PATH: str = "~/.cache/auth-service/oidc-cache.json"
+    # TTL, если Google не прислал Cache-Control: max-age
+    OIDC_CACHE_DEFAULT_TTL_SECONDS: float = 3600.0
+    OIDC_CACHE_MIN_TTL_SECONDS: float = 60.0
+    # Доля TTL, после которой данные обновляются в фоне
+    OIDC_CACHE_REFRESH_AHEAD_RATIO: float = 0.8
+    # Интервал повторных попыток, если Google недоступен
+    OIDC_CACHE_RETRY_SECONDS: float = 30.0
 
     # Frontend URL for redirects after OAuth
     FRONTEND_URL: str = "http://localhost:3000"
@@ -64,5 +190,80 @@ class Settings(BaseSettings):
     # Session settings (for OAuth state)
     SESSION_SECRET_KEY: str = ""
 
+    # Чтение профилей пользователей (UserService.get_by_id, exists):
+    # одинаковые одновременные запросы объединяются, разные id в пределах
+    # окна читаются одним запросом id = ANY($1)
+    USER_LOADER_ENABLED: bool = True
+    USER_LOADER_WINDOW_MS: float = 1.0
+    USER_LOADER_MAX_BATCH: int = 100
+
+    # IP клиента (лимиты частоты, сессии). X-Forwarded-For и X-Real-IP
+    # учитываются, только если соединение пришло от доверенного прокси
+    # (адрес из TRUSTED_PROXY_NETWORKS); иначе берется адрес соединения.
+    # TRUSTED_PROXY_HOPS - число прокси перед сервисом, дописывающих адрес в
+    # X-Forwarded-For: клиентом считается адрес на этой позиции справа, левее
+    # стоят значения, которые прислал сам клиент. 0 - заголовки не учитываются
+    TRUSTED_PROXY_HOPS: int = 1
+    TRUSTED_PROXY_NETWORKS: list[str] = [
+        "127.0.0.0/8",
+        "10.0.0.0/8",
+        "172.16.0.0/12",
+        "192.168.0.0/16",
+        "::1/128",
+        "fc00::/7",
+    ]
+
+    # Ограничение частоты POST /auth/refresh и GET /auth/google/callback
+    # (token bucket): по IP клиента и по пользователю из refresh токена.
+    # При превышении - 429 с Retry-After
+    RATE_LIMIT_ENABLED: bool = True
+    # "memory" - бакеты в памяти воркера (лимит действует на каждый воркер);
+    # "postgres" - общие для всех реплик, таблица rate_limit_buckets
+    RATE_LIMIT_BACKEND: Literal["memory", "postgres"] = "memory"
+    # Скорость пополнения (запросов в минуту) и емкость бакета (всплеск)
+    RATE_LIMIT_IP_PER_MINUTE: float = 30.0
+    RATE_LIMIT_IP_BURST: int = 10
+    RATE_LIMIT_USER_PER_MINUTE: float = 12.0
+    RATE_LIMIT_USER_BURST: int = 5
+    # Бакеты "memory": число шардов и предел ключей на воркер
+    RATE_LIMIT_MEMORY_SHARDS: int = 16
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 100_000
+    # Бакеты "postgres": отдельный пул воркера (сверх DB_POOL_SIZE) и
+    # ожидание соединения, после которого запрос пропускается без проверки
+    RATE_LIMIT_DB_POOL_SIZE: int = 2
+    RATE_LIMIT_DB_POOL_TIMEOUT: float = 0.5
+
+    # Контроль допуска запросов, работающих с БД: одновременно в воркере
+    # не больше ADMISSION_MAX_CONCURRENCY (0 - DB_POOL_SIZE + DB_MAX_OVERFLOW),
+    # остальные ждут в очереди по приоритету маршрута (high: refresh, callback,
+    # internal-запросы; normal: чтение профиля, logout; low: изменение профиля).
+    # Если ожидание превысит ADMISSION_MAX_WAIT_MS приоритета - сразу 503
+    # с Retry-After, а не ожидание соединения до DB_POOL_TIMEOUT
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 0
+    ADMISSION_MAX_QUEUE: int = 100
+    ADMISSION_MAX_WAIT_MS: dict[str, float] = {
+        "high": 2000.0,
+        "normal": 1000.0,
+        "low": 500.0,
+    }
+    # Доля слотов, которую могут занять запросы low
+    ADMISSION_LOW_PRIORITY_SHARE: float = 0.5
+
+    # Контроль задержки event loop: метрика auth_event_loop_lag_seconds
+    # и стек потока цикла в логе при блокировке дольше порога
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_LAG_CHECK_INTERVAL_SECONDS: float = 0.1
+    LOOP_BLOCKED_THRESHOLD_MS: float = 100.0
+    # Не чаще одной записи со стеком за интервал (счетчик считает все)
+    LOOP_BLOCKED_LOG_COOLDOWN_SECONDS: float = 5.0
+
+    # Health probes (/livez, /readyz)
+    # Фоновая проверка БД: эндпоинты отдают закешированный результат без запроса в БД
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+    # Доля занятых соединений пула, при которой инстанс выводится из ротации
+    HEALTH_POOL_SATURATION_THRESHOLD: float = 0.9
+
 
 settings = Settings()
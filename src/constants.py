@@ -14,3 +14,9 @@ REFRESH_TOKEN_TYPE = "refresh"
 REFRESH_TOKEN_COOKIE_NAME = "refresh_token"
 REFRESH_TOKEN_COOKIE_PATH = "/api/auth"
 REFRESH_TOKEN_COOKIE_MAX_AGE = 30 * 24 * 60 * 60  # 30 days in seconds
+
+# Пути, на которых нужна сессия (OAuth state между редиректом и callback)
+OAUTH_SESSION_PATHS = (
+    "/api/v1/auth/google",
+    "/api/v1/auth/google/callback",
+)
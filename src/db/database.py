@@ -1,13 +1,92 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from functools import cache
+from typing import Any
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from src.config import settings
 
-engine = create_async_engine(url=settings.DATABASE_URL, echo=settings.DB_ECHO)
 
-async_session_maker = async_sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
-)
+def _create_engine(
+    pool_size: int, max_overflow: int, pool_timeout: float
+) -> AsyncEngine:
+    engine = create_async_engine(
+        url=settings.DATABASE_URL,
+        echo=settings.DB_ECHO,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+    )
+    if settings.DB_PROFILING_ENABLED:
+        from src.observability.sql_profiler import install_sql_profiler
+
+        install_sql_profiler(engine.sync_engine)
+    if settings.TRACING_ENABLED:
+        from src.observability.tracing import install_sql_tracing
+
+        install_sql_tracing(engine.sync_engine)
+    return engine
+
+
+@cache
+def get_engine() -> AsyncEngine:
+    """
+    Создает engine при первом обращении.
+
+    create_async_engine импортирует драйвер asyncpg и диалект PostgreSQL,
+    поэтому engine не создается при импорте модуля (alembic и модели
+    используют только Base).
+    """
+    return _create_engine(
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.DB_POOL_TIMEOUT
+    )
+
+
+@cache
+def get_rate_limit_engine() -> AsyncEngine:
+    """
+    Отдельный небольшой пул для лимитов частоты (RATE_LIMIT_BACKEND=postgres).
+
+    Лимит проверяется до слота контроля допуска: в общем пуле при его
+    насыщении проверка ждала бы соединение до DB_POOL_TIMEOUT, а не отдавала
+    503 сразу. Здесь ожидание ограничено RATE_LIMIT_DB_POOL_TIMEOUT.
+    """
+    return _create_engine(
+        settings.RATE_LIMIT_DB_POOL_SIZE, 0, settings.RATE_LIMIT_DB_POOL_TIMEOUT
+    )
+
+
+@cache
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(get_engine(), class_=AsyncSession, expire_on_commit=False)
+
+
+@cache
+def get_rate_limit_session_maker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        get_rate_limit_engine(), class_=AsyncSession, expire_on_commit=False
+    )
+
+
+async def dispose_engines() -> None:
+    """Закрывает соединения всех созданных engine."""
+    await get_engine().dispose()
+    if get_rate_limit_engine.cache_info().currsize:
+        await get_rate_limit_engine().dispose()
+
+
+def __getattr__(name: str) -> Any:
+    # Обратная совместимость: `from src.db.database import engine`
+    if name == "engine":
+        return get_engine()
+    if name == "async_session_maker":
+        return get_session_maker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Base(DeclarativeBase):
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, func
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -83,3 +83,22 @@ class RefreshTokenModel(Base):
 
     def __repr__(self) -> str:
         return f"<RefreshTokenModel(id={self.id}, user_id={self.user_id}, is_revoked={self.is_revoked})>"
+
+
+class RateLimitBucketModel(Base):
+    """Состояние token bucket ограничителя частоты (RATE_LIMIT_BACKEND=postgres)."""
+
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    # Момент, когда бакет снова полон: после него строку можно удалить
+    full_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<RateLimitBucketModel(key={self.key}, tokens={self.tokens})>"
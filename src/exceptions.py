@@ -39,3 +39,41 @@ class RefreshTokenNotFoundException(AuthServiceException):
     """Вызывается, когда refresh токен не найден в куках."""
 
     detail = "Refresh token not found"
+
+
+class ServiceUnavailableException(AuthServiceException):
+    """Вызывается, когда сервис временно не может обработать запрос.
+
+    retry_after передается клиенту в заголовке Retry-After (секунды).
+    """
+
+    detail = "Service temporarily unavailable"
+
+    def __init__(self, detail: str | None = None, retry_after: int | None = None):
+        super().__init__(detail)
+        self.retry_after = retry_after
+
+
+class RateLimitExceededException(AuthServiceException):
+    """Вызывается, когда клиент превысил лимит частоты запросов.
+
+    retry_after передается клиенту в заголовке Retry-After (секунды).
+    """
+
+    detail = "Too many requests"
+
+    def __init__(self, detail: str | None = None, retry_after: int | None = None):
+        super().__init__(detail)
+        self.retry_after = retry_after
+
+
+class ServerOverloadedException(ServiceUnavailableException):
+    """Вызывается, когда запрос не допущен к обработке из-за перегрузки воркера."""
+
+    detail = "Server is overloaded. Please try again later."
+
+
+class OAuthCircuitOpenException(ServiceUnavailableException):
+    """Вызывается, когда circuit breaker запросов к Google разомкнут."""
+
+    detail = "Google OAuth is temporarily unavailable. Please try again later."
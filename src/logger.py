@@ -1,14 +1,36 @@
 import logging
 import sys
+
+import orjson
 import structlog
 
 from src.config import settings
+from src.observability.log_sampling import log_control
+from src.observability.log_sink import (
+    BatchingLogSink,
+    QueueLoggerFactory,
+    stderr_stream,
+)
+from src.observability.metrics import LOG_RECORDS_DROPPED
+
+_log_sink: BatchingLogSink | None = None
 
 
 def setup_logging() -> None:
-    """Конфигурирует structlog в зависимости от режима DEBUG."""
+    """Конфигурирует structlog в зависимости от режима DEBUG.
+
+    Уровень и семплирование задаются объектом log_control (см. LogControl).
+    При LOG_ASYNC_SINK записи рендерятся в потоке вызова, а пишутся в stderr
+    пачками из фонового потока (см. BatchingLogSink).
+    """
+    global _log_sink
+
+    # Уровень проверяется процессором, чтобы его можно было менять на лету
+    log_control.set_level(settings.LOG_LEVEL)
     shared_processors = [
+        log_control.filter_level,
         structlog.contextvars.merge_contextvars,
+        log_control.sample,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso", utc=True),
     ]
@@ -21,19 +43,46 @@ def setup_logging() -> None:
         processors = shared_processors + [
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=orjson.dumps),
         ]
 
-    log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
+    if settings.LOG_ASYNC_SINK:
+        if _log_sink is None:
+            _log_sink = BatchingLogSink(
+                stderr_stream(),
+                max_queue=settings.LOG_QUEUE_SIZE,
+                batch_size=settings.LOG_BATCH_SIZE,
+                flush_interval=settings.LOG_FLUSH_INTERVAL_SECONDS,
+                policy=settings.LOG_QUEUE_FULL_POLICY,
+                block_timeout=settings.LOG_QUEUE_BLOCK_TIMEOUT_SECONDS,
+                on_drop=LOG_RECORDS_DROPPED.inc,
+            )
+        logger_factory = QueueLoggerFactory(_log_sink)
+    elif settings.DEBUG:
+        logger_factory = structlog.WriteLoggerFactory(file=sys.stderr)
+    else:
+        # orjson возвращает bytes
+        logger_factory = structlog.BytesLoggerFactory(file=sys.stderr.buffer)
 
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.make_filtering_bound_logger(log_level),
-        logger_factory=structlog.WriteLoggerFactory(file=sys.stderr),
+        wrapper_class=structlog.make_filtering_bound_logger(logging.NOTSET),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
 
+def shutdown_logging() -> None:
+    """Дописывает накопленные в очереди записи. Вызывается при остановке."""
+    if _log_sink is not None:
+        _log_sink.close()
+
+
+def log_sink_stats() -> dict | None:
+    """Счетчики асинхронного приемника логов (None, если он выключен)."""
+    return _log_sink.stats() if _log_sink is not None else None
+
+
 def get_logger(name: str | None = None) -> structlog.stdlib.BoundLogger:
     """Возвращает настроенный логгер."""
     return structlog.get_logger(name)
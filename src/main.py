@@ -1,14 +1,28 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from starlette.middleware.sessions import SessionMiddleware
 import structlog
 
 from src.config import settings
 from src.api.v1.router import router as v1_router
 from src.api.internal.router import router as internal_router
-from src.logger import setup_logging, get_logger
+from src.api.health import router as health_router
+from src.api.metrics import router as metrics_router
+from src.db.database import dispose_engines, get_engine
+from src.observability.health import DatabaseHealthProber
+from src.observability.loop_watchdog import LoopWatchdog
+from src.observability.metrics import mark_process_dead
+from src.observability.server_timing import ServerTimingMiddleware
+from src.observability.tracing import TracingMiddleware, shutdown_tracing
+from src.security.http_client import close_http_client
+from src.security.oidc_cache import oidc_cache
+from src.logger import setup_logging, get_logger, shutdown_logging
+from src.constants import OAUTH_SESSION_PATHS
+from src.middleware.metrics import MetricsMiddleware
 from src.middleware.request_logger import RequestLoggingMiddleware
+from src.middleware.scoped_session import ScopedSessionMiddleware
 from src.exceptions import (
     UserNotFoundException,
     InvalidTokenException,
@@ -17,6 +31,8 @@ from src.exceptions import (
     RefreshTokenNotFoundException,
     OAuthAuthenticationException,
     OAuthProviderException,
+    ServiceUnavailableException,
+    RateLimitExceededException,
     AuthServiceException,
 )
 
@@ -24,11 +40,38 @@ logger = get_logger(__name__)
 
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    engine = get_engine()
+    app.state.db_prober = DatabaseHealthProber(engine)
+    await app.state.db_prober.start()
+    app.state.loop_watchdog = LoopWatchdog()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        await app.state.loop_watchdog.start()
+    await oidc_cache.start()
+    logger.info("app_started")
+    yield
+    await oidc_cache.stop()
+    await close_http_client()
+    await app.state.db_prober.stop()
+    await app.state.loop_watchdog.stop()
+    await dispose_engines()
+    shutdown_tracing()
+    mark_process_dead()
+    logger.info("app_stopped")
+    shutdown_logging()
+
+
+# default_response_class не задается: для маршрутов с типом ответа FastAPI
+# сериализует модель сразу в байты через pydantic-core, а собственный класс
+# ответа возвращает jsonable_encoder + json.dumps (benchmarks/json_responses.py)
 app = FastAPI(
     title="Auth Service",
     description="Authentication microservice with Google OAuth 2.0 and JWT",
     version="0.1.0",
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -40,19 +83,20 @@ app.add_middleware(
 )
 
 app.add_middleware(
-    SessionMiddleware,
+    ScopedSessionMiddleware,
+    paths=OAUTH_SESSION_PATHS,
     secret_key=settings.SESSION_SECRET_KEY,
 )
 
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 app.add_middleware(RequestLoggingMiddleware)
 
 app.include_router(v1_router)
 app.include_router(internal_router)
-
-
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy", "service": "auth-service"}
+app.include_router(health_router)
+app.include_router(metrics_router)
 
 
 @app.exception_handler(UserNotFoundException)
@@ -92,6 +136,28 @@ async def oauth_authentication_handler(
     )
 
 
+@app.exception_handler(RateLimitExceededException)
+async def rate_limit_handler(request: Request, exc: RateLimitExceededException):
+    headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": exc.detail},
+        headers=headers,
+    )
+
+
+@app.exception_handler(ServiceUnavailableException)
+async def service_unavailable_handler(
+    request: Request, exc: ServiceUnavailableException
+):
+    headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": exc.detail},
+        headers=headers,
+    )
+
+
 @app.exception_handler(AuthServiceException)
 async def auth_service_handler(request: Request, exc: AuthServiceException):
     return JSONResponse(
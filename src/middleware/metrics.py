@@ -0,0 +1,52 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.observability.log_sampling import route_template
+from src.observability.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+)
+from src.observability.sql_profiler import current_query_stats
+
+
+class MetricsMiddleware:
+    """
+    Гистограмма времени ответа по методу, шаблону маршрута и статусу.
+
+    Метка route — шаблон (/internal/users/{user_id}), а не фактический путь,
+    чтобы число временных рядов не росло с числом пользователей. Запросы
+    без найденного маршрута попадают в route="unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_template(scope) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], route, str(status_code)
+            ).observe(time.perf_counter() - start_time)
+
+            # Статистику SQL собирает внешний RequestLoggingMiddleware
+            query_stats = current_query_stats()
+            if query_stats is not None:
+                DB_QUERIES_PER_REQUEST.labels(route).observe(query_stats.count)
+                DB_TIME_PER_REQUEST.labels(route).observe(query_stats.total_ms / 1000)
@@ -2,17 +2,42 @@ import time
 import uuid
 
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.observability.log_sampling import current_request_scope, route_template
+from src.observability.sql_profiler import collect_query_stats, finish_request
 
 logger = structlog.get_logger()
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
-        client_ip = request.client.host if request.client else "unknown"
+class RequestLoggingMiddleware:
+    """
+    Логирование запросов на чистом ASGI (без BaseHTTPMiddleware).
+
+    Привязывает request_id/client_ip к контексту structlog, добавляет
+    X-Request-ID в ответ через обертку send и пишет request_finished после
+    отправки последнего фрагмента тела, не буферизуя ответ.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id:
+            request_id = str(uuid.uuid4())
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
 
         structlog.contextvars.clear_contextvars()
         structlog.contextvars.bind_contextvars(
@@ -21,19 +46,71 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         )
 
         start_time = time.perf_counter()
-        response = await call_next(request)
-        duration_ms = (time.perf_counter() - start_time) * 1000
-
-        if hasattr(request.state, "user_id"):
-            structlog.contextvars.bind_contextvars(user_id=request.state.user_id)
-
-        logger.info(
-            "request_finished",
-            method=request.method,
-            status_code=response.status_code,
-            path=request.url.path,
-            duration_ms=round(duration_ms, 2),
-        )
+        status_code = 500
+        response_started_at: float | None = None
+        logged = False
+
+        def log_finished() -> None:
+            nonlocal logged
+            logged = True
+            end_time = time.perf_counter()
+
+            user_id = scope.get("state", {}).get("user_id")
+            if user_id is not None:
+                structlog.contextvars.bind_contextvars(user_id=user_id)
+
+            route = route_template(scope)
+            db_fields = {}
+            if settings.DB_PROFILING_ENABLED:
+                finish_request(route, query_stats)
+                db_fields = {
+                    "db_queries": query_stats.count,
+                    "db_ms": round(query_stats.total_ms, 2),
+                }
+
+            logger.info(
+                "request_finished",
+                method=scope["method"],
+                status_code=status_code,
+                path=scope["path"],
+                route=route,
+                duration_ms=round((end_time - start_time) * 1000, 2),
+                # ttfb_ms: до http.response.start; response_ms: от него
+                # до последнего фрагмента тела
+                ttfb_ms=(
+                    round((response_started_at - start_time) * 1000, 2)
+                    if response_started_at is not None
+                    else None
+                ),
+                response_ms=(
+                    round((end_time - response_started_at) * 1000, 2)
+                    if response_started_at is not None
+                    else None
+                ),
+                **db_fields,
+            )
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_started_at
+            if message["type"] == "http.response.start":
+                response_started_at = time.perf_counter()
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+                await send(message)
+                return
+
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                log_finished()
 
-        response.headers["X-Request-ID"] = request_id
-        return response
+        scope_token = current_request_scope.set(scope)
+        with collect_query_stats() as query_stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                current_request_scope.reset(scope_token)
+                # Ответ не был отправлен полностью (исключение или обрыв соединения)
+                if not logged:
+                    log_finished()
@@ -0,0 +1,25 @@
+from collections.abc import Iterable
+
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class ScopedSessionMiddleware:
+    """
+    SessionMiddleware, который работает только на перечисленных путях.
+
+    Сессия нужна лишь для передачи OAuth state между /auth/google и
+    /auth/google/callback. Остальные запросы не разбирают cookie, не проверяют
+    подпись itsdangerous и не получают Set-Cookie.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str], **session_kwargs):
+        self.app = app
+        self.session_app = SessionMiddleware(app, **session_kwargs)
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.paths:
+            await self.session_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
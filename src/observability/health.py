@@ -0,0 +1,118 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import settings
+from src.logger import get_logger
+from src.observability.metrics import update_db_pool_metrics
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class HealthSnapshot:
+    """Снимок состояния зависимостей для /readyz."""
+
+    ready: bool
+    warmed_up: bool
+    db_reachable: bool
+    pool_saturation: float
+    last_probe_at: float | None
+    last_error: str | None
+
+
+class DatabaseHealthProber:
+    """
+    Фоновая проверка доступности PostgreSQL.
+
+    Раз в HEALTH_PROBE_INTERVAL_SECONDS выполняет `SELECT 1` и кеширует результат,
+    поэтому вызовы /readyz не создают нагрузку на пул соединений.
+    Насыщенность пула считается по счетчикам пула в памяти при каждом вызове,
+    чтобы перегруженный инстанс выводился из ротации без ожидания следующей проверки.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        interval: float = settings.HEALTH_PROBE_INTERVAL_SECONDS,
+        timeout: float = settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+        saturation_threshold: float = settings.HEALTH_POOL_SATURATION_THRESHOLD,
+    ):
+        self._engine = engine
+        self._interval = interval
+        self._timeout = timeout
+        self._saturation_threshold = saturation_threshold
+        self._task: asyncio.Task | None = None
+
+        self._warmed_up = False
+        self._db_reachable = False
+        self._last_probe_at: float | None = None
+        self._last_error: str | None = None
+
+    async def start(self) -> None:
+        """Выполняет первую проверку и запускает фоновый цикл."""
+        await self.probe()
+        self._task = asyncio.create_task(self._run(), name="db-health-prober")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.probe()
+
+    async def probe(self) -> None:
+        """Одна проверка БД. Никогда не пробрасывает исключения."""
+        try:
+            async with asyncio.timeout(self._timeout):
+                async with self._engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            if self._db_reachable or self._last_error is None:
+                logger.warning("db_probe_failed", error=repr(e))
+            self._db_reachable = False
+            self._last_error = repr(e)
+        else:
+            if not self._db_reachable:
+                logger.info("db_probe_recovered")
+            self._db_reachable = True
+            self._warmed_up = True
+            self._last_error = None
+        finally:
+            self._last_probe_at = time.time()
+            update_db_pool_metrics(self._engine.pool)
+
+    def pool_saturation(self) -> float:
+        """Доля занятых соединений от максимума пула (pool_size + max_overflow)."""
+        pool = self._engine.pool
+        capacity = pool.size() + max(settings.DB_MAX_OVERFLOW, 0)
+        if capacity <= 0:
+            return 0.0
+        return pool.checkedout() / capacity
+
+    def snapshot(self) -> HealthSnapshot:
+        saturation = self.pool_saturation()
+        ready = (
+            self._warmed_up
+            and self._db_reachable
+            and saturation < self._saturation_threshold
+        )
+        return HealthSnapshot(
+            ready=ready,
+            warmed_up=self._warmed_up,
+            db_reachable=self._db_reachable,
+            pool_saturation=round(saturation, 3),
+            last_probe_at=self._last_probe_at,
+            last_error=self._last_error,
+        )
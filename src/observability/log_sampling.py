@@ -0,0 +1,136 @@
+import logging
+import zlib
+from contextvars import ContextVar
+
+import structlog
+from starlette.types import Scope
+
+from src.config import settings
+
+# Scope текущего запроса: нужен процессору, чтобы узнать шаблон маршрута
+# для записей, сделанных внутри обработчика
+current_request_scope: ContextVar[Scope | None] = ContextVar(
+    "current_request_scope", default=None
+)
+
+# Статусы, записи о которых никогда не отбрасываются (кроме 5xx)
+ALWAYS_KEEP_STATUSES = frozenset({401, 403})
+
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+    "exception": logging.ERROR,
+    "critical": logging.CRITICAL,
+    "fatal": logging.CRITICAL,
+}
+
+
+def route_template(scope: Scope | None) -> str | None:
+    """Шаблон маршрута запроса (например, /internal/users/{user_id})."""
+    if scope is None:
+        return None
+    # FastAPI хранит маршрут подключенного роутера без префикса, полный
+    # шаблон (с префиксами include_router) лежит в его контексте маршрута
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path_format", None)
+    if path:
+        return path
+    return getattr(scope.get("route"), "path", None)
+
+
+class LogControl:
+    """
+    Изменяемые на лету уровень логирования и семплирование записей запросов.
+
+    Уровень проверяется процессором `filter_level`, а не оберткой structlog,
+    поэтому меняется без перезапуска и без пересоздания закешированных логгеров.
+
+    Процессор `sample` оставляет долю `rate` записей из `sampled_events`
+    (request_finished, user_context_bound, token_refreshed, ...). Решение
+    детерминировано по request_id: для одного запроса все его записи либо
+    остаются, либо отбрасываются вместе. request_finished сохраняется всегда,
+    если ответ 5xx, 401/403 или запрос дольше `slow_request_ms`. Записи
+    уровня WARNING и выше не семплируются.
+    """
+
+    def __init__(
+        self,
+        level: str = settings.LOG_LEVEL,
+        default_rate: float = settings.LOG_SAMPLE_RATE,
+        route_rates: dict[str, float] | None = None,
+        slow_request_ms: float = settings.LOG_SLOW_REQUEST_MS,
+        sampled_events: frozenset[str] = frozenset(settings.LOG_SAMPLED_EVENTS),
+    ):
+        self.level = logging.INFO
+        self.set_level(level)
+        self.default_rate = default_rate
+        self.route_rates: dict[str, float] = dict(
+            settings.LOG_ROUTE_SAMPLE_RATES if route_rates is None else route_rates
+        )
+        self.slow_request_ms = slow_request_ms
+        self.sampled_events = sampled_events
+
+    def set_level(self, level: str) -> None:
+        value = logging.getLevelName(level.upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unknown log level: {level}")
+        self.level = value
+
+    @property
+    def level_name(self) -> str:
+        return logging.getLevelName(self.level)
+
+    def rate_for(self, route: str | None) -> float:
+        if route is not None:
+            return self.route_rates.get(route, self.default_rate)
+        return self.default_rate
+
+    def filter_level(self, logger, method_name: str, event_dict: dict) -> dict:
+        if _LEVELS.get(method_name, logging.INFO) < self.level:
+            raise structlog.DropEvent
+        return event_dict
+
+    def sample(self, logger, method_name: str, event_dict: dict) -> dict:
+        if event_dict.get("event") not in self.sampled_events:
+            return event_dict
+        if _LEVELS.get(method_name, logging.INFO) >= logging.WARNING:
+            return event_dict
+        if self._must_keep(event_dict):
+            return event_dict
+
+        route = event_dict.get("route") or route_template(current_request_scope.get())
+        rate = self.rate_for(route)
+        if rate >= 1.0:
+            return event_dict
+
+        request_id = event_dict.get("request_id")
+        if request_id is None or rate <= 0.0:
+            raise structlog.DropEvent
+        # Одинаковое решение для всех записей запроса (и во всех воркерах)
+        if zlib.crc32(str(request_id).encode()) / 0x1_0000_0000 >= rate:
+            raise structlog.DropEvent
+        return event_dict
+
+    def _must_keep(self, event_dict: dict) -> bool:
+        status_code = event_dict.get("status_code")
+        if status_code is not None and (
+            status_code >= 500 or status_code in ALWAYS_KEEP_STATUSES
+        ):
+            return True
+        duration_ms = event_dict.get("duration_ms")
+        return duration_ms is not None and duration_ms >= self.slow_request_ms
+
+    def snapshot(self) -> dict:
+        return {
+            "level": self.level_name,
+            "sample_rate": self.default_rate,
+            "route_sample_rates": dict(self.route_rates),
+            "slow_request_ms": self.slow_request_ms,
+            "sampled_events": sorted(self.sampled_events),
+        }
+
+
+log_control = LogControl()
@@ -0,0 +1,166 @@
+import queue
+import sys
+import threading
+from collections.abc import Callable
+from typing import Any, BinaryIO, Literal
+
+QueueFullPolicy = Literal["drop", "block"]
+
+_STOP = object()
+
+
+class BatchingLogSink:
+    """
+    Неблокирующий приемник готовых строк логов.
+
+    Строки кладутся в ограниченную очередь, фоновый поток забирает их пачками
+    до `batch_size` и пишет одним вызовом write. Поток событий не ждет
+    медленный stderr: при заполненной очереди запись либо отбрасывается
+    (policy="drop"), либо ждет не дольше `block_timeout` и затем отбрасывается
+    (policy="block"). Отброшенные записи считаются в `dropped`.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        max_queue: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        policy: QueueFullPolicy = "drop",
+        block_timeout: float = 1.0,
+        on_drop: Callable[[], None] | None = None,
+    ):
+        self._stream = stream
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._policy = policy
+        self._block_timeout = block_timeout
+        self._on_drop = on_drop
+
+        self.dropped = 0
+        self.written = 0
+        self.write_errors = 0
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run, name="log-sink-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, line: bytes) -> None:
+        """Ставит строку в очередь на запись (без перевода строки)."""
+        if self._closed:
+            self._drop()
+            return
+        try:
+            if self._policy == "block":
+                self._queue.put(line, timeout=self._block_timeout)
+            else:
+                self._queue.put_nowait(line)
+        except queue.Full:
+            self._drop()
+
+    def _drop(self) -> None:
+        self.dropped += 1
+        if self._on_drop is not None:
+            self._on_drop()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                continue
+
+            batch: list[bytes] = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+            while not stop and len(batch) < self._batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            if batch:
+                self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch: list[bytes]) -> None:
+        batch.append(b"")
+        try:
+            self._stream.write(b"\n".join(batch))
+            self._stream.flush()
+            self.written += len(batch) - 1
+        except (OSError, ValueError):
+            # Логировать ошибку записи логов некуда — только считаем
+            self.write_errors += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Дописывает накопленные записи и останавливает поток записи."""
+        if self._closed:
+            return
+        self._closed = True
+        # Маркер остановки ставится после всех уже принятых записей
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "policy": self._policy,
+            "queued": self._queue.qsize(),
+            "max_queue": self._queue.maxsize,
+            "written": self.written,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors,
+        }
+
+
+class QueueLogger:
+    """Логгер structlog, передающий отрендеренные записи в BatchingLogSink."""
+
+    def __init__(self, sink: BatchingLogSink):
+        self._sink = sink
+
+    def msg(self, message: str | bytes) -> None:
+        if isinstance(message, str):
+            message = message.encode("utf-8", "replace")
+        self._sink.write(message)
+
+    log = debug = info = warn = warning = msg
+    error = err = critical = exception = fatal = failure = msg
+
+
+class QueueLoggerFactory:
+    """Фабрика логгеров structlog поверх общего BatchingLogSink."""
+
+    def __init__(self, sink: BatchingLogSink):
+        self._sink = sink
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger(self._sink)
+
+
+def stderr_stream() -> BinaryIO:
+    """Бинарный поток stderr (или его обертка, если buffer недоступен)."""
+    return getattr(sys.stderr, "buffer", None) or _TextStreamAdapter(sys.stderr)
+
+
+class _TextStreamAdapter:
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, data: bytes) -> None:
+        self._stream.write(data.decode("utf-8", "replace"))
+
+    def flush(self) -> None:
+        self._stream.flush()
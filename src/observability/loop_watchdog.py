@@ -0,0 +1,107 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+
+from src.config import settings
+from src.logger import get_logger
+from src.observability.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+logger = get_logger(__name__)
+
+
+class LoopWatchdog:
+    """
+    Контроль задержки event loop.
+
+    Задача в цикле засыпает на `interval` и измеряет, насколько позже
+    запланированного она проснулась: это время, на которое синхронный код
+    задержал все конкурентные запросы (метрика auth_event_loop_lag_seconds).
+
+    Поток-наблюдатель следит за отметкой последнего пробуждения. Если цикл
+    не просыпается дольше `threshold`, поток снимает стек потока event loop
+    прямо во время блокировки и пишет его в лог (event_loop_blocked): в стеке
+    видно, какой вызов держит цикл. Если блокирующий вызов не отпускает GIL,
+    стек снимается сразу после его завершения.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.LOOP_LAG_CHECK_INTERVAL_SECONDS,
+        threshold_ms: float = settings.LOOP_BLOCKED_THRESHOLD_MS,
+        log_cooldown: float = settings.LOOP_BLOCKED_LOG_COOLDOWN_SECONDS,
+    ):
+        self._interval = interval
+        self._threshold = threshold_ms / 1000
+        self._log_cooldown = log_cooldown
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+        self._loop_thread_id: int | None = None
+        self._heartbeat = time.monotonic()
+        self._reported_heartbeat: float | None = None
+        self._last_logged_at = float("-inf")
+
+    async def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run(), name="loop-watchdog")
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.monotonic() + self._interval
+            await asyncio.sleep(self._interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            EVENT_LOOP_LAG.observe(max(now - expected, 0.0))
+
+    def _watch(self) -> None:
+        # Проверяем в несколько раз чаще порога, чтобы застать блокировку
+        poll = max(min(self._threshold / 4, self._interval), 0.005)
+        while not self._stopped.wait(poll):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - self._interval
+            if blocked < self._threshold or heartbeat == self._reported_heartbeat:
+                continue
+            # Одна запись на каждую блокировку
+            self._reported_heartbeat = heartbeat
+            EVENT_LOOP_BLOCKED.inc()
+            self._report(blocked)
+
+    def _report(self, blocked: float) -> None:
+        now = time.monotonic()
+        if now - self._last_logged_at < self._log_cooldown:
+            return
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        self._last_logged_at = now
+
+        code = frame.f_code
+        logger.warning(
+            "event_loop_blocked",
+            blocked_ms=round(blocked * 1000, 1),
+            blocking_call=f"{code.co_name} ({code.co_filename}:{frame.f_lineno})",
+            stack="".join(traceback.format_stack(frame)),
+        )
@@ -0,0 +1,236 @@
+import functools
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# При нескольких воркерах задайте PROMETHEUS_MULTIPROC_DIR (пустой каталог,
+# очищаемый перед запуском): каждый воркер пишет значения в файлы, а /metrics
+# в любом воркере агрегирует их
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# Границы бакетов под время ответа сервиса (секунды)
+REQUEST_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Подпись/проверка JWT занимает десятки микросекунд
+JWT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ["method", "route", "status"],
+    buckets=REQUEST_BUCKETS,
+)
+
+TOKEN_OPERATIONS = Counter(
+    "auth_token_operations_total",
+    "Выдача, обновление и отзыв токенов по результату",
+    ["operation", "outcome"],
+)
+
+JWT_DURATION = Histogram(
+    "auth_jwt_duration_seconds",
+    "Время подписи и проверки JWT",
+    ["operation"],
+    buckets=JWT_BUCKETS,
+)
+
+OAUTH_REQUEST_DURATION = Histogram(
+    "auth_google_request_duration_seconds",
+    "Время запросов к Google OAuth",
+    ["operation", "outcome"],
+    buckets=REQUEST_BUCKETS,
+)
+
+DB_STATEMENT_DURATION = Histogram(
+    "auth_db_statement_duration_seconds",
+    "Время выполнения SQL-запроса",
+    ["operation"],
+    buckets=REQUEST_BUCKETS,
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "auth_db_queries_per_request",
+    "Число SQL-запросов на HTTP-запрос",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50),
+)
+
+DB_TIME_PER_REQUEST = Histogram(
+    "auth_db_time_per_request_seconds",
+    "Суммарное время SQL-запросов на HTTP-запрос",
+    ["route"],
+    buckets=REQUEST_BUCKETS,
+)
+
+USER_LOADER_BATCH_SIZE = Histogram(
+    "auth_user_loader_batch_size",
+    "Число id пользователей в одном запросе пачки",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+USER_LOADER_WAIT = Histogram(
+    "auth_user_loader_wait_seconds",
+    "Ожидание id в окне сбора пачки до отправки запроса",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025),
+)
+
+RATE_LIMIT_DECISIONS = Counter(
+    "auth_rate_limit_decisions_total",
+    "Решения ограничителя частоты запросов",
+    ["scope", "key_type", "decision"],
+)
+
+RATE_LIMIT_CHECK_DURATION = Histogram(
+    "auth_rate_limit_check_seconds",
+    "Время одной проверки лимита",
+    ["backend"],
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05),
+)
+
+ADMISSION_DECISIONS = Counter(
+    "auth_admission_decisions_total",
+    "Решения контроля допуска по приоритету маршрута",
+    ["priority", "decision"],
+)
+
+ADMISSION_QUEUE_WAIT = Histogram(
+    "auth_admission_queue_wait_seconds",
+    "Ожидание слота в очереди контроля допуска",
+    ["priority"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "auth_circuit_breaker_transitions_total",
+    "Переходы circuit breaker'ов между состояниями",
+    ["breaker", "from_state", "to_state"],
+)
+
+TRACES_FINISHED = Counter(
+    "auth_traces_finished_total",
+    "Завершенные трассы по решению tail-семплирования",
+    ["decision"],
+)
+
+TRACE_SPANS_DROPPED = Counter(
+    "auth_trace_spans_dropped_total",
+    "Спаны, не отправленные экспортеру",
+    ["reason"],
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "auth_event_loop_lag_seconds",
+    "Задержка пробуждения задачи в event loop (время блокировки цикла)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+EVENT_LOOP_BLOCKED = Counter(
+    "auth_event_loop_blocked_total",
+    "Блокировки event loop дольше LOOP_BLOCKED_THRESHOLD_MS",
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    "auth_log_records_dropped_total",
+    "Записи логов, отброшенные из-за переполнения очереди",
+)
+
+# Пул соединений БД: сумма по живым воркерам
+DB_POOL_SIZE = Gauge(
+    "auth_db_pool_size",
+    "Размер пула соединений БД",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "auth_db_pool_checked_out",
+    "Соединения БД, выданные из пула",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "auth_db_pool_overflow",
+    "Соединения БД сверх размера пула",
+    multiprocess_mode="livesum",
+)
+
+
+def outcome_of(exc: BaseException | None) -> str:
+    """Метка результата операции: success или имя класса исключения."""
+    return "success" if exc is None else type(exc).__name__
+
+
+@contextmanager
+def observe_oauth(operation: str) -> Iterator[None]:
+    """Измеряет длительность запроса к Google с меткой результата."""
+    start = time.perf_counter()
+    exc: BaseException | None = None
+    try:
+        yield
+    except BaseException as e:
+        exc = e
+        raise
+    finally:
+        OAUTH_REQUEST_DURATION.labels(operation, outcome_of(exc)).observe(
+            time.perf_counter() - start
+        )
+
+
+def token_operation(operation: str):
+    """Декоратор метода AuthService: считает результат операции с токенами."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                TOKEN_OPERATIONS.labels(operation, outcome_of(e)).inc()
+                raise
+            TOKEN_OPERATIONS.labels(operation, "success").inc()
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def update_db_pool_metrics(pool) -> None:
+    """Обновляет метрики пула соединений SQLAlchemy."""
+    DB_POOL_SIZE.set(pool.size())
+    DB_POOL_CHECKED_OUT.set(pool.checkedout())
+    DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+
+def mark_process_dead() -> None:
+    """Удаляет live-метрики остановленного воркера (multiprocess режим)."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Текущие метрики в формате экспозиции Prometheus."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,160 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import FrameType
+
+_CWD = os.getcwd() + os.sep
+
+
+def _frame_label(frame: FrameType) -> str:
+    filename = frame.f_code.co_filename
+    if filename.startswith(_CWD):
+        filename = filename[len(_CWD) :]
+    elif "site-packages" + os.sep in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    return f"{frame.f_code.co_name} ({filename})"
+
+
+def _collapse(frame: FrameType | None) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Профилирование уже запущено в этом воркере."""
+
+
+class SamplingProfiler:
+    """
+    Семплирующий CPU-профилировщик на отдельном потоке.
+
+    Раз в `interval` секунд снимает стек потока(ов) через sys._current_frames
+    и считает одинаковые стеки. Результат — collapsed stacks
+    ("f1;f2;f3 <count>"), вход для flamegraph.pl, speedscope и inferno.
+    Пока профилирование не запущено, накладных расходов нет: поток
+    существует только на время профиля.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def profile(
+        self,
+        duration: float,
+        interval: float = 0.005,
+        thread_id: int | None = None,
+    ) -> tuple[Counter, int]:
+        """
+        Снимает профиль (блокирует вызывающий поток на duration секунд).
+
+        Args:
+            duration: Длительность профиля, секунды
+            interval: Период семплирования, секунды
+            thread_id: Поток для профилирования; None — все потоки, кроме
+                потока профилировщика
+
+        Returns:
+            (счетчик collapsed-стеков, число снятых семплов)
+
+        Raises:
+            ProfilerBusyError: Если профиль уже снимается
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("CPU profile is already running")
+        try:
+            stacks: Counter = Counter()
+            samples = 0
+            own_id = threading.get_ident()
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                frames = sys._current_frames()
+                if thread_id is not None:
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        stacks[_collapse(frame)] += 1
+                else:
+                    for ident, frame in frames.items():
+                        if ident != own_id:
+                            stacks[_collapse(frame)] += 1
+                samples += 1
+                time.sleep(interval)
+            return stacks, samples
+        finally:
+            self._lock.release()
+
+
+def format_collapsed(stacks: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class MemoryProfiler:
+    """
+    Снимки tracemalloc и разница между ними.
+
+    tracemalloc включается только по запросу (start) и выключается stop:
+    в остальное время аллокации не отслеживаются.
+    """
+
+    def __init__(self):
+        self._baseline: tracemalloc.Snapshot | None = None
+
+    @property
+    def active(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._baseline = self._take()
+
+    def stop(self) -> None:
+        self._baseline = None
+        tracemalloc.stop()
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            )
+        )
+
+    def diff(self, limit: int = 25, group_by: str = "lineno") -> dict:
+        """
+        Разница текущего снимка с предыдущим (первый раз — со снимком
+        на момент start). Текущий снимок становится новой базой.
+        """
+        if not tracemalloc.is_tracing() or self._baseline is None:
+            raise RuntimeError("tracemalloc is not started")
+
+        snapshot = self._take()
+        stats = snapshot.compare_to(self._baseline, group_by)
+        self._baseline = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "top": [
+                {
+                    "location": str(stat.traceback),
+                    "size_diff_bytes": stat.size_diff,
+                    "size_bytes": stat.size,
+                    "count_diff": stat.count_diff,
+                    "count": stat.count,
+                }
+                for stat in stats[:limit]
+            ],
+        }
+
+
+cpu_profiler = SamplingProfiler()
+memory_profiler = MemoryProfiler()
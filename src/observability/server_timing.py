@@ -0,0 +1,166 @@
+import asyncio
+import functools
+import hmac
+import random
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.observability.sql_profiler import current_query_stats
+
+SERVER_TIMING_REQUEST_HEADER = b"x-server-timing"
+
+
+@dataclass(slots=True)
+class RequestTimings:
+    """Накопленное время фаз запроса (секунды)."""
+
+    phases: dict[str, float] = field(default_factory=dict)
+    endpoint_done_at: float | None = None
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "server_timings", default=None
+)
+
+_NOOP = nullcontext()
+
+
+class _PhaseTimer:
+    __slots__ = ("_timings", "_name", "_start")
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self._timings = timings
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        phases = self._timings.phases
+        phases[self._name] = (
+            phases.get(self._name, 0.0) + time.perf_counter() - self._start
+        )
+
+
+def timed(phase: str):
+    """
+    Контекстный менеджер, добавляющий время блока к фазе Server-Timing.
+
+    Если для запроса Server-Timing выключен, возвращает общий nullcontext:
+    стоимость — одно чтение contextvar.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        return _NOOP
+    return _PhaseTimer(timings, phase)
+
+
+def _wrap_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Отмечает момент возврата из эндпоинта (начало сериализации ответа)."""
+
+    def mark_done() -> None:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.endpoint_done_at = time.perf_counter()
+
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                mark_done()
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            mark_done()
+
+    return sync_wrapper
+
+
+class ServerTimingRoute(APIRoute):
+    """
+    APIRoute, измеряющий фазу serialize: от возврата из эндпоинта
+    до начала отправки ответа (валидация response_model и рендеринг JSON).
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        super().__init__(path, _wrap_endpoint(endpoint), **kwargs)
+
+
+class ServerTimingMiddleware:
+    """
+    Заголовок Server-Timing с разбивкой времени ответа по фазам:
+    db (SQL-запросы), jwt, oauth, serialize и total.
+
+    Включается для запроса заголовком X-Server-Timing со значением
+    SERVER_TIMING_TOKEN (доверенный вызов от gateway или разработчика)
+    либо для доли SERVER_TIMING_SAMPLE_RATE запросов. Для остальных
+    запросов таймеры не создаются.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._token = settings.SERVER_TIMING_TOKEN.encode()
+        self._sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+
+    def _enabled(self, scope: Scope) -> bool:
+        if self._token:
+            for name, value in scope["headers"]:
+                if name == SERVER_TIMING_REQUEST_HEADER:
+                    return hmac.compare_digest(value, self._token)
+        return self._sample_rate > 0 and random.random() < self._sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._enabled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        timings = RequestTimings()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", _render(timings, start_time)
+                )
+            await send(message)
+
+        token = _current_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_timings.reset(token)
+
+
+def _render(timings: RequestTimings, start_time: float) -> str:
+    now = time.perf_counter()
+    metrics = []
+
+    # Время БД берется из профилировщика SQL (RequestLoggingMiddleware)
+    query_stats = current_query_stats()
+    if query_stats is not None and query_stats.count:
+        metrics.append(
+            f'db;dur={query_stats.total_ms:.2f};desc="{query_stats.count} queries"'
+        )
+    for name, seconds in timings.phases.items():
+        metrics.append(f"{name};dur={seconds * 1000:.2f}")
+    if timings.endpoint_done_at is not None:
+        metrics.append(f"serialize;dur={(now - timings.endpoint_done_at) * 1000:.2f}")
+    metrics.append(f"total;dur={(now - start_time) * 1000:.2f}")
+    return ", ".join(metrics)
@@ -0,0 +1,169 @@
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import settings
+from src.logger import get_logger
+from src.observability.metrics import DB_STATEMENT_DURATION
+
+logger = get_logger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\$\d+|\?|%\(\w+\)s)(?:::\w+)?\s*,?)+\)")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """SQL без литералов и параметров: одинаков для запросов одной формы."""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _operation(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return verb if verb in ("SELECT", "INSERT", "UPDATE", "DELETE") else "OTHER"
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Счетчики SQL-запросов в рамках одного HTTP-запроса (или блока кода)."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.statements[normalize_sql(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Запросы одной формы, выполненные не менее threshold раз (N+1)."""
+        return [(sql, n) for sql, n in self.statements.items() if n >= threshold]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "sql_query_stats", default=None
+)
+
+# Наблюдатели завершенных запросов (assert_query_budget)
+_request_watchers: list[Callable[[str | None, QueryStats], None]] = []
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """Собирает статистику SQL-запросов, выполненных внутри блока."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def finish_request(route: str | None, stats: QueryStats) -> None:
+    """Проверяет запрос на N+1 и передает статистику наблюдателям."""
+    for sql, n in stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD):
+        logger.warning("sql_n_plus_one_suspected", route=route, statement=sql, count=n)
+    for watcher in _request_watchers:
+        watcher(route, stats)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    duration_ms = duration * 1000
+
+    DB_STATEMENT_DURATION.labels(_operation(statement)).observe(duration)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+    if duration_ms >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(
+            "sql_slow_query",
+            statement=normalize_sql(statement),
+            duration_ms=round(duration_ms, 2),
+        )
+
+
+def _handle_error(exception_context) -> None:
+    # Запрос завершился ошибкой: after_cursor_execute не будет вызван
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def install_sql_profiler(engine: Engine) -> None:
+    """Подключает хуки профилирования к (синхронному) engine SQLAlchemy."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, route: str | None = None) -> Iterator[None]:
+    """
+    Проверка в тестах: внутри блока ни один запрос не выполняет больше
+    max_queries SQL-запросов.
+
+    Учитываются как HTTP-запросы, обработанные приложением (в том числе
+    через TestClient в другом потоке), так и SQL, выполненный напрямую
+    в блоке (например, вызов метода сервиса).
+
+    Args:
+        max_queries: Допустимое число SQL-запросов
+        route: Шаблон маршрута; если задан, проверяются только его запросы
+
+    Raises:
+        QueryBudgetExceeded: Если бюджет превышен
+    """
+    violations: list[tuple[str | None, QueryStats]] = []
+
+    def watcher(request_route: str | None, stats: QueryStats) -> None:
+        if route is not None and request_route != route:
+            return
+        if stats.count > max_queries:
+            violations.append((request_route, stats))
+
+    _request_watchers.append(watcher)
+    try:
+        with collect_query_stats() as direct:
+            yield
+    finally:
+        _request_watchers.remove(watcher)
+
+    if route is None and direct.count > max_queries:
+        violations.append((None, direct))
+    if violations:
+        lines = [
+            f"{request_route or '<direct>'}: {stats.count} queries "
+            f"(budget {max_queries})"
+            + "".join(f"\n    {n}x {sql}" for sql, n in stats.statements.items())
+            for request_route, stats in violations
+        ]
+        raise QueryBudgetExceeded("Query budget exceeded:\n" + "\n".join(lines))
@@ -0,0 +1,523 @@
+import json
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+import urllib.request
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+from src.observability.log_sampling import route_template
+from src.observability.metrics import TRACE_SPANS_DROPPED, TRACES_FINISHED
+from src.observability.sql_profiler import normalize_sql
+from src.security.trusted_proxy import is_trusted_proxy
+
+SERVICE_NAME = "auth-service"
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+# Коды kind и status из OTLP
+_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+_STATUS_UNSET, _STATUS_ERROR = 0, 2
+
+
+@dataclass(slots=True)
+class Span:
+    trace: "Trace"
+    span_id: str
+    parent_id: str | None
+    name: str
+    kind: str = "internal"
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: str) -> None:
+        self.error = error
+        self.trace.has_error = True
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.trace.add(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1_000_000
+
+
+@dataclass(slots=True)
+class Trace:
+    """Завершенные спаны одного запроса до решения tail-семплирования."""
+
+    trace_id: str
+    upstream_sampled: bool = False
+    has_error: bool = False
+    spans: list[Span] = field(default_factory=list)
+    dropped_spans: int = 0
+
+    def add(self, span: Span) -> None:
+        if len(self.spans) < settings.TRACING_MAX_SPANS_PER_TRACE:
+            self.spans.append(span)
+        else:
+            self.dropped_spans += 1
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    """Разбирает W3C traceparent: (trace_id, parent_span_id, sampled)."""
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 0x01)
+
+
+def format_traceparent(span: Span) -> str:
+    return f"00-{span.trace_id}-{span.span_id}-01"
+
+
+def inject_traceparent(headers) -> None:
+    """Добавляет traceparent текущего спана в заголовки исходящего запроса."""
+    span = _current_span.get()
+    if span is not None:
+        headers["traceparent"] = format_traceparent(span)
+
+
+def start_child(name: str, kind: str = "internal", **attributes: Any) -> Span | None:
+    """
+    Создает дочерний спан текущего, не делая его текущим.
+
+    Для хуков, у которых начало и конец — разные вызовы (SQL-события).
+    Вне трассируемого запроса возвращает None.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return Span(
+        trace=parent.trace,
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id,
+        name=name,
+        kind=kind,
+        attributes=attributes,
+    )
+
+
+@contextmanager
+def _span_scope(span: Span) -> Iterator[Span]:
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(repr(e))
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+class _NoopContext:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NOOP = _NoopContext()
+
+
+def start_span(name: str, kind: str = "internal", **attributes: Any):
+    """
+    Контекстный менеджер дочернего спана, который становится текущим.
+
+    Вне трассируемого запроса (или при TRACING_ENABLED=false) возвращает
+    общий no-op объект: стоимость — одно чтение contextvar.
+    """
+    span = start_child(name, kind, **attributes)
+    if span is None:
+        return _NOOP
+    return _span_scope(span)
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: list[Span]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+def _attribute_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_json(spans: list[Span]) -> dict:
+    """Пачка спанов в формате OTLP/JSON (ExportTraceServiceRequest)."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                        {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "src.observability.tracing"},
+                        "spans": [
+                            {
+                                "traceId": span.trace_id,
+                                "spanId": span.span_id,
+                                "parentSpanId": span.parent_id or "",
+                                "name": span.name,
+                                "kind": _SPAN_KINDS.get(span.kind, 1),
+                                "startTimeUnixNano": str(span.start_ns),
+                                "endTimeUnixNano": str(span.end_ns),
+                                "attributes": [
+                                    {"key": k, "value": _attribute_value(v)}
+                                    for k, v in span.attributes.items()
+                                ],
+                                "status": (
+                                    {"code": _STATUS_ERROR, "message": span.error}
+                                    if span.error
+                                    else {"code": _STATUS_UNSET}
+                                ),
+                            }
+                            for span in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class FileSpanExporter:
+    """
+    Пишет пачки спанов строками OTLP/JSON — в формате file exporter
+    OpenTelemetry Collector, поэтому файл можно загрузить в collector
+    (receiver otlpjsonfile) или просмотреть локально.
+    """
+
+    def __init__(self, path: str):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self._path.open("a", encoding="utf-8")
+
+    def export(self, spans: list[Span]) -> None:
+        self._file.write(json.dumps(to_otlp_json(spans), separators=(",", ":")))
+        self._file.write("\n")
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+class OTLPHTTPSpanExporter:
+    """Отправляет пачки спанов в OTLP/HTTP (JSON) endpoint коллектора."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        self._endpoint = endpoint
+        self._timeout = timeout
+
+    def export(self, spans: list[Span]) -> None:
+        body = json.dumps(to_otlp_json(spans), separators=(",", ":")).encode()
+        request = urllib.request.Request(
+            self._endpoint,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self._timeout) as response:
+            response.read()
+
+    def shutdown(self) -> None:
+        pass
+
+
+class BatchSpanProcessor:
+    """
+    Очередь завершенных трасс и фоновый поток, отправляющий спаны пачками.
+
+    Экспорт (файл, сеть) не выполняется в потоке событий. При заполненной
+    очереди спаны отбрасываются и учитываются в метрике.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue: int = settings.TRACING_MAX_QUEUE,
+        batch_size: int = settings.TRACING_BATCH_SIZE,
+        interval: float = settings.TRACING_EXPORT_INTERVAL_SECONDS,
+    ):
+        self._exporter = exporter
+        self._queue: queue.Queue[Span | None] = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._interval = interval
+        self._thread = threading.Thread(
+            target=self._run, name="span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, spans: list[Span]) -> None:
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                TRACE_SPANS_DROPPED.labels("queue_full").inc()
+
+    def _run(self) -> None:
+        logger = structlog.get_logger(__name__)
+        stop = False
+        while not stop:
+            batch: list[Span] = []
+            deadline = time.monotonic() + self._interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    span = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if span is None:
+                    stop = True
+                    break
+                batch.append(span)
+            if batch:
+                try:
+                    self._exporter.export(batch)
+                except Exception as e:
+                    TRACE_SPANS_DROPPED.labels("export_error").inc(len(batch))
+                    logger.warning("trace_export_failed", error=repr(e))
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._exporter.shutdown()
+
+
+class TailSampler:
+    """
+    Решение о сохранении трассы после ее завершения.
+
+    Сохраняются всегда: трассы с ошибкой (исключение или 5xx), медленные
+    (корневой спан дольше TRACING_SLOW_TRACE_MS) и выбранные вызывающей
+    стороной (флаг sampled в traceparent от доверенного прокси). Остальные — с вероятностью
+    TRACING_SAMPLE_RATE.
+    """
+
+    def __init__(
+        self,
+        slow_trace_ms: float = settings.TRACING_SLOW_TRACE_MS,
+        sample_rate: float = settings.TRACING_SAMPLE_RATE,
+    ):
+        self.slow_trace_ms = slow_trace_ms
+        self.sample_rate = sample_rate
+
+    def decide(self, trace: Trace, root: Span) -> str | None:
+        """Причина сохранения трассы или None, если трасса отбрасывается."""
+        if trace.has_error:
+            return "error"
+        if root.duration_ms >= self.slow_trace_ms:
+            return "slow"
+        if trace.upstream_sampled:
+            return "upstream"
+        if random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+
+class Tracer:
+    def __init__(self, processor: BatchSpanProcessor, sampler: TailSampler):
+        self.processor = processor
+        self.sampler = sampler
+
+    def finish(self, trace: Trace, root: Span) -> None:
+        reason = self.sampler.decide(trace, root)
+        TRACES_FINISHED.labels(reason or "dropped").inc()
+        if reason is None:
+            return
+        root.set_attribute("sampling.reason", reason)
+        if trace.dropped_spans:
+            root.set_attribute("trace.dropped_spans", trace.dropped_spans)
+        self.processor.submit(trace.spans)
+
+    def shutdown(self) -> None:
+        self.processor.shutdown()
+
+
+_tracer: Tracer | None = None
+
+
+def _create_exporter() -> SpanExporter:
+    if settings.TRACING_EXPORTER == "otlp":
+        return OTLPHTTPSpanExporter(settings.TRACING_OTLP_ENDPOINT)
+    return FileSpanExporter(settings.TRACING_FILE_PATH)
+
+
+def get_tracer() -> Tracer | None:
+    """Трассировщик воркера (None, если TRACING_ENABLED=false)."""
+    global _tracer
+    if _tracer is None and settings.TRACING_ENABLED:
+        _tracer = Tracer(BatchSpanProcessor(_create_exporter()), TailSampler())
+    return _tracer
+
+
+def shutdown_tracing() -> None:
+    """Отправляет накопленные спаны и останавливает поток экспорта."""
+    global _tracer
+    if _tracer is not None:
+        _tracer.shutdown()
+        _tracer = None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = start_child(
+        "db.query",
+        "client",
+        **{"db.system": "postgresql", "db.statement": normalize_sql(statement)},
+    )
+    conn.info.setdefault("trace_spans", []).append(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = conn.info["trace_spans"].pop()
+    if span is not None:
+        span.end()
+
+
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is None or not conn.info.get("trace_spans"):
+        return
+    span = conn.info["trace_spans"].pop()
+    if span is not None:
+        span.record_error(repr(exception_context.original_exception))
+        span.end()
+
+
+def install_sql_tracing(engine: Engine) -> None:
+    """Спан на каждый SQL-запрос (дочерний к текущему спану запроса)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class TracingMiddleware:
+    """
+    Корневой спан HTTP-запроса.
+
+    Продолжает трассу из заголовка traceparent (от gateway) или начинает
+    новую; trace_id и span_id попадают в контекст structlog. Дочерние спаны
+    создаются через start_span/start_child: SQL-запросы, JWT, запросы к Google.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tracer = get_tracer()
+        if scope["type"] != "http" or tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        upstream = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                upstream = parse_traceparent(value.decode("latin-1"))
+                break
+
+        if upstream is not None:
+            trace_id, parent_id, sampled = upstream
+            # Флаг sampled может выставить сам клиент и заставить сохранять
+            # каждую трассу: учитывается только от доверенного прокси
+            client = scope.get("client")
+            sampled = sampled and is_trusted_proxy(client[0] if client else None)
+        else:
+            trace_id, parent_id, sampled = secrets.token_hex(16), None, False
+
+        trace = Trace(trace_id=trace_id, upstream_sampled=sampled)
+        root = Span(
+            trace=trace,
+            span_id=secrets.token_hex(8),
+            parent_id=parent_id,
+            name=f"{scope['method']} {scope['path']}",
+            kind="server",
+            attributes={
+                "http.request.method": scope["method"],
+                "url.path": scope["path"],
+            },
+        )
+        structlog.contextvars.bind_contextvars(trace_id=trace_id, span_id=root.span_id)
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = _current_span.set(root)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            root.record_error(repr(e))
+            raise
+        finally:
+            _current_span.reset(token)
+            route = route_template(scope)
+            if route is not None:
+                root.name = f"{scope['method']} {route}"
+                root.set_attribute("http.route", route)
+            root.set_attribute("http.response.status_code", status_code)
+            if status_code >= 500 and root.error is None:
+                root.record_error(f"HTTP {status_code}")
+            root.end()
+            tracer.finish(trace, root)
@@ -0,0 +1,74 @@
+from sqlalchemy import ColumnElement, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models import RateLimitBucketModel
+
+_bucket = RateLimitBucketModel.__table__
+
+
+def _now_plus(seconds) -> ColumnElement:
+    # make_interval(years, months, weeks, days, hours, mins, secs)
+    return func.now() + func.make_interval(0, 0, 0, 0, 0, 0, seconds)
+
+
+class RateLimitRepository:
+    """
+    Token bucket в таблице rate_limit_buckets.
+
+    Пополнение и списание токена выполняются одним INSERT ... ON CONFLICT
+    DO UPDATE по часам БД, поэтому реплики с расходящимися часами видят
+    одно и то же состояние.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def consume(self, key: str, rate: float, burst: int) -> float | None:
+        """
+        Списывает токен из бакета `key`.
+
+        Args:
+            rate: Пополнение, токенов в секунду
+            burst: Емкость бакета
+
+        Returns:
+            None, если токен списан; иначе секунды до появления токена
+        """
+        refilled = func.least(
+            burst,
+            _bucket.c.tokens
+            + func.extract("epoch", func.now() - _bucket.c.updated_at) * rate,
+        )
+        stmt = (
+            insert(_bucket)
+            .values(
+                key=key,
+                tokens=burst - 1,
+                updated_at=func.now(),
+                full_at=_now_plus(1 / rate),
+            )
+            .on_conflict_do_update(
+                index_elements=[_bucket.c.key],
+                set_={
+                    "tokens": refilled - 1,
+                    "updated_at": func.now(),
+                    "full_at": _now_plus((burst - refilled + 1) / rate),
+                },
+                # Без токена строка не меняется и RETURNING пуст
+                where=refilled >= 1,
+            )
+            .returning(_bucket.c.tokens)
+        )
+        if (await self.session.execute(stmt)).first() is not None:
+            return None
+
+        tokens = await self.session.scalar(select(refilled).where(_bucket.c.key == key))
+        return max((1 - (tokens or 0)) / rate, 0.0)
+
+    async def purge_full(self) -> int:
+        """Удаляет полные бакеты: отсутствие строки означает то же самое."""
+        result = await self.session.execute(
+            delete(_bucket).where(_bucket.c.full_at < func.now())
+        )
+        return result.rowcount
@@ -1,9 +1,19 @@
 import uuid
-from sqlalchemy import select, update
+from collections.abc import Sequence
+
+from sqlalchemy import RowMapping, any_, bindparam, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.models import UserModel
-from src.schemas.user import UserCreateSchema, UserUpdateSchema
+from src.schemas.user import UserCreateSchema, UserResponseSchema, UserUpdateSchema
+
+# Колонки профиля: поля UserResponseSchema и updated_at (версия для ETag;
+# model_construct лишние ключи игнорирует)
+PROFILE_COLUMNS = (
+    *(UserModel.__table__.c[name] for name in UserResponseSchema.model_fields),
+    UserModel.__table__.c.updated_at,
+)
 
 
 class UserRepository:
@@ -20,6 +30,52 @@ class UserRepository:
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_profile_by_id(self, user_id: uuid.UUID) -> RowMapping | None:
+        """Колонки профиля без загрузки ORM-объекта (только чтение).
+
+        Args:
+            user_id: UUID пользователя
+
+        Returns:
+            Строка с ключами полей UserResponseSchema или None
+        """
+        query = select(*PROFILE_COLUMNS).where(UserModel.id == user_id)
+        result = await self.session.execute(query)
+        return result.mappings().one_or_none()
+
+    async def get_profile_by_email(self, email: str) -> RowMapping | None:
+        """Колонки профиля по email без загрузки ORM-объекта.
+
+        Args:
+            email: Email пользователя
+
+        Returns:
+            Строка с ключами полей UserResponseSchema или None
+        """
+        query = select(*PROFILE_COLUMNS).where(UserModel.email == email)
+        result = await self.session.execute(query)
+        return result.mappings().one_or_none()
+
+    async def get_profiles_by_ids(
+        self, user_ids: Sequence[uuid.UUID]
+    ) -> Sequence[RowMapping]:
+        """Колонки профилей нескольких пользователей одним запросом.
+
+        id передаются одним параметром-массивом (`id = ANY($1)`), поэтому
+        текст запроса не зависит от размера пачки и prepared statement
+        переиспользуется.
+
+        Args:
+            user_ids: UUID пользователей
+
+        Returns:
+            Строки найденных пользователей (в произвольном порядке)
+        """
+        ids = bindparam("ids", list(user_ids), type_=ARRAY(UUID(as_uuid=True)))
+        query = select(*PROFILE_COLUMNS).where(UserModel.id == any_(ids))
+        result = await self.session.execute(query)
+        return result.mappings().all()
+
     async def get_by_google_id(self, google_id: str) -> UserModel | None:
         query = select(UserModel).where(UserModel.google_id == google_id)
         result = await self.session.execute(query)
@@ -0,0 +1,36 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+
+class LogControlSchema(BaseModel):
+    level: LogLevel = Field(..., description="Текущий уровень логирования")
+    sample_rate: float = Field(
+        ..., description="Доля сохраняемых записей успешных быстрых запросов"
+    )
+    route_sample_rates: dict[str, float] = Field(
+        ..., description="Доли по шаблону маршрута"
+    )
+    slow_request_ms: float = Field(
+        ..., description="Порог медленного запроса (записи сохраняются всегда)"
+    )
+    sampled_events: list[str] = Field(
+        ..., description="События, к которым применяется семплирование"
+    )
+
+
+class LogControlUpdateSchema(BaseModel):
+    level: LogLevel | None = Field(None, description="Новый уровень логирования")
+    sample_rate: float | None = Field(
+        None, ge=0.0, le=1.0, description="Доля по умолчанию (0..1)"
+    )
+    route_sample_rates: dict[str, float] | None = Field(
+        None,
+        description="Доли по шаблону маршрута; полностью заменяют текущие",
+        examples=[{"/internal/users/{user_id}/exists": 0.01}],
+    )
+    slow_request_ms: float | None = Field(
+        None, gt=0, description="Порог медленного запроса, мс"
+    )
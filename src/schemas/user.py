@@ -41,6 +41,22 @@ class UserResponseSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserBatchRequestSchema(BaseModel):
+    ids: list[uuid.UUID] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Идентификаторы пользователей (не более 500)",
+    )
+
+
+class UserBatchResponseSchema(BaseModel):
+    users: list[UserResponseSchema] = Field(
+        ..., description="Найденные пользователи в порядке запроса"
+    )
+    missing: list[uuid.UUID] = Field(..., description="Ненайденные идентификаторы")
+
+
 class UserUpdateSchema(BaseModel):
     name: Optional[str] = Field(
         None,
@@ -55,13 +71,3 @@ class UserUpdateSchema(BaseModel):
     )
 
     model_config = ConfigDict(from_attributes=True, extra="forbid")
-
-
-class CurrentUserSchema(BaseModel):
-    """Схема текущего пользователя (используется в зависимостях)."""
-
-    id: uuid.UUID = Field(..., description="Уникальный идентификатор пользователя")
-    email: EmailStr = Field(..., description="Адрес электронной почты пользователя")
-    role: str = Field(..., description="Роль пользователя (user, admin)")
-
-    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,185 @@
+import asyncio
+import math
+import time
+from collections import Counter, deque
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, nullcontext
+from enum import Enum
+
+from src.config import settings
+from src.exceptions import ServerOverloadedException
+from src.logger import get_logger
+from src.observability.metrics import ADMISSION_DECISIONS, ADMISSION_QUEUE_WAIT
+
+logger = get_logger(__name__)
+
+
+class Priority(str, Enum):
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
+# Порядок выдачи освободившихся слотов
+_PRIORITY_ORDER = (Priority.HIGH, Priority.NORMAL, Priority.LOW)
+
+
+class AdmissionController:
+    """
+    Контроль допуска запросов, работающих с БД, в воркере.
+
+    Одновременно выполняется не больше `capacity` запросов (по умолчанию —
+    размер пула соединений с overflow), запросы LOW занимают не больше доли
+    `low_share` слотов. Остальные ждут в очереди своего приоритета;
+    освободившийся слот передается первому ожидающему с наивысшим приоритетом.
+
+    Запрос отклоняется сразу (ServerOverloadedException, 503), если очередь
+    приоритета заполнена или оценка ожидания — очередь впереди, умноженная на
+    среднее время удержания слота, — больше `max_wait` приоритета. Так клиент
+    получает Retry-After сразу, а не ждет соединения из пула до DB_POOL_TIMEOUT.
+    """
+
+    def __init__(
+        self,
+        capacity: int = settings.ADMISSION_MAX_CONCURRENCY
+        or settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+        max_queue: int = settings.ADMISSION_MAX_QUEUE,
+        max_wait: dict[str, float] | None = None,
+        low_share: float = settings.ADMISSION_LOW_PRIORITY_SHARE,
+        hold_time_alpha: float = 0.1,
+    ):
+        max_wait_ms = max_wait or settings.ADMISSION_MAX_WAIT_MS
+        self._capacity = capacity
+        self._max_queue = max_queue
+        self._max_wait = {p: max_wait_ms[p.value] / 1000 for p in Priority}
+        self._limits = {p: capacity for p in Priority}
+        self._limits[Priority.LOW] = max(int(capacity * low_share), 1)
+        self._alpha = hold_time_alpha
+
+        self._in_use = 0
+        self._in_use_by = dict.fromkeys(Priority, 0)
+        self._waiters: dict[Priority, deque[asyncio.Future]] = {
+            p: deque() for p in Priority
+        }
+        # Скользящее среднее времени удержания слота, секунд
+        self._hold_time = 0.0
+        self.rejected: Counter[str] = Counter()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        """
+        Слот на время обработки запроса.
+
+        Raises:
+            ServerOverloadedException: Если слот не получен за max_wait
+                приоритета (или по оценке не будет получен)
+        """
+        await self._acquire(priority)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            held = time.perf_counter() - start
+            self._hold_time += self._alpha * (held - self._hold_time)
+            self._release(priority)
+
+    def _can_admit(self, priority: Priority) -> bool:
+        return (
+            self._in_use < self._capacity
+            and self._in_use_by[priority] < self._limits[priority]
+        )
+
+    def _take(self, priority: Priority) -> None:
+        self._in_use += 1
+        self._in_use_by[priority] += 1
+
+    def _estimated_wait(self, priority: Priority) -> float:
+        ahead = 1
+        for p in _PRIORITY_ORDER:
+            ahead += len(self._waiters[p])
+            if p is priority:
+                break
+        return ahead * self._hold_time / self._limits[priority]
+
+    def _rejection(
+        self, priority: Priority, reason: str, retry_after: float
+    ) -> ServerOverloadedException:
+        self.rejected[f"{priority.value}:{reason}"] += 1
+        ADMISSION_DECISIONS.labels(priority.value, reason).inc()
+        logger.debug("request_shed", priority=priority.value, reason=reason)
+        return ServerOverloadedException(retry_after=max(math.ceil(retry_after), 1))
+
+    async def _acquire(self, priority: Priority) -> None:
+        if self._can_admit(priority):
+            self._take(priority)
+            ADMISSION_DECISIONS.labels(priority.value, "admitted").inc()
+            return
+
+        max_wait = self._max_wait[priority]
+        waiters = self._waiters[priority]
+        if len(waiters) >= self._max_queue:
+            raise self._rejection(
+                priority, "queue_full", self._estimated_wait(priority)
+            )
+        estimate = self._estimated_wait(priority)
+        if estimate > max_wait:
+            raise self._rejection(priority, "deadline", estimate)
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, max_wait)
+        except (TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Слот уже передан этому запросу: отдаем следующему
+                self._release(priority)
+            elif future in waiters:
+                # Отмененное ожидание могло быть уже снято _release
+                waiters.remove(future)
+            if isinstance(e, TimeoutError):
+                raise self._rejection(
+                    priority, "timeout", self._estimated_wait(priority)
+                ) from None
+            raise
+        ADMISSION_QUEUE_WAIT.labels(priority.value).observe(time.perf_counter() - start)
+        ADMISSION_DECISIONS.labels(priority.value, "queued").inc()
+
+    def _release(self, priority: Priority) -> None:
+        self._in_use -= 1
+        self._in_use_by[priority] -= 1
+        for p in _PRIORITY_ORDER:
+            waiters = self._waiters[p]
+            while waiters and self._can_admit(p):
+                future = waiters.popleft()
+                if future.done():
+                    continue
+                # Слот занимается при передаче: новые запросы не обгонят очередь
+                self._take(p)
+                future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self._capacity,
+            "in_use": self._in_use,
+            "in_use_by_priority": {p.value: n for p, n in self._in_use_by.items()},
+            "limits": {p.value: n for p, n in self._limits.items()},
+            "queued": {p.value: len(w) for p, w in self._waiters.items()},
+            "avg_hold_ms": round(self._hold_time * 1000, 3),
+            "rejected": dict(self.rejected),
+        }
+
+
+admission_controller = AdmissionController()
+
+
+def admitted(priority: Priority) -> AbstractAsyncContextManager:
+    """
+    Слот admission_controller или пустой контекст при ADMISSION_ENABLED=false.
+
+    Raises:
+        ServerOverloadedException: 503 Service Unavailable с Retry-After
+    """
+    if not settings.ADMISSION_ENABLED:
+        return nullcontext()
+    return admission_controller.slot(priority)
@@ -0,0 +1,107 @@
+from typing import TYPE_CHECKING
+
+from src.config import settings
+from src.logger import get_logger
+from src.observability.tracing import inject_traceparent
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+# Один клиент на воркер: keep-alive соединения к Google переиспользуются
+# между запросами, вместо TLS-рукопожатия на каждый callback
+_client: "httpx.AsyncClient | None" = None
+
+
+def get_timeout() -> "httpx.Timeout":
+    import httpx
+
+    return httpx.Timeout(
+        connect=settings.OAUTH_HTTP_CONNECT_TIMEOUT,
+        read=settings.OAUTH_HTTP_READ_TIMEOUT,
+        write=settings.OAUTH_HTTP_READ_TIMEOUT,
+        pool=settings.OAUTH_HTTP_POOL_TIMEOUT,
+    )
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Возвращает общий httpx.AsyncClient воркера, создавая его при первом вызове."""
+    global _client
+    if _client is None or _client.is_closed:
+        import httpx
+
+        _client = httpx.AsyncClient(
+            http2=settings.OAUTH_HTTP2,
+            limits=httpx.Limits(
+                max_connections=settings.OAUTH_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OAUTH_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.OAUTH_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=get_timeout(),
+            event_hooks={"request": [_inject_trace_headers]},
+        )
+        logger.info("http_client_created", http2=settings.OAUTH_HTTP2)
+    return _client
+
+
+async def _inject_trace_headers(request: "httpx.Request") -> None:
+    inject_traceparent(request.headers)
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("http_client_closed")
+
+
+class SharedTransport:
+    """
+    Транспорт для клиентов authlib, использующий пул соединений общего клиента.
+
+    authlib создает новый AsyncOAuth2Client на каждый вызов и закрывает его
+    после запроса. Этот транспорт перенаправляет запросы в пул общего клиента
+    и игнорирует закрытие, поэтому соединения живут дольше одного запроса.
+    """
+
+    async def handle_async_request(self, request):
+        # Запросы authlib идут мимо event hooks общего клиента
+        inject_traceparent(request.headers)
+        return await get_http_client()._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+def pool_stats() -> dict:
+    """Статистика пула соединений общего клиента."""
+    if _client is None:
+        return {"initialized": False}
+
+    # Внутренние объекты httpx/httpcore: в другой версии их может не быть
+    try:
+        pool = _client._transport._pool
+        connections = list(pool.connections)
+        http2 = sum(1 for c in connections if "HTTP/2" in c.info())
+        idle = sum(1 for c in connections if c.is_idle())
+        queued = sum(1 for r in getattr(pool, "_requests", []) if r.is_queued())
+    except AttributeError:
+        return {"initialized": True}
+    return {
+        "initialized": True,
+        "http2_enabled": settings.OAUTH_HTTP2,
+        "connections": len(connections),
+        "http2_connections": http2,
+        "idle_connections": idle,
+        "active_connections": len(connections) - idle,
+        "queued_requests": queued,
+        "max_connections": settings.OAUTH_HTTP_MAX_CONNECTIONS,
+    }
@@ -7,6 +7,12 @@ from jwt.exceptions import DecodeError, ExpiredSignatureError, InvalidTokenError
 from src.config import settings
 from src.constants import ACCESS_TOKEN_TYPE, REFRESH_TOKEN_TYPE
 from src.exceptions import InvalidTokenException, ExpiredTokenException
+from src.observability.metrics import JWT_DURATION
+from src.observability.server_timing import timed
+from src.observability.tracing import start_span
+
+_JWT_SIGN_DURATION = JWT_DURATION.labels("sign")
+_JWT_VERIFY_DURATION = JWT_DURATION.labels("verify")
 
 
 class JWTService:
@@ -27,9 +33,10 @@ class JWTService:
             "exp": int(expires_at.timestamp()),
         }
 
-        return jwt.encode(
-            payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
-        )
+        with _JWT_SIGN_DURATION.time(), timed("jwt"), start_span("jwt.sign"):
+            return jwt.encode(
+                payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+            )
 
     def create_refresh_token(
         self, user_id: uuid.UUID | str, iat: datetime, expires_at: datetime
@@ -42,15 +49,39 @@ class JWTService:
             "exp": int(expires_at.timestamp()),
         }
 
-        return jwt.encode(
-            payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
-        )
+        with _JWT_SIGN_DURATION.time(), timed("jwt"), start_span("jwt.sign"):
+            return jwt.encode(
+                payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+            )
+
+    @staticmethod
+    def _decode(token: str) -> dict:
+        """
+        Проверка подписи и срока токена в спане jwt.verify.
+
+        Истекший или невалидный токен — обычный 401, а не сбой: ошибка PyJWT
+        записывается атрибутом спана, а не ошибкой, иначе tail sampling
+        сохранял бы трассу каждого такого запроса.
+        """
+        error = None
+        with (
+            _JWT_VERIFY_DURATION.time(),
+            timed("jwt"),
+            start_span("jwt.verify") as span,
+        ):
+            try:
+                return jwt.decode(
+                    token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+                )
+            except InvalidTokenError as e:
+                error = e
+                if span is not None:
+                    span.set_attribute("jwt.error", type(e).__name__)
+        raise error
 
     def verify_access_token(self, token: str) -> dict:
         try:
-            payload = jwt.decode(
-                token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = self._decode(token)
             if payload.get("type") != ACCESS_TOKEN_TYPE:
                 raise InvalidTokenException("Token is not an access token")
 
@@ -63,10 +94,7 @@ class JWTService:
 
     def verify_refresh_token(self, token: str) -> dict:
         try:
-            payload = jwt.decode(
-                token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-            )
-
+            payload = self._decode(token)
             if payload.get("type") != REFRESH_TOKEN_TYPE:
                 raise InvalidTokenException("Token is not a refresh token")
 
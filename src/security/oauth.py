@@ -1,5 +1,6 @@
-import httpx
-from authlib.integrations.starlette_client import OAuth, OAuthError
+from functools import cache
+from typing import TYPE_CHECKING
+
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
@@ -10,34 +11,87 @@ from src.exceptions import (
     OAuthProviderException,
 )
 from src.logger import get_logger
+from src.observability.metrics import observe_oauth
+from src.observability.server_timing import timed
+from src.observability.tracing import start_span
 from src.schemas.oauth import GoogleUserSchema
+from src.security.oidc_cache import oidc_cache
+from src.security.resilience import get_breaker, hedged
 import asyncio
+import time
+
+if TYPE_CHECKING:
+    from authlib.integrations.starlette_client import OAuth
 
 logger = get_logger(__name__)
 
 
-oauth = OAuth()
+@cache
+def get_oauth() -> "OAuth":
+    """
+    Регистрирует Google OAuth клиент при первом обращении.
 
-oauth.register(
-    name="google",
-    client_id=settings.GOOGLE_CLIENT_ID,
-    client_secret=settings.GOOGLE_CLIENT_SECRET,
-    server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-    client_kwargs={
-        "scope": "openid email profile",
-    },
-)
+    authlib и httpx тяжелые при импорте, а нужны только в OAuth-эндпоинтах,
+    поэтому они не загружаются при старте приложения.
+    """
+    from authlib.integrations.starlette_client import OAuth
+
+    from src.security.http_client import SharedTransport, get_timeout
+
+    oauth = OAuth()
+    oauth.register(
+        name="google",
+        client_id=settings.GOOGLE_CLIENT_ID,
+        client_secret=settings.GOOGLE_CLIENT_SECRET,
+        server_metadata_url=settings.GOOGLE_DISCOVERY_URL,
+        client_kwargs={
+            "scope": "openid email profile",
+            # Запросы идут через пул общего клиента (keep-alive, HTTP/2)
+            "transport": SharedTransport(),
+            "timeout": get_timeout(),
+        },
+    )
+    return oauth
 
 
 class GoogleOAuthClient:
     """
     Интерфейс для работы с Google OAuth 2.0.
 
-    Использует предварительно зарегистрированный oauth.
+    Использует лениво зарегистрированный oauth (см. get_oauth).
     """
 
     def __init__(self):
-        self._client = oauth.google
+        self._client = get_oauth().google
+
+    async def _sync_server_metadata(self) -> None:
+        """
+        Передает authlib discovery и JWKS из oidc_cache.
+
+        `_loaded_at` и `jwks` в server_metadata отключают собственные запросы
+        authlib за этими документами. При неизвестном `kid` authlib все равно
+        перезапросит JWKS (ротация ключей).
+        """
+        metadata, jwks = await oidc_cache.get()
+        server_metadata = self._client.server_metadata
+        if server_metadata.get("_cache_version") == oidc_cache.version:
+            return
+        server_metadata.update(metadata)
+        server_metadata["jwks"] = jwks
+        server_metadata["_loaded_at"] = time.time()
+        server_metadata["_cache_version"] = oidc_cache.version
+
+    @staticmethod
+    def _failure_exceptions() -> tuple[type[BaseException], ...]:
+        """Исключения, которые считаются сбоем Google для circuit breaker."""
+        import httpx
+
+        return (
+            httpx.TransportError,
+            httpx.HTTPStatusError,
+            TimeoutError,
+            OAuthAuthenticationException,
+        )
 
     async def get_authorization_url(self, request: Request) -> RedirectResponse:
         """
@@ -45,29 +99,83 @@ class GoogleOAuthClient:
 
         Raises:
             OAuthAuthenticationException: Если не удалось подключиться к серверу Google.
+            OAuthCircuitOpenException: Если Google недоступен и circuit breaker разомкнут.
         """
-        max_retries = 3
-        base_delay = 1.0
-
-        for attempt in range(max_retries):
-            try:
+        breaker = get_breaker("google_authorize_redirect")
+        try:
+            with timed("oauth"), breaker.protect(self._failure_exceptions()):
+                await self._sync_server_metadata()
                 return await self._client.authorize_redirect(
                     request, settings.GOOGLE_REDIRECT_URI
                 )
-            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
-                logger.warning(
-                    "google_oauth_connect_error",
-                    method="authorize_redirect",
-                    attempt=attempt + 1,
-                    max_retries=max_retries,
-                    error=str(e),
-                )
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(base_delay * (2**attempt))
-                else:
-                    raise OAuthAuthenticationException(
-                        detail="Failed to connect to Google OAuth server after multiple attempts. Please try again later."
-                    )
+        except OAuthAuthenticationException:
+            raise
+        except self._failure_exceptions() as e:
+            logger.warning(
+                "google_oauth_connect_error",
+                method="authorize_redirect",
+                breaker_state=breaker.state.value,
+                error=repr(e),
+            )
+            raise OAuthAuthenticationException(
+                detail="Failed to connect to Google OAuth server. Please try again later."
+            )
+
+    async def _exchange_code(self, request: Request) -> dict:
+        """Обмен code на токены с дедлайном на попытку (и hedging, если включен)."""
+        if not settings.OAUTH_HEDGE_ENABLED:
+            return await asyncio.wait_for(
+                self._client.authorize_access_token(request),
+                settings.OAUTH_TOKEN_ATTEMPT_TIMEOUT_SECONDS,
+            )
+
+        import httpx
+        from authlib.integrations.base_client import MismatchingStateError
+        from authlib.integrations.starlette_client import OAuthError
+
+        # Повтор authorize_access_token из authlib: state читается из сессии
+        # один раз, а дублируется только запрос к token endpoint. Используются
+        # только публичные методы authlib (framework.*_state_data,
+        # fetch_access_token, parse_id_token): путь проверяется
+        # python -m benchmarks.login_flow --check-hedge
+        client = self._client
+        error = request.query_params.get("error")
+        if error:
+            raise OAuthError(
+                error=error, description=request.query_params.get("error_description")
+            )
+        params = {
+            "code": request.query_params.get("code"),
+            "state": request.query_params.get("state"),
+        }
+        state_data = await client.framework.get_state_data(
+            request.session, params["state"]
+        )
+        await client.framework.clear_state_data(request.session, params["state"])
+        if state_data is None:
+            raise MismatchingStateError()
+        # redirect_uri и PKCE code_verifier сохранены authorize_redirect
+        for key in ("redirect_uri", "code_verifier"):
+            if state_data.get(key):
+                params[key] = state_data[key]
+
+        # code одноразовый: hedging повторно отправляет тот же code, а по
+        # RFC 6749 §4.1.2 провайдер вправе считать это повторным использованием
+        # (и отозвать уже выданные по нему токены). Если первая попытка дошла
+        # до Google, повторная получит invalid_grant; при ошибке всех попыток
+        # наружу идет ошибка первой (таймаут или сетевая), а не invalid_grant
+        token = await hedged(
+            lambda: client.fetch_access_token(**params),
+            hedge_delay=settings.OAUTH_HEDGE_DELAY_SECONDS,
+            attempt_timeout=settings.OAUTH_TOKEN_ATTEMPT_TIMEOUT_SECONDS,
+            max_attempts=settings.OAUTH_HEDGE_MAX_ATTEMPTS,
+            retry_on=(httpx.TransportError, TimeoutError),
+        )
+        if "id_token" in token and "nonce" in state_data:
+            token["userinfo"] = await client.parse_id_token(
+                token, nonce=state_data["nonce"]
+            )
+        return token
 
     async def authorize_access_token(self, request: Request) -> dict:
         """
@@ -91,34 +199,39 @@ class GoogleOAuthClient:
         Raises:
             OAuthAuthenticationException: Если возникла сетевая ошибка при подключении к Google.
             OAuthProviderException: Если Google вернул ошибку (например, неверный code).
+            OAuthCircuitOpenException: Если Google недоступен и circuit breaker разомкнут.
         """
-        max_retries = 3
-        base_delay = 1.0
-
-        for attempt in range(max_retries):
-            try:
-                token = await self._client.authorize_access_token(request)
-                if not token:
-                    raise OAuthAuthenticationException(
-                        detail="Failed to receive token from Google"
-                    )
-                return token
-            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
-                logger.warning(
-                    "google_oauth_connect_error",
-                    method="authorize_access_token",
-                    attempt=attempt + 1,
-                    max_retries=max_retries,
-                    error=str(e),
-                )
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(base_delay * (2**attempt))
-                else:
-                    raise OAuthAuthenticationException(
-                        detail="Failed to connect to Google OAuth server after multiple attempts. Please try again later."
-                    )
-            except OAuthError as e:
-                raise OAuthProviderException(detail=f"Google OAuth error: {e.error}")
+        from authlib.integrations.starlette_client import OAuthError
+
+        breaker = get_breaker("google_token_exchange")
+        try:
+            with timed("oauth"), breaker.protect(self._failure_exceptions()):
+                await self._sync_server_metadata()
+                with (
+                    observe_oauth("token_exchange"),
+                    start_span("google.token_exchange", "client"),
+                ):
+                    token = await self._exchange_code(request)
+        except OAuthAuthenticationException:
+            raise
+        except OAuthError as e:
+            raise OAuthProviderException(detail=f"Google OAuth error: {e.error}")
+        except self._failure_exceptions() as e:
+            logger.warning(
+                "google_oauth_connect_error",
+                method="authorize_access_token",
+                breaker_state=breaker.state.value,
+                error=repr(e),
+            )
+            raise OAuthAuthenticationException(
+                detail="Failed to connect to Google OAuth server. Please try again later."
+            )
+
+        if not token:
+            raise OAuthAuthenticationException(
+                detail="Failed to receive token from Google"
+            )
+        return token
 
     def get_user_info(self, token: dict) -> GoogleUserSchema:
         """
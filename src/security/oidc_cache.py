@@ -0,0 +1,236 @@
+import asyncio
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from src.config import settings
+from src.exceptions import OAuthAuthenticationException
+from src.logger import get_logger
+from src.observability.metrics import observe_oauth
+from src.observability.tracing import start_span
+
+logger = get_logger(__name__)
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def parse_cache_ttl(headers, default: float) -> float:
+    """
+    Вычисляет время жизни ответа по заголовкам Cache-Control и Age.
+
+    Args:
+        headers: Заголовки HTTP-ответа
+        default: TTL, если сервер не указал max-age
+
+    Returns:
+        TTL в секундах (0 для no-store/no-cache)
+    """
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0.0
+
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match:
+        return default
+
+    age = headers.get("age", "0")
+    try:
+        age_seconds = float(age)
+    except ValueError:
+        age_seconds = 0.0
+    return max(float(match.group(1)) - age_seconds, 0.0)
+
+
+class OIDCMetadataCache:
+    """
+    Кеш OpenID discovery-документа и JWKS провайдера.
+
+    - TTL берется из Cache-Control ответов (минимум из discovery и JWKS).
+    - Фоновая задача обновляет данные заранее, до истечения TTL.
+    - Последний удачный ответ сохраняется в файл, поэтому после рестарта
+      первый логин не ждет ответа Google.
+    - Если провайдер недоступен, продолжает отдавать устаревшие данные.
+    """
+
+    def __init__(
+        self,
+        discovery_url: str,
+        cache_path: str | None,
+        default_ttl: float = settings.OIDC_CACHE_DEFAULT_TTL_SECONDS,
+        min_ttl: float = settings.OIDC_CACHE_MIN_TTL_SECONDS,
+        refresh_ahead_ratio: float = settings.OIDC_CACHE_REFRESH_AHEAD_RATIO,
+        retry_interval: float = settings.OIDC_CACHE_RETRY_SECONDS,
+    ):
+        self.discovery_url = discovery_url
+        self._cache_path = Path(cache_path).expanduser() if cache_path else None
+        self._default_ttl = default_ttl
+        self._min_ttl = min_ttl
+        self._refresh_ahead_ratio = refresh_ahead_ratio
+        self._retry_interval = retry_interval
+
+        self._metadata: dict | None = None
+        self._jwks: dict | None = None
+        self._fetched_at = 0.0
+        self._ttl = 0.0
+        self._last_refresh_failed = False
+        # Увеличивается при каждом обновлении данных
+        self.version = 0
+
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() >= self._fetched_at + self._ttl
+
+    def load_from_file(self) -> bool:
+        """Загружает сохраненные данные (даже устаревшие). Возвращает успех."""
+        if self._cache_path is None or not self._cache_path.exists():
+            return False
+        try:
+            # token_endpoint из файла получает client_secret: чужой файл не читаем
+            stat = self._cache_path.stat()
+            if stat.st_uid != os.geteuid() or stat.st_mode & 0o022:
+                logger.warning(
+                    "oidc_cache_file_untrusted",
+                    path=str(self._cache_path),
+                    uid=stat.st_uid,
+                    mode=oct(stat.st_mode & 0o777),
+                )
+                return False
+            data = json.loads(self._cache_path.read_text())
+            if data.get("discovery_url") != self.discovery_url:
+                return False
+            self._store(data["metadata"], data["jwks"], data["fetched_at"], data["ttl"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("oidc_cache_file_invalid", error=repr(e))
+            return False
+
+        logger.info("oidc_cache_loaded_from_file", stale=self.is_stale)
+        return True
+
+    def _store(self, metadata: dict, jwks: dict, fetched_at: float, ttl: float):
+        self._metadata = metadata
+        self._jwks = jwks
+        self._fetched_at = fetched_at
+        self._ttl = ttl
+        self.version += 1
+
+    def _persist(self) -> None:
+        if self._cache_path is None:
+            return
+        payload = {
+            "discovery_url": self.discovery_url,
+            "metadata": self._metadata,
+            "jwks": self._jwks,
+            "fetched_at": self._fetched_at,
+            "ttl": self._ttl,
+        }
+        try:
+            self._cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # Атомарная запись: несколько воркеров могут писать одновременно
+            tmp_path = self._cache_path.with_suffix(f".{os.getpid()}.tmp")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(payload))
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            logger.warning("oidc_cache_persist_failed", error=repr(e))
+
+    async def _fetch(self) -> tuple[dict, dict, float]:
+        from src.security.http_client import get_http_client
+
+        client = get_http_client()
+        with observe_oauth("discovery"), start_span("google.discovery", "client"):
+            resp = await client.get(self.discovery_url)
+            resp.raise_for_status()
+        metadata = resp.json()
+        metadata_ttl = parse_cache_ttl(resp.headers, self._default_ttl)
+
+        with observe_oauth("jwks"), start_span("google.jwks", "client"):
+            resp = await client.get(metadata["jwks_uri"])
+            resp.raise_for_status()
+        jwks = resp.json()
+        jwks_ttl = parse_cache_ttl(resp.headers, self._default_ttl)
+
+        return metadata, jwks, max(min(metadata_ttl, jwks_ttl), self._min_ttl)
+
+    async def refresh(self) -> bool:
+        """
+        Загружает discovery и JWKS от провайдера.
+
+        Параллельные вызовы дожидаются одного запроса. При ошибке
+        сохраняются прежние данные.
+        """
+        version = self.version
+        async with self._lock:
+            if self.version != version and not self.is_stale:
+                # Обновление уже выполнено конкурентным вызовом
+                return True
+            try:
+                metadata, jwks, ttl = await self._fetch()
+            except Exception as e:
+                self._last_refresh_failed = True
+                logger.warning(
+                    "oidc_cache_refresh_failed",
+                    error=repr(e),
+                    has_stale_data=self._metadata is not None,
+                )
+                return False
+
+            self._store(metadata, jwks, time.time(), ttl)
+            self._last_refresh_failed = False
+            self._persist()
+            logger.info("oidc_cache_refreshed", ttl=ttl)
+            return True
+
+    async def get(self) -> tuple[dict, dict]:
+        """
+        Возвращает (metadata, jwks), при необходимости загружая их.
+
+        Raises:
+            OAuthAuthenticationException: Данных нет и провайдер недоступен.
+        """
+        if self._metadata is None:
+            await self.refresh()
+        if self._metadata is None or self._jwks is None:
+            raise OAuthAuthenticationException(
+                detail="OpenID configuration of the provider is unavailable"
+            )
+        return self._metadata, self._jwks
+
+    def _next_refresh_delay(self) -> float:
+        if self._metadata is None or self._last_refresh_failed:
+            return self._retry_interval
+        refresh_at = self._fetched_at + self._ttl * self._refresh_ahead_ratio
+        return max(refresh_at - time.time(), 0.0)
+
+    async def _run(self) -> None:
+        if self._metadata is None or self.is_stale:
+            await self.refresh()
+        while True:
+            await asyncio.sleep(self._next_refresh_delay())
+            await self.refresh()
+
+    async def start(self) -> None:
+        """Загружает данные из файла и запускает фоновое обновление."""
+        self.load_from_file()
+        self._task = asyncio.create_task(self._run(), name="oidc-cache-refresher")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+oidc_cache = OIDCMetadataCache(
+    discovery_url=settings.GOOGLE_DISCOVERY_URL,
+    cache_path=settings.OIDC_CACHE_PATH,
+)
@@ -0,0 +1,25 @@
+import uuid
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Аутентифицированный пользователь запроса.
+
+    Создается без валидации: данные берутся из access токена, подписанного
+    сервисом, или из заголовков gateway, который уже проверил токен.
+    Повторная проверка email (email-validator) на каждый запрос не нужна.
+    """
+
+    id: uuid.UUID
+    email: str
+    role: str
+
+    @classmethod
+    def from_token_payload(cls, payload: dict) -> "Principal":
+        return cls(
+            id=uuid.UUID(payload["sub"]),
+            email=payload["email"],
+            role=payload["role"],
+        )
@@ -0,0 +1,192 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cache
+
+from src.config import settings
+from src.db.database import get_rate_limit_session_maker
+from src.exceptions import RateLimitExceededException
+from src.logger import get_logger
+from src.observability.metrics import RATE_LIMIT_CHECK_DURATION, RATE_LIMIT_DECISIONS
+from src.repositories.rate_limit import RateLimitRepository
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """Параметры token bucket: пополнение `rate` токенов в секунду, емкость `burst`."""
+
+    rate: float
+    burst: int
+
+    @classmethod
+    def per_minute(cls, requests: float, burst: int) -> "RateLimit":
+        return cls(rate=requests / 60, burst=burst)
+
+
+class InMemoryRateLimiter:
+    """
+    Token bucket'ы в памяти воркера.
+
+    Ключи распределены по шардам по хешу. Каждый шард — LRU с пределом
+    max_keys / shards: поток уникальных ключей (например, IP ботнета)
+    вытесняет давно не использованные бакеты, а не растит память. Раз в
+    `sweep_every` проверок один шард по кругу очищается от бакетов, которые
+    уже полностью пополнились, — такая очистка не меняет решений и не
+    проходит всю таблицу за один вызов.
+
+    Проверка синхронна и выполняется в event loop, блокировки не нужны.
+    """
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        shards: int = settings.RATE_LIMIT_MEMORY_SHARDS,
+        max_keys: int = settings.RATE_LIMIT_MEMORY_MAX_KEYS,
+        sweep_every: int = 1024,
+    ):
+        # key -> (tokens, updated_at, full_at)
+        self._shards: list[OrderedDict[str, tuple[float, float, float]]] = [
+            OrderedDict() for _ in range(shards)
+        ]
+        self._max_keys_per_shard = max(max_keys // shards, 1)
+        self._sweep_every = sweep_every
+        self._checks = 0
+        self._next_sweep = 0
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    async def hit(self, key: str, limit: RateLimit) -> float | None:
+        """
+        Списывает токен из бакета `key`.
+
+        Returns:
+            None, если токен списан; иначе секунды до появления токена
+        """
+        now = time.monotonic()
+        shard = self._shards[hash(key) % len(self._shards)]
+
+        state = shard.get(key)
+        if state is None:
+            tokens = float(limit.burst)
+        else:
+            tokens = min(limit.burst, state[0] + (now - state[1]) * limit.rate)
+            shard.move_to_end(key)
+
+        if tokens < 1:
+            # Состояние не меняется: пополнение считается от прошлого списания
+            return (1 - tokens) / limit.rate
+
+        tokens -= 1
+        shard[key] = (tokens, now, now + (limit.burst - tokens) / limit.rate)
+        if len(shard) > self._max_keys_per_shard:
+            shard.popitem(last=False)
+
+        self._checks += 1
+        if self._checks % self._sweep_every == 0:
+            self._sweep(now)
+        return None
+
+    def _sweep(self, now: float) -> None:
+        shard = self._shards[self._next_sweep]
+        self._next_sweep = (self._next_sweep + 1) % len(self._shards)
+        for key in [key for key, state in shard.items() if state[2] <= now]:
+            del shard[key]
+
+
+class PostgresRateLimiter:
+    """
+    Token bucket'ы в таблице rate_limit_buckets, общие для всех реплик.
+
+    Каждая проверка — отдельная короткая транзакция в собственной сессии:
+    списание не должно откатываться вместе с транзакцией обработчика.
+    Сессии берутся из отдельного пула (get_rate_limit_engine), а не из пула
+    обработчиков: проверка идет до контроля допуска.
+    Полностью пополненные бакеты удаляются не чаще раза в `purge_interval`.
+    """
+
+    backend = "postgres"
+
+    def __init__(self, purge_interval: float = 60.0):
+        self._purge_interval = purge_interval
+        self._last_purge = time.monotonic()
+
+    async def hit(self, key: str, limit: RateLimit) -> float | None:
+        """
+        Списывает токен из бакета `key`.
+
+        Returns:
+            None, если токен списан; иначе секунды до появления токена
+        """
+        async with get_rate_limit_session_maker()() as session:
+            repo = RateLimitRepository(session)
+            retry_after = await repo.consume(key, limit.rate, limit.burst)
+            now = time.monotonic()
+            if now - self._last_purge >= self._purge_interval:
+                self._last_purge = now
+                await repo.purge_full()
+            await session.commit()
+        return retry_after
+
+
+@cache
+def get_rate_limiter() -> InMemoryRateLimiter | PostgresRateLimiter:
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        return PostgresRateLimiter()
+    return InMemoryRateLimiter()
+
+
+IP_LIMIT = RateLimit.per_minute(
+    settings.RATE_LIMIT_IP_PER_MINUTE, settings.RATE_LIMIT_IP_BURST
+)
+USER_LIMIT = RateLimit.per_minute(
+    settings.RATE_LIMIT_USER_PER_MINUTE, settings.RATE_LIMIT_USER_BURST
+)
+
+
+async def enforce_rate_limit(
+    scope: str, ip_address: str | None, user_id: str | None = None
+) -> None:
+    """
+    Проверяет лимиты `scope` по IP и по пользователю.
+
+    Бакеты разных scope независимы. Сбой хранилища лимитов (БД в режиме
+    postgres) запрос не отклоняет: ограничитель не должен сам делать сервис
+    недоступным.
+
+    Raises:
+        RateLimitExceededException: Если токена нет хотя бы в одном бакете
+    """
+    limiter = get_rate_limiter()
+    checks = (("ip", ip_address, IP_LIMIT), ("user", user_id, USER_LIMIT))
+    for key_type, value, limit in checks:
+        if not value:
+            continue
+        start = time.perf_counter()
+        try:
+            retry_after = await limiter.hit(f"{scope}:{key_type}:{value}", limit)
+        except Exception as e:
+            logger.warning(
+                "rate_limit_check_failed",
+                scope=scope,
+                key_type=key_type,
+                error=repr(e),
+            )
+            RATE_LIMIT_DECISIONS.labels(scope, key_type, "error").inc()
+            continue
+        finally:
+            RATE_LIMIT_CHECK_DURATION.labels(limiter.backend).observe(
+                time.perf_counter() - start
+            )
+
+        if retry_after is None:
+            RATE_LIMIT_DECISIONS.labels(scope, key_type, "allowed").inc()
+            continue
+
+        RATE_LIMIT_DECISIONS.labels(scope, key_type, "rejected").inc()
+        logger.debug("rate_limited", scope=scope, key_type=key_type)
+        raise RateLimitExceededException(retry_after=max(math.ceil(retry_after), 1))
@@ -0,0 +1,226 @@
+import asyncio
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextlib import contextmanager
+from enum import Enum
+from typing import TypeVar
+
+from src.config import settings
+from src.exceptions import OAuthCircuitOpenException
+from src.logger import get_logger
+from src.observability.metrics import CIRCUIT_BREAKER_TRANSITIONS
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker для вызовов внешнего сервиса.
+
+    - CLOSED: вызовы проходят, подряд идущие сбои считаются.
+    - OPEN: после failure_threshold сбоев вызовы сразу отклоняются
+      (OAuthCircuitOpenException) в течение recovery_timeout.
+    - HALF_OPEN: пропускается half_open_max_calls пробных вызовов;
+      успех замыкает цепь, сбой снова размыкает.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = settings.OAUTH_BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout: float = settings.OAUTH_BREAKER_RECOVERY_SECONDS,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+
+        # Метрики: переходы вида "closed->open" и отклоненные вызовы
+        self.transitions: Counter[str] = Counter()
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._recovery_timeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def _transition(self, new_state: CircuitState) -> None:
+        old_state = self._state
+        if old_state is new_state:
+            return
+        self._state = new_state
+        if new_state is CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        if new_state is CircuitState.HALF_OPEN:
+            self._half_open_in_flight = 0
+        if new_state is CircuitState.CLOSED:
+            self._failures = 0
+        self.transitions[f"{old_state.value}->{new_state.value}"] += 1
+        CIRCUIT_BREAKER_TRANSITIONS.labels(
+            self.name, old_state.value, new_state.value
+        ).inc()
+        logger.warning(
+            "circuit_breaker_state_changed",
+            breaker=self.name,
+            from_state=old_state.value,
+            to_state=new_state.value,
+        )
+
+    def retry_after(self) -> int:
+        remaining = self._recovery_timeout - (time.monotonic() - self._opened_at)
+        return max(int(remaining + 0.999), 1)
+
+    def before_call(self) -> None:
+        """
+        Raises:
+            OAuthCircuitOpenException: Цепь разомкнута или лимит пробных вызовов исчерпан.
+        """
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        if (
+            state is CircuitState.HALF_OPEN
+            and self._half_open_in_flight < self._half_open_max_calls
+        ):
+            self._half_open_in_flight += 1
+            return
+        self.rejected += 1
+        raise OAuthCircuitOpenException(retry_after=self.retry_after())
+
+    def record_success(self) -> None:
+        if self._state is CircuitState.HALF_OPEN:
+            self._transition(CircuitState.CLOSED)
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        if self._state is CircuitState.HALF_OPEN:
+            self._transition(CircuitState.OPEN)
+            return
+        self._failures += 1
+        if self._failures >= self._failure_threshold:
+            self._transition(CircuitState.OPEN)
+
+    def _release(self) -> None:
+        if self._state is CircuitState.HALF_OPEN and self._half_open_in_flight:
+            self._half_open_in_flight -= 1
+
+    @contextmanager
+    def protect(self, failure_exceptions: tuple[type[BaseException], ...]):
+        """
+        Оборачивает вызов внешнего сервиса.
+
+        Исключения из failure_exceptions считаются сбоем. Прочие исключения
+        (например, ошибка, которую вернул сам провайдер) не влияют на состояние.
+        """
+        self.before_call()
+        try:
+            yield
+        except failure_exceptions:
+            self.record_failure()
+            raise
+        except BaseException:
+            self._release()
+            raise
+        self.record_success()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "rejected": self.rejected,
+            "transitions": dict(self.transitions),
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Возвращает circuit breaker эндпоинта (один на воркер)."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name)
+    return breaker
+
+
+def breakers_stats() -> dict[str, dict]:
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
+
+
+async def hedged(
+    factory: Callable[[], Awaitable[T]],
+    *,
+    hedge_delay: float,
+    attempt_timeout: float,
+    max_attempts: int = 2,
+    retry_on: tuple[type[BaseException], ...] = (),
+) -> T:
+    """
+    Hedged request: если попытка не завершилась за hedge_delay, параллельно
+    запускается следующая. Возвращается первый успешный результат, остальные
+    попытки отменяются.
+
+    Каждая попытка ограничена attempt_timeout. Сбой из retry_on запускает
+    следующую попытку сразу, не дожидаясь hedge_delay.
+
+    Raises:
+        Исключение самой ранней по порядку запуска попытки, если все попытки
+        завершились ошибкой (не первой завершившейся).
+    """
+
+    async def attempt() -> T:
+        return await asyncio.wait_for(factory(), attempt_timeout)
+
+    # Номер попытки по задаче: ошибки хранятся в порядке запуска
+    attempts: dict[asyncio.Task, int] = {asyncio.create_task(attempt()): 0}
+    pending: set[asyncio.Task] = set(attempts)
+    launched = 1
+    errors: dict[int, BaseException] = {}
+    try:
+        while pending:
+            can_hedge = launched < max_attempts
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=hedge_delay if can_hedge else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            retry_now = False
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    return task.result()
+                errors[attempts[task]] = error
+                retry_now = retry_now or isinstance(error, retry_on)
+
+            if can_hedge and (not done or (retry_now and not pending)):
+                if done:
+                    logger.info("hedged_request_retry", attempt=launched + 1)
+                else:
+                    logger.info("hedged_request_launched", attempt=launched + 1)
+                task = asyncio.create_task(attempt())
+                attempts[task] = launched
+                pending.add(task)
+                launched += 1
+        raise errors[min(errors)]
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,27 @@
+from functools import cache
+from ipaddress import IPv4Network, IPv6Network, ip_address, ip_network
+
+from src.config import settings
+
+
+@cache
+def _trusted_proxy_networks() -> tuple[IPv4Network | IPv6Network, ...]:
+    return tuple(
+        ip_network(network, strict=False) for network in settings.TRUSTED_PROXY_NETWORKS
+    )
+
+
+def is_trusted_proxy(host: str | None) -> bool:
+    """
+    Пришло ли соединение от доверенного прокси (TRUSTED_PROXY_NETWORKS).
+
+    Только таким соединениям доверяются заголовки, которые может подставить
+    клиент: X-Forwarded-For, X-Real-IP, флаг sampled в traceparent.
+    """
+    if host is None:
+        return False
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in _trusted_proxy_networks())
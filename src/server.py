@@ -0,0 +1,151 @@
+import math
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from src.config import settings
+from src.logger import get_logger, setup_logging, shutdown_logging
+
+logger = get_logger(__name__)
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def cpu_quota(cgroup_root: Path = CGROUP_ROOT) -> float | None:
+    """
+    Лимит CPU контейнера в ядрах (docker --cpus, limits.cpu в Kubernetes).
+
+    Returns:
+        Квота из cgroup v2 (cpu.max) или v1 (cpu.cfs_quota_us); None, если
+        лимит не задан или cgroup недоступна
+    """
+    try:
+        quota, period = (cgroup_root / "cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    for controller in ("cpu", "cpu,cpuacct"):
+        try:
+            quota = int((cgroup_root / controller / "cpu.cfs_quota_us").read_text())
+            period = int((cgroup_root / controller / "cpu.cfs_period_us").read_text())
+        except (OSError, ValueError):
+            continue
+        return quota / period if quota > 0 else None
+    return None
+
+
+def available_cpus() -> int:
+    """Ядра, на которых процессу разрешено выполняться (affinity, cpuset)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    """SERVER_WORKERS или число ядер с учетом квоты CPU контейнера."""
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    workers = available_cpus()
+    quota = cpu_quota()
+    if quota is not None:
+        workers = min(workers, max(math.ceil(quota), 1))
+    return workers
+
+
+def pool_per_worker(workers: int) -> tuple[int, int]:
+    """
+    Размер пула и overflow одного воркера.
+
+    DB_POOL_BUDGET — соединений на весь контейнер; делится между воркерами
+    в пропорции DB_POOL_SIZE : DB_MAX_OVERFLOW. По умолчанию бюджет равен
+    пулу одного процесса (DB_POOL_SIZE + DB_MAX_OVERFLOW); при бюджете 0 и
+    меньше каждый воркер получает DB_POOL_SIZE и DB_MAX_OVERFLOW.
+    """
+    size, overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    budget = settings.DB_POOL_BUDGET
+    if budget is None:
+        budget = size + overflow
+    if budget <= 0:
+        return size, overflow
+    if budget < workers:
+        logger.warning("db_pool_budget_too_small", budget=budget, workers=workers)
+    per_worker = max(budget // workers, 1)
+    pool_size = max(round(per_worker * size / ((size + overflow) or 1)), 1)
+    return pool_size, max(per_worker - pool_size, 0)
+
+
+def prepare_metrics_dir() -> tuple[str, bool]:
+    """
+    Каталог метрик Prometheus для воркеров (PROMETHEUS_MULTIPROC_DIR).
+
+    Файлы метрик (*.db) прошлого запуска удаляются: они дали бы чужие
+    значения; остальное содержимое каталога не трогается. Если переменная не
+    задана, создается временный каталог.
+
+    Returns:
+        Путь к каталогу и признак, что он временный (удаляется при остановке)
+    """
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        path = tempfile.mkdtemp(prefix="auth-service-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+        return path, True
+    os.makedirs(path, exist_ok=True)
+    for metrics_file in Path(path).glob("*.db"):
+        metrics_file.unlink(missing_ok=True)
+    return path, False
+
+
+def main() -> None:
+    """
+    Запуск сервиса в production: `python -m src.server`.
+
+    Воркеры uvicorn (uvloop, httptools) запускаются супервизором и при одном
+    воркере: он перезапускает воркер, завершившийся после SERVER_MAX_REQUESTS
+    запросов, и по SIGHUP по очереди заменяет воркеры новыми (новый принимает
+    запросы до остановки старого). SIGTERM/SIGINT — плавная остановка.
+    """
+    setup_logging()
+    workers = worker_count()
+    pool_size, max_overflow = pool_per_worker(workers)
+    # Воркеры — новые процессы: настройки читаются из окружения заново
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    metrics_dir, temporary_metrics_dir = prepare_metrics_dir()
+
+    config = uvicorn.Config(
+        "src.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        limit_max_requests=settings.SERVER_MAX_REQUESTS or None,
+        limit_max_requests_jitter=settings.SERVER_MAX_REQUESTS_JITTER,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+    )
+    logger.info(
+        "server_starting",
+        workers=workers,
+        cpu_quota=cpu_quota(),
+        db_pool_size=pool_size,
+        db_max_overflow=max_overflow,
+        max_requests=settings.SERVER_MAX_REQUESTS,
+        metrics_dir=metrics_dir,
+    )
+    try:
+        Multiprocess(config, sockets=[config.bind_socket()]).run()
+    finally:
+        if temporary_metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+        # Записи очереди логов нужны и при неудачном запуске
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from starlette.requests import Request
 
 from src.config import settings
 from src.logger import get_logger
+from src.observability.metrics import token_operation
 from src.constants import UserRole
 from src.exceptions import (
     InvalidTokenException,
@@ -16,9 +17,10 @@ from src.exceptions import (
 )
 from src.repositories.refresh_token import RefreshTokenRepository
 from src.repositories.user import UserRepository
-from src.schemas.oauth import TokenResponseSchema
+from src.schemas.oauth import GoogleUserSchema, TokenResponseSchema
 from src.schemas.user import UserCreateSchema
 
+from src.security.admission import Priority, admitted
 from src.security.oauth import GoogleOAuthClient
 from src.security.jwt_service import JWTService
 
@@ -39,6 +41,7 @@ class AuthService:
         self.jwt_service = jwt_service
         self.oauth_client = oauth_client
 
+    @token_operation("issue")
     async def authenticate_google(
         self, request: Request, user_agent: str | None, ip_address: str | None
     ) -> str:
@@ -57,11 +60,24 @@ class AuthService:
         Raises:
             OAuthAuthenticationException: Если аутентификация через Google не удалась
             AuthServiceException: При внутренних ошибках сервиса
+            ServerOverloadedException: Если не получен слот контроля допуска
         """
         logger.info("google_oauth_started")
         token = await self.oauth_client.authorize_access_token(request)
         google_user = self.oauth_client.get_user_info(token)
 
+        # Слот размером с пул БД занимается после обмена code: медленный
+        # Google не должен вытеснять refresh и /internal/users при простое пула
+        async with admitted(Priority.HIGH):
+            return await self._sign_in_google_user(google_user, user_agent, ip_address)
+
+    async def _sign_in_google_user(
+        self,
+        google_user: GoogleUserSchema,
+        user_agent: str | None,
+        ip_address: str | None,
+    ) -> str:
+        """Регистрирует или находит пользователя Google и выдает refresh токен."""
         user = await self.user_repo.get_by_google_id(google_user.sub)
 
         if user is None:
@@ -97,6 +113,7 @@ class AuthService:
         logger.info("user_authenticated")
         return refresh_token
 
+    @token_operation("refresh")
     async def refresh_tokens(
         self, refresh_token: str, user_agent: str | None, ip_address: str | None
     ) -> tuple[TokenResponseSchema, str]:
@@ -186,6 +203,7 @@ class AuthService:
         logger.info("token_refreshed")
         return token_response, new_refresh_token
 
+    @token_operation("revoke")
     async def logout(self, refresh_token: str) -> None:
         """Выход пользователя путем отзыва refresh токена.
 
@@ -206,6 +224,7 @@ class AuthService:
         await self.session.commit()
         logger.info("token_revoked")
 
+    @token_operation("revoke_all")
     async def logout_all(self, user_id: uuid.UUID) -> None:
         """Выход пользователя со всех устройств путем отзыва всех refresh токенов.
 
@@ -1,18 +1,56 @@
+import hashlib
 import uuid
+from datetime import datetime
 
+from sqlalchemy import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.exceptions import UserNotFoundException
 from src.repositories.user import UserRepository
-from src.schemas.user import UserResponseSchema, UserUpdateSchema
+from src.schemas.user import (
+    UserBatchResponseSchema,
+    UserResponseSchema,
+    UserUpdateSchema,
+)
+from src.services.user_loader import UserLoader
+
+
+def profile_etag(user_id: uuid.UUID, updated_at: datetime, variant: str = "") -> str:
+    """Сильный ETag профиля: меняется при каждом обновлении пользователя.
+
+    variant различает представления (например, msgpack): у побайтно разных
+    тел должны быть разные сильные ETag.
+    """
+    key = f"{user_id}:{updated_at.isoformat()}"
+    if variant:
+        key += f":{variant}"
+    digest = hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Сравнение с If-None-Match (список ETag или "*", слабое сравнение)."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
 
 
 class UserService:
     """Сервис для операций с профилем пользователя."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, loader: UserLoader | None = None):
         self.session = session
         self.user_repo = UserRepository(session)
+        # Общий загрузчик воркера для чтения профилей (None — чтение в сессии)
+        self.loader = loader
+
+    async def _load_profile(self, user_id: uuid.UUID) -> RowMapping | None:
+        if self.loader is not None:
+            return await self.loader.load(user_id)
+        return await self.user_repo.get_profile_by_id(user_id)
 
     async def get_by_id(self, user_id: uuid.UUID) -> UserResponseSchema:
         """Получение пользователя по ID.
@@ -26,12 +64,45 @@ class UserService:
         Raises:
             UserNotFoundException: Если пользователь не найден
         """
-        user = await self.user_repo.get_by_id(user_id)
+        row = await self._load_profile(user_id)
 
-        if user is None:
+        if row is None:
             raise UserNotFoundException()
 
-        return UserResponseSchema.model_validate(user)
+        # Данные из БД уже проверены при записи: схема собирается без валидации
+        return UserResponseSchema.model_construct(**row)
+
+    async def get_profile(
+        self,
+        user_id: uuid.UUID,
+        if_none_match: str | None = None,
+        variant: str = "",
+    ) -> tuple[UserResponseSchema | None, str]:
+        """Профиль пользователя и его ETag (условный GET).
+
+        Если ETag совпал с If-None-Match, схема не собирается и ответ
+        не сериализуется.
+
+        Args:
+            user_id: Уникальный идентификатор пользователя
+            if_none_match: Значение заголовка If-None-Match
+            variant: Представление ответа для ETag (см. profile_etag)
+
+        Returns:
+            (UserResponseSchema или None, если профиль не изменился; ETag)
+
+        Raises:
+            UserNotFoundException: Если пользователь не найден
+        """
+        row = await self._load_profile(user_id)
+
+        if row is None:
+            raise UserNotFoundException()
+
+        etag = profile_etag(row["id"], row["updated_at"], variant)
+        if if_none_match is not None and etag_matches(if_none_match, etag):
+            return None, etag
+        return UserResponseSchema.model_construct(**row), etag
 
     async def get_by_email(self, email: str) -> UserResponseSchema:
         """Получение пользователя по email.
@@ -45,12 +116,35 @@ class UserService:
         Raises:
             UserNotFoundException: Если пользователь не найден
         """
-        user = await self.user_repo.get_by_email(email)
+        row = await self.user_repo.get_profile_by_email(email)
 
-        if user is None:
+        if row is None:
             raise UserNotFoundException()
 
-        return UserResponseSchema.model_validate(user)
+        return UserResponseSchema.model_construct(**row)
+
+    async def get_many(self, user_ids: list[uuid.UUID]) -> UserBatchResponseSchema:
+        """Получение нескольких пользователей одним запросом.
+
+        Args:
+            user_ids: Идентификаторы пользователей (повторы игнорируются)
+
+        Returns:
+            UserBatchResponseSchema с найденными пользователями в порядке
+            запроса и ненайденными идентификаторами
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        rows = await self.user_repo.get_profiles_by_ids(user_ids)
+        found = {row["id"]: row for row in rows}
+
+        return UserBatchResponseSchema.model_construct(
+            users=[
+                UserResponseSchema.model_construct(**found[user_id])
+                for user_id in user_ids
+                if user_id in found
+            ],
+            missing=[user_id for user_id in user_ids if user_id not in found],
+        )
 
     async def exists(self, user_id: uuid.UUID) -> bool:
         """Проверка существования пользователя по ID.
@@ -61,6 +155,8 @@ class UserService:
         Returns:
             True если пользователь существует, False иначе
         """
+        if self.loader is not None:
+            return await self.loader.exists(user_id)
         return await self.user_repo.exists(user_id)
 
     async def update_profile(
@@ -0,0 +1,129 @@
+import asyncio
+import contextvars
+import time
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db.database import get_session_maker
+from src.logger import get_logger
+from src.observability.metrics import USER_LOADER_BATCH_SIZE, USER_LOADER_WAIT
+from src.repositories.user import UserRepository
+
+logger = get_logger(__name__)
+
+
+class UserLoader:
+    """
+    Объединение конкурентных чтений профилей пользователей в воркере.
+
+    Одинаковые id, запрошенные одновременно, ждут один и тот же результат
+    (single-flight). Разные id, пришедшие в течение окна `window`, читаются
+    одним запросом `id = ANY($1)`; пачка отправляется раньше, если набралось
+    `max_batch` id.
+
+    Запрос пачки выполняется в собственной сессии: это общая работа
+    нескольких HTTP-запросов, поэтому она не учитывается в статистике SQL
+    и трассах ни одного из них.
+    """
+
+    def __init__(
+        self,
+        session_maker: Callable[[], Callable[[], AsyncSession]] = get_session_maker,
+        window: float = settings.USER_LOADER_WINDOW_MS / 1000,
+        max_batch: int = settings.USER_LOADER_MAX_BATCH,
+    ):
+        self._session_maker = session_maker
+        self._window = window
+        self._max_batch = max_batch
+
+        # Все id в полете: ожидающие пачки и уже запрошенные в БД
+        self._in_flight: dict[uuid.UUID, asyncio.Future] = {}
+        # id текущей пачки и время их постановки в очередь
+        self._queued: dict[uuid.UUID, float] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, user_id: uuid.UUID) -> RowMapping | None:
+        """
+        Колонки профиля пользователя (см. UserRepository.get_profile_by_id).
+
+        Returns:
+            Строка профиля или None, если пользователь не найден
+        """
+        future = self._in_flight.get(user_id)
+        if future is None:
+            future = self._enqueue(user_id)
+        # Отмена одного запроса не должна отменять общий результат
+        return await asyncio.shield(future)
+
+    async def exists(self, user_id: uuid.UUID) -> bool:
+        return await self.load(user_id) is not None
+
+    def _enqueue(self, user_id: uuid.UUID) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Все ожидающие могли быть отменены: ошибка пачки уже залогирована
+        future.add_done_callback(_retrieve_exception)
+        self._in_flight[user_id] = future
+        self._queued[user_id] = time.perf_counter()
+
+        if len(self._queued) >= self._max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            # Пачка отправляется вне контекста запроса, открывшего окно
+            self._flush_handle = loop.call_later(
+                self._window, self._flush, context=contextvars.Context()
+            )
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        queued, self._queued = self._queued, {}
+        if not queued:
+            return
+
+        now = time.perf_counter()
+        for enqueued_at in queued.values():
+            USER_LOADER_WAIT.observe(now - enqueued_at)
+        USER_LOADER_BATCH_SIZE.observe(len(queued))
+
+        task = asyncio.get_running_loop().create_task(
+            self._fetch(list(queued)), context=contextvars.Context()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, user_ids: list[uuid.UUID]) -> None:
+        try:
+            async with self._session_maker()() as session:
+                rows = await UserRepository(session).get_profiles_by_ids(user_ids)
+        except asyncio.CancelledError:
+            for user_id in user_ids:
+                self._in_flight.pop(user_id).cancel()
+            raise
+        except Exception as e:
+            # Ошибку получит каждый ожидающий запрос
+            logger.warning(
+                "user_loader_batch_failed", batch_size=len(user_ids), error=repr(e)
+            )
+            for user_id in user_ids:
+                self._in_flight.pop(user_id).set_exception(e)
+            return
+
+        found = {row["id"]: row for row in rows}
+        for user_id in user_ids:
+            self._in_flight.pop(user_id).set_result(found.get(user_id))
+
+
+def _retrieve_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+user_loader = UserLoader()
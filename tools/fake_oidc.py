@@ -0,0 +1,199 @@
+"""
+Локальный заменитель Google OpenID Connect для нагрузочного тестирования входа.
+
+Реализует discovery-документ, authorize (сразу редиректит обратно с code),
+token endpoint с подписанными RS256 id_token и JWKS. Не хранит состояния:
+code содержит все нужное для выдачи токена. Ключ подписи генерируется
+при старте процесса, поэтому провайдер запускается в одном воркере.
+
+Запуск:
+    uvicorn tools.fake_oidc:app --port 9000 --no-access-log
+
+Настройка auth-service (.env):
+    GOOGLE_DISCOVERY_URL=http://127.0.0.1:9000/.well-known/openid-configuration
+    GOOGLE_REDIRECT_URI=http://127.0.0.1:8001/api/v1/auth/google/callback
+
+Переменные окружения провайдера:
+    FAKE_OIDC_ISSUER       - issuer и базовый URL (http://127.0.0.1:9000)
+    FAKE_OIDC_LATENCY_MS   - задержка ответов: "50" или диапазон "20-80"
+    FAKE_OIDC_ERROR_RATE   - доля ответов с ошибкой (0..1)
+    FAKE_OIDC_ERROR_STATUS - HTTP-статус ошибки (503)
+    FAKE_OIDC_USERS        - размер пула пользователей (10000); логины
+                             распределяются между существующими и новыми
+
+Задержку и ошибки можно менять на лету: POST /_control с JSON
+{"latency_ms": "100-200", "error_rate": 0.1}.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import random
+import secrets
+import time
+from urllib.parse import parse_qs, urlencode
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse, Response
+from starlette.routing import Route
+
+ISSUER = os.getenv("FAKE_OIDC_ISSUER", "http://127.0.0.1:9000").rstrip("/")
+KEY_ID = "fake-oidc-key"
+USERS = int(os.getenv("FAKE_OIDC_USERS", "10000"))
+
+_private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+_public_jwk = json.loads(RSAAlgorithm.to_jwk(_private_key.public_key()))
+_public_jwk.update({"kid": KEY_ID, "use": "sig", "alg": "RS256"})
+
+
+def _parse_latency(value: str) -> tuple[float, float]:
+    low, _, high = value.partition("-")
+    return float(low) / 1000, float(high or low) / 1000
+
+
+class Faults:
+    """Параметры инъекции задержек и ошибок."""
+
+    latency = _parse_latency(os.getenv("FAKE_OIDC_LATENCY_MS", "0"))
+    error_rate = float(os.getenv("FAKE_OIDC_ERROR_RATE", "0"))
+    error_status = int(os.getenv("FAKE_OIDC_ERROR_STATUS", "503"))
+
+
+async def inject_faults() -> Response | None:
+    low, high = Faults.latency
+    if high > 0:
+        await asyncio.sleep(random.uniform(low, high))
+    if Faults.error_rate and random.random() < Faults.error_rate:
+        return JSONResponse(
+            {"error": "temporarily_unavailable"}, status_code=Faults.error_status
+        )
+    return None
+
+
+def _b64encode(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+def _b64decode(value: str) -> dict:
+    return json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+
+
+async def discovery(request: Request) -> Response:
+    if fault := await inject_faults():
+        return fault
+    return JSONResponse(
+        {
+            "issuer": ISSUER,
+            "authorization_endpoint": f"{ISSUER}/o/oauth2/v2/auth",
+            "token_endpoint": f"{ISSUER}/token",
+            "jwks_uri": f"{ISSUER}/oauth2/v3/certs",
+            "response_types_supported": ["code"],
+            "subject_types_supported": ["public"],
+            "id_token_signing_alg_values_supported": ["RS256"],
+            "scopes_supported": ["openid", "email", "profile"],
+            "token_endpoint_auth_methods_supported": [
+                "client_secret_post",
+                "client_secret_basic",
+            ],
+            "claims_supported": ["aud", "email", "exp", "iat", "iss", "name", "sub"],
+        },
+        headers={"Cache-Control": "public, max-age=3600"},
+    )
+
+
+async def jwks(request: Request) -> Response:
+    if fault := await inject_faults():
+        return fault
+    return JSONResponse(
+        {"keys": [_public_jwk]}, headers={"Cache-Control": "public, max-age=3600"}
+    )
+
+
+async def authorize(request: Request) -> Response:
+    """Пропускает экран входа: сразу возвращает code на redirect_uri."""
+    params = request.query_params
+    user_number = params.get("login_hint") or str(random.randrange(USERS))
+    code = _b64encode(
+        {
+            "sub": f"fake-{user_number}",
+            "client_id": params.get("client_id"),
+            "nonce": params.get("nonce"),
+            "redirect_uri": params.get("redirect_uri"),
+            "salt": secrets.token_hex(4),
+        }
+    )
+    query = urlencode({"code": code, "state": params.get("state", "")})
+    return RedirectResponse(f"{params['redirect_uri']}?{query}", status_code=302)
+
+
+async def token(request: Request) -> Response:
+    if fault := await inject_faults():
+        return fault
+
+    # Разбор формы без python-multipart
+    form = parse_qs((await request.body()).decode())
+    try:
+        grant = _b64decode(form["code"][0])
+    except (KeyError, ValueError):
+        return JSONResponse({"error": "invalid_grant"}, status_code=400)
+
+    now = int(time.time())
+    claims = {
+        "iss": ISSUER,
+        "aud": grant["client_id"],
+        "sub": grant["sub"],
+        "email": f"{grant['sub']}@example.com",
+        "email_verified": True,
+        "name": f"Load Test {grant['sub']}",
+        "picture": f"https://example.com/{grant['sub']}.png",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    if grant.get("nonce"):
+        claims["nonce"] = grant["nonce"]
+
+    id_token = jwt.encode(
+        claims, _private_key, algorithm="RS256", headers={"kid": KEY_ID}
+    )
+    return JSONResponse(
+        {
+            "access_token": secrets.token_urlsafe(32),
+            "id_token": id_token,
+            "expires_in": 3599,
+            "token_type": "Bearer",
+            "scope": "openid email profile",
+        }
+    )
+
+
+async def control(request: Request) -> Response:
+    data = await request.json()
+    if "latency_ms" in data:
+        Faults.latency = _parse_latency(str(data["latency_ms"]))
+    if "error_rate" in data:
+        Faults.error_rate = float(data["error_rate"])
+    if "error_status" in data:
+        Faults.error_status = int(data["error_status"])
+    return JSONResponse(
+        {
+            "latency_ms": [Faults.latency[0] * 1000, Faults.latency[1] * 1000],
+            "error_rate": Faults.error_rate,
+            "error_status": Faults.error_status,
+        }
+    )
+
+
+app = Starlette(
+    routes=[
+        Route("/.well-known/openid-configuration", discovery),
+        Route("/oauth2/v3/certs", jwks),
+        Route("/o/oauth2/v2/auth", authorize),
+        Route("/token", token, methods=["POST"]),
+        Route("/_control", control, methods=["POST"]),
+    ]
+)